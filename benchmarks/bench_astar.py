@@ -0,0 +1,76 @@
+"""
+Nodes expanded and query time: plain Dijkstra versus A*.
+
+Runs every origin/destination pair among the first N airports of
+data/flights_global.txt at one departure time, for the earliest-arrival
+search and the cheapest search in each cabin. Lower bounds are
+precomputed first (precompute_lower_bounds) and reported separately.
+
+Usage:
+    python benchmarks/bench_astar.py [--airports 30] [--departure 06:00]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from astar import expansion_counts, precompute_lower_bounds  # noqa: E402
+from flight_planner import (  # noqa: E402
+    CABINS,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    parse_time,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def timed(pairs, query) -> float:
+    start = time.perf_counter()
+    for a, b in pairs:
+        query(a, b)
+    return (time.perf_counter() - start) / len(pairs) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--airports", type=int, default=30, help="Airports to pair up.")
+    parser.add_argument("--departure", default="06:00", help="Earliest departure (HH:MM).")
+    args = parser.parse_args()
+
+    graph = build_graph(load_flights(DATA))
+    t0 = parse_time(args.departure)
+    codes = sorted(graph)[: args.airports]
+    pairs = [(a, b) for a in codes for b in codes if a != b]
+
+    start = time.perf_counter()
+    n = precompute_lower_bounds(graph)
+    print(f"lower bounds for {n} destinations: {(time.perf_counter() - start) * 1e3:.1f} ms")
+    print(f"{len(pairs)} queries departing {args.departure}")
+    print(f"{'search':<12} {'expanded (dijkstra)':>20} {'expanded (A*)':>14} {'us/query (dijkstra)':>20} {'us/query (A*)':>14}")
+
+    searches = [("earliest", None)] + [(cabin, cabin) for cabin in CABINS]
+    for name, cabin in searches:
+        plain = star = 0
+        for a, b in pairs:
+            counts = expansion_counts(graph, a, b, t0, cabin)
+            plain += counts.dijkstra
+            star += counts.astar
+        if cabin is None:
+            us_plain = timed(pairs, lambda a, b: find_earliest_itinerary(graph, a, b, t0))
+            us_star = timed(pairs, lambda a, b: find_earliest_itinerary(graph, a, b, t0, engine="astar"))
+        else:
+            us_plain = timed(pairs, lambda a, b: find_cheapest_itinerary(graph, a, b, t0, cabin))
+            us_star = timed(pairs, lambda a, b: find_cheapest_itinerary(graph, a, b, t0, cabin, engine="astar"))
+        print(f"{name:<12} {plain / len(pairs):>20.1f} {star / len(pairs):>14.1f} {us_plain:>20.1f} {us_star:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
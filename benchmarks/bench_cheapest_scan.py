@@ -0,0 +1,96 @@
+"""
+All-cabin cheapest search: one sweep for every cabin versus one Dijkstra per cabin.
+
+Generates a synthetic schedule (src/synthetic.py) and answers random
+queries for every cabin three ways:
+- "walk":     find_cheapest_trees(), the one-to-all departure-order walk
+              over every connection, with nothing pruned
+- "sweep":    find_cheapest_itineraries(), the time-ordered search from
+              the origin, pruned with the destination's reachability
+              index and its best prices so far
+- "dijkstra": find_cheapest_itinerary() once per cabin
+
+Reachability indexes are built for every queried destination first and
+reported separately; the sweep and Dijkstra share them. Results are checked
+to agree on price before timing.
+
+Usage:
+    python benchmarks/bench_cheapest_scan.py [--airports 200] [--flights 200000]
+        [--queries 50] [--seed 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from flight_planner import (  # noqa: E402
+    CABINS,
+    FlightTable,
+    SearchStats,
+    find_cheapest_itineraries,
+    find_cheapest_itinerary,
+    find_cheapest_trees,
+)
+from reachability import reachability_index  # noqa: E402
+from synthetic import SyntheticConfig, iter_synthetic_flights  # noqa: E402
+
+
+def timed(queries, query) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        query(*q)
+    return (time.perf_counter() - start) / len(queries) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--airports", type=int, default=200, help="Airports in the generated schedule.")
+    parser.add_argument("--flights", type=int, default=200_000, help="Flights in the generated schedule.")
+    parser.add_argument("--queries", type=int, default=50, help="Random (origin, dest, departure) queries.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the schedule and the queries.")
+    args = parser.parse_args()
+
+    config = SyntheticConfig(airports=args.airports, flights=args.flights, seed=args.seed)
+    table = FlightTable.from_flights(iter_synthetic_flights(config)).build_index()
+    rng = random.Random(args.seed)
+    queries = [(*rng.sample(table.codes, 2), rng.randrange(5 * 60, 12 * 60)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = reachability_index(table)
+    for _, dest, _ in queries:
+        index.latest(table.ids[dest])
+    print(f"{len(table)} flights, {len(table.codes)} airports, {len(queries)} queries")
+    print(f"reachability for the queried destinations: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    def walk(a, b, t0):
+        trees = find_cheapest_trees(table, a, t0)
+        return {cabin: trees[cabin].itinerary_to(b) for cabin in CABINS}
+
+    def per_cabin(a, b, t0):
+        return {cabin: find_cheapest_itinerary(table, a, b, t0, cabin) for cabin in CABINS}
+
+    for q in queries:
+        results = (walk(*q), find_cheapest_itineraries(table, *q), per_cabin(*q))
+        prices = {tuple(r[c] and r[c].total_price(c) for c in CABINS) for r in results}
+        assert len(prices) == 1, f"searches disagree on {q}: {prices}"
+
+    scanned = 0
+    for q in queries:
+        stats = SearchStats()
+        find_cheapest_itineraries(table, *q, stats=stats)
+        scanned += stats.edges_scanned
+    print(f"sweep reads {scanned / len(queries) / len(table):.1%} of the connections per query")
+    print(f"{'search':<10} {'ms/query (3 cabins)':>20}")
+    for name, query in (("walk", walk), ("sweep", lambda *q: find_cheapest_itineraries(table, *q)),
+                        ("dijkstra", per_cabin)):
+        print(f"{name:<10} {timed(queries, query):>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Memory per flight: List[Flight] + FlightGraph versus FlightTable.
+
+Scales data/flights_global.txt up by repeating its rows with unique flight
+numbers and measures allocations with tracemalloc:
+- "flights": load_flights() -> List[Flight]
+- "graph":   build_graph() on that list (adjacency + departure arrays)
+- "table":   load_table() -> FlightTable, then build_index() for its
+             departure indexes
+
+Usage:
+    python benchmarks/bench_memory.py [--scale 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from flight_planner import build_graph, load_flights, load_table  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def scale_file(dst: str, scale: int) -> int:
+    with open(DATA, encoding="utf-8") as f:
+        lines = [ln.split() for ln in f if ln.strip() and not ln.startswith("#")]
+    with open(dst, "w", encoding="utf-8") as out:
+        for i in range(scale):
+            for fields in lines:
+                out.write(" ".join(fields[:2] + [f"{fields[2]}-{i}"] + fields[3:]) + "\n")
+    return scale * len(lines)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, current - before, peak - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=100, help="Copies of the sample schedule.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scaled.txt")
+        rows = scale_file(path, args.scale)
+
+        flights, flights_bytes, flights_peak = measure(lambda: load_flights(path))
+        graph, graph_bytes, _ = measure(lambda: build_graph(flights))
+        del graph
+        del flights
+        table, table_bytes, table_peak = measure(lambda: load_table(path).build_index())
+
+        print(f"flights: {rows}")
+        print(f"{'structure':<22} {'bytes/flight':>12} {'peak bytes/flight':>18}")
+        print(f"{'List[Flight]':<22} {flights_bytes / rows:>12.1f} {flights_peak / rows:>18.1f}")
+        print(f"{'+ FlightGraph':<22} {(flights_bytes + graph_bytes) / rows:>12.1f} {'':>18}")
+        print(f"{'FlightTable + index':<22} {table_bytes / rows:>12.1f} {table_peak / rows:>18.1f}")
+        print(f"{'(table.nbytes())':<22} {table.nbytes() / rows:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
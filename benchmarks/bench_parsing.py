@@ -0,0 +1,136 @@
+"""
+Schedule parsing throughput: rows/sec before and after the fast-path parser.
+
+Scales data/flights_global.csv (and .txt) up by repeating its rows with
+unique flight numbers, then times:
+- "before": csv.DictReader + the original split/validate parse_time()
+  (kept below as a reference copy).
+- "after":  the current load_flights_csv() / load_flights_txt().
+
+Usage:
+    python benchmarks/bench_parsing.py [--scale 200] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from flight_planner import Flight, load_flights_csv, load_flights_txt  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def reference_parse_time(hhmm: str) -> int:
+    parts = hhmm.strip().split(":")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid time format: {hhmm}")
+    hour, minute = int(parts[0]), int(parts[1])
+    if not (0 <= hour < 24) or not (0 <= minute < 60):
+        raise ValueError(f"Hour or minute out of range: {hhmm}")
+    return hour * 60 + minute
+
+
+def reference_load_csv(path: str):
+    flights = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, row in enumerate(csv.DictReader(f), 2):
+            try:
+                depart = reference_parse_time(row["depart"])
+                arrive = reference_parse_time(row["arrive"])
+                if arrive <= depart:
+                    raise ValueError(f"Arrival time must be after departure: {row}")
+                flights.append(Flight(
+                    origin=row["origin"], dest=row["dest"], flight_number=row["flight_number"],
+                    depart=depart, arrive=arrive, economy=int(row["economy"]),
+                    business=int(row["business"]), first=int(row["first"]),
+                ))
+            except Exception as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+    return flights
+
+
+def reference_parse_line_txt(line: str):
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    fields = line.split()
+    if len(fields) != 8:
+        raise ValueError(f"Malformed flight line: {line}")
+    o, d, n, dep, arr, e, b, fi = fields
+    depart, arrive = reference_parse_time(dep), reference_parse_time(arr)
+    if arrive <= depart:
+        raise ValueError(f"Arrival time must be after departure: {line}")
+    return Flight(
+        origin=o, dest=d, flight_number=n, depart=depart, arrive=arrive,
+        economy=int(e), business=int(b), first=int(fi),
+    )
+
+
+def reference_load_txt(path: str):
+    flights = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            try:
+                flight = reference_parse_line_txt(line)
+                if flight:
+                    flights.append(flight)
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+    return flights
+
+
+def scale_file(src: str, dst: str, scale: int, sep: str) -> int:
+    with open(src, encoding="utf-8") as f:
+        lines = [ln.rstrip("\n") for ln in f if ln.strip() and not ln.startswith("#")]
+    header = lines.pop(0) if sep == "," else None
+    rows = 0
+    with open(dst, "w", encoding="utf-8") as out:
+        if header:
+            out.write(header + "\n")
+        for i in range(scale):
+            for line in lines:
+                fields = line.split(sep) if sep == "," else line.split()
+                fields[2] = f"{fields[2]}-{i}"
+                out.write(sep.join(fields) + "\n")
+                rows += 1
+    return rows
+
+
+def best_of(fn, path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=200, help="Copies of the sample schedule.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("csv", os.path.join(DATA, "flights_global.csv"), ",", reference_load_csv, load_flights_csv),
+            ("txt", os.path.join(DATA, "flights_global.txt"), " ", reference_load_txt, load_flights_txt),
+        ]
+        print(f"{'format':<6} {'rows':>9} {'before rows/s':>14} {'after rows/s':>13} {'speedup':>8}")
+        for name, src, sep, before, after in cases:
+            path = os.path.join(tmp, f"scaled.{name}")
+            rows = scale_file(src, path, args.scale, sep)
+            t_before = best_of(before, path, args.repeat)
+            t_after = best_of(after, path, args.repeat)
+            print(f"{name:<6} {rows:>9} {rows / t_before:>14,.0f} {rows / t_after:>13,.0f} {t_before / t_after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+End-to-end benchmark suite on a generated schedule of any size.
+
+Writes a synthetic hub-and-spoke schedule (src/synthetic.py) with the
+given airports/flights/seed, then measures:
+- load_flights:             parse the file (one sample per repeat)
+- build_graph:              build the FlightGraph and its search table
+- find_earliest_itinerary:  one sample per random query
+- find_cheapest_itinerary:  one sample per random query (cabins in turn)
+- run_compare:              the `compare` command end to end, file to table
+
+Each phase reports throughput (items/s: flights for load/build, queries
+otherwise), p50/p95/p99 latency and tracemalloc peak memory (measured in a
+separate pass so tracing does not skew the timings). Results go to a JSON
+file; pass an earlier one as --baseline to print the ratio per phase.
+
+Usage:
+    python benchmarks/bench_suite.py [--airports 200] [--flights 100000] [--seed 0]
+        [--queries 200] [--compare-runs 3] [--repeat 3]
+        [--output bench_results.json] [--baseline OLD.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from flight_planner import (  # noqa: E402
+    CABINS,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    format_time,
+    load_flights,
+    main as cli_main,
+)
+from synthetic import SyntheticConfig, write_synthetic_schedule  # noqa: E402
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of `samples` (p in 0..100)."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_bytes(fn: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def phase(name: str, samples: List[float], items: int, peak: int) -> Dict[str, object]:
+    """One result record; samples are seconds, `items` is the work across all samples."""
+    return {
+        "phase": name,
+        "samples": len(samples),
+        "throughput_per_s": items / sum(samples) if sum(samples) else 0.0,
+        "p50_ms": percentile(samples, 50) * 1e3,
+        "p95_ms": percentile(samples, 95) * 1e3,
+        "p99_ms": percentile(samples, 99) * 1e3,
+        "peak_bytes": peak,
+    }
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_suite(path: str, flights: int, queries: int, compare_runs: int, repeat: int, seed: int) -> List[dict]:
+    results = []
+    samples = [timed(lambda: load_flights(path)) for _ in range(repeat)]
+    results.append(phase("load_flights", samples, flights * repeat, peak_bytes(lambda: load_flights(path))))
+
+    loaded = load_flights(path)
+    samples = [timed(lambda: build_graph(loaded).table) for _ in range(repeat)]
+    results.append(phase("build_graph", samples, flights * repeat, peak_bytes(lambda: build_graph(loaded).table)))
+
+    graph = build_graph(loaded)
+    del loaded
+    rng = random.Random(seed)
+    codes = sorted(graph)
+    picks = [(*rng.sample(codes, 2), rng.randrange(5 * 60, 12 * 60)) for _ in range(queries)]
+    traced = picks[: max(1, queries // 10)]
+
+    def earliest(batch):
+        for a, b, t in batch:
+            find_earliest_itinerary(graph, a, b, t)
+
+    def cheapest(batch):
+        for i, (a, b, t) in enumerate(batch):
+            find_cheapest_itinerary(graph, a, b, t, CABINS[i % len(CABINS)])
+
+    for name, run in (("find_earliest_itinerary", earliest), ("find_cheapest_itinerary", cheapest)):
+        run(traced)  # warm per-destination caches shared by both passes
+        samples = [timed(lambda q=q: run([q])) for q in picks]
+        results.append(phase(name, samples, len(samples), peak_bytes(lambda: run(traced))))
+    del graph
+
+    def compare(q):
+        a, b, t = q
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli_main(["compare", path, a, b, format_time(t)])
+
+    samples = [timed(lambda q=q: compare(q)) for q in picks[:compare_runs]]
+    results.append(phase("run_compare", samples, len(samples), peak_bytes(lambda: compare(picks[0]))))
+    return results
+
+
+def print_results(results: List[dict], baseline: Optional[dict]) -> None:
+    old = {r["phase"]: r for r in baseline["results"]} if baseline else {}
+    header = f"{'phase':<24} {'throughput/s':>13} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MiB':>9}"
+    print(header + (f" {'p50 vs base':>12}" if old else ""))
+    for r in results:
+        line = (
+            f"{r['phase']:<24} {r['throughput_per_s']:>13,.1f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f}"
+            f" {r['p99_ms']:>9.3f} {r['peak_bytes'] / 2**20:>9.1f}"
+        )
+        base = old.get(r["phase"])
+        if base and base["p50_ms"]:
+            line += f" {r['p50_ms'] / base['p50_ms']:>11.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--airports", type=int, default=200, help="Airports in the generated schedule.")
+    parser.add_argument("--flights", type=int, default=100_000, help="Flights in the generated schedule.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the schedule and the queries.")
+    parser.add_argument("--hubs", type=int, default=None, help="Hub airports (default: airports / 20).")
+    parser.add_argument("--queries", type=int, default=200, help="Random queries per search phase.")
+    parser.add_argument("--compare-runs", type=int, default=3, help="End-to-end compare runs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Samples for load_flights / build_graph.")
+    parser.add_argument("--format", choices=("txt", "csv"), default="txt", help="Schedule file format.")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results.")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare p50 against.")
+    args = parser.parse_args()
+
+    config = SyntheticConfig(airports=args.airports, flights=args.flights, seed=args.seed, hubs=args.hubs)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"synthetic.{args.format}")
+        start = time.perf_counter()
+        flights = write_synthetic_schedule(path, config)
+        print(f"generated {flights} flights, {args.airports} airports in {time.perf_counter() - start:.1f} s")
+        results = run_suite(path, flights, args.queries, args.compare_runs, args.repeat, args.seed)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {**vars(config), "queries": args.queries, "compare_runs": args.compare_runs, "format": args.format},
+        "results": results,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Transfer-pattern index versus the live searches.
+
+Builds the index for data/flights_global.txt (or FLIGHT_FILE), reports
+build time, pattern counts and serialized size, and the cold-start cost a
+`compare --patterns` run pays before its first query: loading the index
+and binding it to the schedule, by file identity and by digest. Then
+times every origin/destination pair among the first N airports at one
+departure time with the live Dijkstra searches and with index queries.
+
+Usage:
+    python benchmarks/bench_transfer_patterns.py [FLIGHT_FILE] [--airports 30] [--departure 06:00]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from flight_planner import (  # noqa: E402
+    CABINS,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    parse_time,
+)
+from transfer_patterns import (  # noqa: E402
+    build_transfer_patterns,
+    load_transfer_patterns,
+    write_transfer_patterns,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def timed(pairs, query) -> float:
+    start = time.perf_counter()
+    for a, b in pairs:
+        query(a, b)
+    return (time.perf_counter() - start) / len(pairs) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("flight_file", nargs="?", default=DATA, help="Schedule to index.")
+    parser.add_argument("--airports", type=int, default=30, help="Airports to pair up.")
+    parser.add_argument("--departure", default="06:00", help="Earliest departure (HH:MM).")
+    args = parser.parse_args()
+
+    graph = build_graph(load_flights(args.flight_file))
+    t0 = parse_time(args.departure)
+    index = build_transfer_patterns(graph, args.flight_file)
+    cold = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_transfer_patterns(index, os.path.join(tmp, "index.fwtp"))
+        size = os.path.getsize(path)
+        for name, schedule_path in (("file identity", args.flight_file), ("digest", None)):
+            start = time.perf_counter()
+            load_transfer_patterns(path).bind(graph, schedule_path)
+            cold[name] = (time.perf_counter() - start) * 1e3
+    print(f"build: {index.build_seconds * 1e3:.1f} ms for {len(graph.table)} flights, {len(index.codes)} airports")
+    print(f"index: {len(index.patterns)} pairs, {len(index)} patterns, {index.transfers()} transfers, {size} bytes")
+    print("load + bind: " + ", ".join(f"{ms:.2f} ms by {name}" for name, ms in cold.items()))
+
+    codes = sorted(graph)[: args.airports]
+    pairs = [(a, b) for a in codes for b in codes if a != b]
+    for a, b in pairs:  # warm the per-leg tables, as a resident index would be
+        index.earliest(graph, a, b, t0)
+    print(f"{len(pairs)} queries departing {args.departure}")
+    print(f"{'search':<12} {'us/query (dijkstra)':>20} {'us/query (patterns)':>20}")
+    live = timed(pairs, lambda a, b: find_earliest_itinerary(graph, a, b, t0))
+    fast = timed(pairs, lambda a, b: index.earliest(graph, a, b, t0))
+    print(f"{'earliest':<12} {live:>20.1f} {fast:>20.1f}")
+    for cabin in CABINS:
+        live = timed(pairs, lambda a, b: find_cheapest_itinerary(graph, a, b, t0, cabin))
+        fast = timed(pairs, lambda a, b: index.cheapest(graph, a, b, t0, cabin))
+        print(f"{cabin:<12} {live:>20.1f} {fast:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Lower bounds for the A* engine of the earliest-arrival and cheapest searches.
+
+The plain searches expand airports in every direction from `start`. With
+engine="astar" the same kernels (flight_planner._earliest_search and
+_cheapest_search, reachability pruning included) order the heap by "cost
+so far + lower bound on the rest", where the bounds come from one reverse
+Dijkstra from `dest` over the static network (every flight as an edge,
+ignoring departure times):
+
+- time[a]: min over paths a -> dest of sum(MIN_LAYOVER_MINUTES + duration)
+  per leg. Someone who arrived at `a` at time t cannot reach `dest` before
+  t + time[a] (each leg needs a layover before it and its flight time).
+- price[cabin][a]: min total fare over paths a -> dest.
+
+Both bounds are shortest-path distances, hence consistent, so the first
+time `dest` is popped it is optimal, exactly as with plain Dijkstra. The
+earliest search also skips arrivals whose bound on reaching `dest` falls
+after the end of the day.
+
+Bounds are computed per destination on first use and cached per table;
+the cache is dropped when the table's version changes (see schedule
+updates in FlightTable.add_flight etc.).
+"""
+
+from __future__ import annotations
+
+import heapq
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from flight_planner import (
+    CABINS,
+    MIN_LAYOVER_MINUTES,
+    UNREACHED,
+    Cabin,
+    FlightTable,
+    Graph,
+    SearchStats,
+    as_table,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+)
+
+# Reverse static edge: (origin id, min duration, min economy, min business, min first)
+ReverseEdge = Tuple[int, int, int, int, int]
+
+
+@dataclass
+class LowerBounds:
+    """Admissible bounds to one destination, indexed by airport id."""
+
+    dest: int
+    time: List[int]
+    price: Dict[Cabin, List[int]]
+
+
+@dataclass
+class _TableBounds:
+    version: int
+    reverse: List[List[ReverseEdge]]
+    by_dest: Dict[int, LowerBounds] = field(default_factory=dict)
+
+
+_cache: "weakref.WeakKeyDictionary[FlightTable, _TableBounds]" = weakref.WeakKeyDictionary()
+
+
+def _reverse_edges(table: FlightTable) -> List[List[ReverseEdge]]:
+    """reverse[b] = one entry per airport with a flight into b, minimum weights."""
+    best: Dict[Tuple[int, int], List[int]] = {}
+    origin, dest, depart, arrive = table.origin, table.dest, table.depart, table.arrive
+    economy, business, first = table.economy, table.business, table.first
+    for row in table.live_rows():
+        weights = (arrive[row] - depart[row], economy[row], business[row], first[row])
+        key = (origin[row], dest[row])
+        seen = best.get(key)
+        if seen is None:
+            best[key] = list(weights)
+        else:
+            for i, w in enumerate(weights):
+                if w < seen[i]:
+                    seen[i] = w
+    reverse: List[List[ReverseEdge]] = [[] for _ in table.codes]
+    for (a, b), (duration, e, bz, f) in best.items():
+        reverse[b].append((a, duration, e, bz, f))
+    return reverse
+
+
+def _reverse_dijkstra(reverse: List[List[ReverseEdge]], dest: int, weight: int, extra: int = 0) -> List[int]:
+    dist = [UNREACHED] * len(reverse)
+    dist[dest] = 0
+    heap = [(0, dest)]
+    while heap:
+        d, b = heapq.heappop(heap)
+        if d > dist[b]:
+            continue
+        for edge in reverse[b]:
+            a = edge[0]
+            nd = d + edge[weight] + extra
+            if nd < dist[a]:
+                dist[a] = nd
+                heapq.heappush(heap, (nd, a))
+    return dist
+
+
+def lower_bounds(graph: Graph, dest: str) -> Optional[LowerBounds]:
+    """Cached bounds to `dest` (None if it is not an airport of the schedule)."""
+    table = as_table(graph)
+    d = table.ids.get(dest)
+    if d is None:
+        return None
+    return _bounds_for(table, d)
+
+
+def _bounds_for(table: FlightTable, d: int) -> LowerBounds:
+    entry = _cache.get(table)
+    if entry is None or entry.version != table.version or len(entry.reverse) != len(table.codes):
+        entry = _cache[table] = _TableBounds(table.version, _reverse_edges(table))
+    bounds = entry.by_dest.get(d)
+    if bounds is None:
+        bounds = entry.by_dest[d] = LowerBounds(
+            d,
+            _reverse_dijkstra(entry.reverse, d, 1, MIN_LAYOVER_MINUTES),
+            {cabin: _reverse_dijkstra(entry.reverse, d, 2 + i) for i, cabin in enumerate(CABINS)},
+        )
+    return bounds
+
+
+def precompute_lower_bounds(graph: Graph) -> int:
+    """Warm the cache for every destination; return how many were computed."""
+    table = as_table(graph)
+    for d in range(len(table.codes)):
+        _bounds_for(table, d)
+    return len(table.codes)
+
+
+@dataclass
+class ExpansionCounts:
+    """Airports (earliest) or labels (cheapest) settled by each search."""
+
+    dijkstra: int
+    astar: int
+
+
+def expansion_counts(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabin: Optional[Cabin] = None,
+) -> ExpansionCounts:
+    """
+    Nodes expanded by plain Dijkstra vs A* for one query: the earliest
+    search if `cabin` is None, else the cheapest search for that cabin.
+    Both run the same kernel (A* only adds the bound), so this is
+    heap pops minus stale pops of each run.
+    """
+
+    def expanded(engine: str) -> int:
+        stats = SearchStats()
+        if cabin is None:
+            find_earliest_itinerary(graph, start, dest, earliest_departure, engine=engine, stats=stats)
+        else:
+            find_cheapest_itinerary(graph, start, dest, earliest_departure, cabin, engine=engine, stats=stats)
+        return stats.heap_pops - stats.stale_pops
+
+    return ExpansionCounts(expanded("dijkstra"), expanded("astar"))
@@ -0,0 +1,258 @@
+"""
+Batch route queries over one loaded schedule.
+
+`batch` loads the schedule once and answers many compare-style queries
+(earliest arrival plus cheapest per cabin) read from a file or stdin, one
+per line:
+
+    ICN SFO 07:00
+    ICN,NRT,09:30      # commas work too; blank lines and '#' comments are skipped
+
+With more than one worker, queries are cut into chunks and fanned out over
+a ProcessPoolExecutor. The schedule's FlightTable is pickled into each
+worker once, by the pool initializer, so tasks only carry their queries.
+Results are yielded in input order while later chunks are still running;
+at most a few chunks per worker are in flight, so memory stays bounded
+however long the input is.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from flight_planner import (
+    CABINS,
+    Cabin,
+    ComparisonRow,
+    FlightTable,
+    Graph,
+    Itinerary,
+    as_table,
+    comparison_rows,
+    find_cheapest_itineraries,
+    find_earliest_itinerary,
+    format_comparison_table,
+    format_time,
+    parse_time,
+)
+from tracing import span
+
+OUTPUT_FORMATS = ("table", "csv", "ndjson")
+
+CSV_COLUMNS = (
+    "line", "origin", "dest", "departure", "mode", "cabin",
+    "depart", "arrive", "duration", "stops", "price", "flights", "note",
+)
+
+
+@dataclass(frozen=True)
+class BatchQuery:
+    """One input line. `error` is set when the line could not be parsed."""
+
+    line: int
+    origin: str
+    dest: str
+    departure: str  # HH:MM as written; parsed by the worker
+    error: str = ""
+
+
+@dataclass
+class BatchResult:
+    query: BatchQuery
+    earliest: Optional[Itinerary] = None
+    cheapest: Dict[Cabin, Optional[Itinerary]] = field(default_factory=dict)
+    error: str = ""
+
+    def rows(self) -> List[ComparisonRow]:
+        """The same four rows `compare` prints for this query."""
+        return comparison_rows(self.earliest, self.cheapest)
+
+
+def read_queries(lines: Iterable[str]) -> Iterator[BatchQuery]:
+    """Parse query lines lazily; malformed lines become error queries."""
+    for lineno, raw in enumerate(lines, 1):
+        text = raw.split("#", 1)[0].replace(",", " ").strip()
+        if not text:
+            continue
+        parts = text.split()
+        if len(parts) != 3:
+            yield BatchQuery(lineno, "", "", "", error=f"expected 'ORIGIN DEST HH:MM', got {raw.strip()!r}")
+            continue
+        yield BatchQuery(lineno, parts[0], parts[1], parts[2])
+
+
+def answer_query(table: FlightTable, query: BatchQuery, engine: str = "dijkstra") -> BatchResult:
+    """Run the compare searches for one query."""
+    if query.error:
+        return BatchResult(query, error=query.error)
+    try:
+        with span("parse_time"):
+            t0 = parse_time(query.departure)
+    except ValueError as exc:
+        return BatchResult(query, error=str(exc))
+    with span("find_earliest_itinerary"):
+        earliest = find_earliest_itinerary(table, query.origin, query.dest, t0, engine=engine)
+    with span("find_cheapest_itineraries"):
+        cheapest = find_cheapest_itineraries(table, query.origin, query.dest, t0)
+    return BatchResult(query, earliest=earliest, cheapest=cheapest)
+
+
+# Per-process state, set once by the pool initializer (see table_pool()).
+_worker_table: Optional[FlightTable] = None
+_worker_engine: str = "dijkstra"
+
+
+def _init_worker(table: FlightTable, engine: str) -> None:
+    global _worker_table, _worker_engine
+    _worker_table, _worker_engine = table, engine
+
+
+def table_pool(table: FlightTable, workers: int, engine: str = "dijkstra") -> ProcessPoolExecutor:
+    """
+    Process pool whose workers each receive `table` (pickled once per
+    worker, not per task) and `engine`; tasks read them back with
+    worker_table(). Shared by run_batch() and the server.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(table, engine))
+
+
+def worker_table() -> FlightTable:
+    """The table held by the table_pool() worker this runs in."""
+    assert _worker_table is not None, "worker not initialized"
+    return _worker_table
+
+
+def _answer_chunk(chunk: List[BatchQuery]) -> List[BatchResult]:
+    table = worker_table()
+    return [answer_query(table, q, _worker_engine) for q in chunk]
+
+
+def _chunks(queries: Iterable[BatchQuery], size: int) -> Iterator[List[BatchQuery]]:
+    chunk: List[BatchQuery] = []
+    for query in queries:
+        chunk.append(query)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    graph: Graph,
+    queries: Iterable[BatchQuery],
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    engine: str = "dijkstra",
+) -> Iterator[BatchResult]:
+    """
+    Answer `queries` against `graph`, yielding results in input order.
+
+    workers: process count (default os.cpu_count()); 1 answers in this
+        process without starting a pool.
+    chunksize: queries per task; larger chunks mean less inter-process
+        traffic, smaller ones smoother streaming.
+    """
+    if chunksize <= 0:
+        raise ValueError(f"Chunk size must be positive: {chunksize}")
+    table = as_table(graph)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for query in queries:
+            yield answer_query(table, query, engine)
+        return
+
+    pool = table_pool(table, workers, engine)
+    pending: Deque[Future] = deque()
+    try:
+        for chunk in _chunks(queries, chunksize):
+            pending.append(pool.submit(_answer_chunk, chunk))
+            if len(pending) >= 4 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+def _itinerary_fields(itin: Optional[Itinerary], cabin: Optional[Cabin]) -> Tuple[str, ...]:
+    if itin is None:
+        return ("", "", "", "", "", "")
+    price = str(itin.total_price(cabin)) if cabin else ""
+    return (
+        format_time(itin.depart_time),
+        format_time(itin.arrive_time),
+        str(itin.arrive_time - itin.depart_time),
+        str(itin.num_stops()),
+        price,
+        " ".join(f.flight_number for f in itin.flights),
+    )
+
+
+def itinerary_json(itin: Optional[Itinerary], cabin: Optional[Cabin]) -> Optional[dict]:
+    """JSON-ready summary of an itinerary; `price` only when a cabin is given."""
+    if itin is None:
+        return None
+    out = {
+        "depart": format_time(itin.depart_time),
+        "arrive": format_time(itin.arrive_time),
+        "duration": itin.arrive_time - itin.depart_time,
+        "stops": itin.num_stops(),
+        "flights": [f.flight_number for f in itin.flights],
+    }
+    if cabin:
+        out["price"] = itin.total_price(cabin)
+    return out
+
+
+def write_results(results: Iterable[BatchResult], out: IO[str], fmt: str = "table") -> int:
+    """
+    Write results to `out` as they arrive; return how many were written.
+
+    table:  the `compare` table per query, separated by blank lines.
+    csv:    one row per (query, mode) with a header (CSV_COLUMNS).
+    ndjson: one JSON object per query.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    writer = csv.writer(out, lineterminator="\n") if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(CSV_COLUMNS)
+    count = 0
+    for result in results:
+        q = result.query
+        if fmt == "table":
+            if count:
+                out.write("\n")
+            if result.error:
+                out.write(f"line {q.line}: {result.error}\n")
+            else:
+                t0 = parse_time(q.departure)
+                out.write(format_comparison_table(q.origin, q.dest, t0, result.rows()) + "\n")
+        elif fmt == "csv":
+            head = (q.line, q.origin, q.dest, q.departure)
+            if result.error:
+                writer.writerow(head + ("", "") + ("",) * 6 + (result.error,))
+            for row in [] if result.error else result.rows():
+                writer.writerow(head + (row.mode, row.cabin or "") + _itinerary_fields(row.itinerary, row.cabin) + (row.note,))
+        else:
+            record = {"line": q.line, "origin": q.origin, "dest": q.dest, "departure": q.departure}
+            if result.error:
+                record["error"] = result.error
+            else:
+                record["earliest"] = itinerary_json(result.earliest, None)
+                record["cheapest"] = {c: itinerary_json(result.cheapest.get(c), c) for c in CABINS}
+            out.write(json.dumps(record) + "\n")
+        count += 1
+    return count
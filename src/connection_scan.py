@@ -0,0 +1,186 @@
+"""
+Connection Scan engines for single-day timetables.
+
+Instead of a priority queue over airports, these scan the timetable once in
+departure order (FlightTable.connection_rows). Because every flight arrives
+after it departs, by the time a flight is scanned every flight that could
+feed into it has already been scanned (and, scanning backwards, every
+flight it could feed into).
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import List, Optional
+
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    UNREACHED,
+    Graph,
+    Itinerary,
+    SearchStats,
+    as_table,
+    path_rows,
+)
+
+
+def csa_earliest_itinerary(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    stats: Optional[SearchStats] = None,
+) -> Optional[Itinerary]:
+    """
+    Earliest-arrival search using the Connection Scan Algorithm.
+
+    Same contract as find_earliest_itinerary(): the first leg departs at or
+    after `earliest_departure`, every connection respects
+    MIN_LAYOVER_MINUTES.
+
+    State, indexed by airport id:
+    - arrival[id] = earliest known arrival time by flight.
+    - taken[id] = row of the flight that produced that arrival (for the path).
+
+    The scan stops as soon as flights depart at or after the best known
+    arrival at `dest`, since none of them can arrive earlier.
+
+    Complexity:
+    - Time:  O(E) after the one-off O(E log E) sort cached on the table.
+    - Space: O(V) for the two lists.
+
+    `stats` is filled in after the scan. Whether a scanned connection was
+    boardable can be read off the final arrival times: any later
+    improvement at its origin lands after it departs anyway.
+    """
+    table = as_table(graph)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return None
+    connection_rows = table.connection_rows
+    depart, arrive, origin, dest_col = table.depart, table.arrive, table.origin, table.dest
+    arrival = [UNREACHED] * len(table.codes)
+    taken = [-1] * len(table.codes)
+    best = UNREACHED
+
+    first = bisect.bisect_left(table.connection_departs, earliest_departure)
+    for i in range(first, len(connection_rows)):
+        row = connection_rows[i]
+        if depart[row] >= best:
+            break
+        o = origin[row]
+        if o != s and arrival[o] + MIN_LAYOVER_MINUTES > depart[row]:
+            continue
+        nxt = dest_col[row]
+        if nxt != s and arrive[row] < arrival[nxt]:
+            arrival[nxt] = arrive[row]
+            taken[nxt] = row
+            if nxt == d:
+                best = arrive[row]
+
+    if stats is not None:
+        # The scan stops at the first departure >= the final best arrival.
+        scanned = connection_rows[first:bisect.bisect_left(table.connection_departs, best, first)]
+        stats.edges_scanned = len(scanned)
+        stats.edges_feasible = sum(
+            1 for row in scanned
+            if origin[row] == s or arrival[origin[row]] + MIN_LAYOVER_MINUTES <= depart[row]
+        )
+        stats.labels_created = sum(1 for row in taken if row != -1)
+
+    if best == UNREACHED:
+        return None
+    return table.itinerary(path_rows(table, taken, s, d))
+
+
+@dataclass
+class ProfileEntry:
+    """
+    One step of a departure-time -> earliest-arrival profile.
+
+    Leaving `start` at `depart` (and no earlier entry's departure time is
+    later) gets you to `dest` by `arrive` via `itinerary`.
+    """
+
+    depart: int
+    arrive: int
+    itinerary: Itinerary
+
+
+def csa_profile(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int = 0,
+) -> List[ProfileEntry]:
+    """
+    Earliest arrival at `dest` for every departure time from `start`.
+
+    Reverse Connection Scan: flights are scanned once, latest departure
+    first. entries[airport id] holds the Pareto-optimal (depart, arrive)
+    pairs for reaching `dest` from that airport, in decreasing departure
+    order with strictly decreasing arrival, so looking up "best arrival if
+    I can leave at or after t" is one bisect.
+
+    For each flight X -> Y the best arrival when riding it is its own
+    arrival if Y is `dest`, else the best entry in entries[Y] departing
+    at or after arrival + MIN_LAYOVER_MINUTES.
+
+    Returns the entries for `start` in increasing departure order; the
+    step function is "take the first entry with depart >= t".
+
+    Complexity:
+    - Time:  O(E log E) (one scan, one bisect per flight).
+    - Space: O(E) for the per-airport entries.
+    """
+    table = as_table(graph)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return []
+    connection_rows = table.connection_rows
+    depart, arrive, origin, dest_col = table.depart, table.arrive, table.origin, table.dest
+    first = bisect.bisect_left(table.connection_departs, earliest_departure)
+    # Per airport id: negated departures (ascending, for bisect) and entries
+    # (depart, arrive, row, next entry) in the same order.
+    neg_departs: List[List[int]] = [[] for _ in table.codes]
+    entries: List[List[tuple]] = [[] for _ in table.codes]
+
+    for i in range(len(connection_rows) - 1, first - 1, -1):
+        row = connection_rows[i]
+        o, nxt = origin[row], dest_col[row]
+        if o == d:
+            continue
+        if nxt == d:
+            best, onward = arrive[row], None
+        else:
+            keys = neg_departs[nxt]
+            j = bisect.bisect_right(keys, -(arrive[row] + MIN_LAYOVER_MINUTES)) - 1
+            if j < 0:
+                continue
+            onward = entries[nxt][j]
+            best = onward[1]
+        keys, bag = neg_departs[o], entries[o]
+        if bag and bag[-1][1] <= best:
+            continue  # a later departure already arrives no later
+        if bag and bag[-1][0] == depart[row]:
+            keys.pop()
+            bag.pop()
+        keys.append(-depart[row])
+        bag.append((depart[row], best, row, onward))
+
+    profile = []
+    for entry in reversed(entries[s]):
+        rows = []
+        step = entry
+        while step is not None:
+            rows.append(step[2])
+            step = step[3]
+        profile.append(ProfileEntry(depart=entry[0], arrive=entry[1], itinerary=table.itinerary(rows)))
+    return profile
+
+
+def profile_arrival(profile: List[ProfileEntry], departure: int) -> Optional[ProfileEntry]:
+    """Look up the entry answering "leave at or after `departure`" in a profile."""
+    i = bisect.bisect_left([entry.depart for entry in profile], departure)
+    return profile[i] if i < len(profile) else None
@@ -18,10 +18,17 @@ Do not change function *names* or their parameters without updating tests.
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
-from dataclasses import dataclass
+import itertools
+import sys
+import time
+from array import array
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Iterable, List, Literal, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from tracing import span, tracing
 
 # ---------------------------------------------------------------------------
 # Constants & types
@@ -30,8 +37,14 @@ from typing import Dict, Iterable, List, Literal, Optional
 # You must honor this minimum layover between flights when searching.
 MIN_LAYOVER_MINUTES: int = 60
 
+# Last minute of the single-day schedule; nothing departs or arrives later.
+DAY_END: int = 24 * 60 - 1
+
 Cabin = Literal["economy", "business", "first"]
 
+# All cabins, in the order used for per-cabin price vectors.
+CABINS: Tuple[Cabin, ...] = ("economy", "business", "first")
+
 
 @dataclass(frozen=True)
 class Flight:
@@ -131,11 +144,241 @@ class Itinerary:
 # Graph type: adjacency list mapping airport code -> list of outgoing flights.
 Graph = Dict[str, List[Flight]]
 
+# Source of FlightGraph.version numbers; every new or changed schedule gets
+# a value no other schedule in this process has had.
+_schedule_versions = itertools.count(1)
+
+
+class AirportIndex:
+    """
+    Bidirectional airport code <-> dense integer id table.
+
+    Ids are assigned in first-seen order (0, 1, 2, ...), so search state
+    can live in plain lists indexed by id.
+    """
+
+    __slots__ = ("codes", "ids")
+
+    def __init__(self) -> None:
+        self.codes: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.ids
+
+    def intern(self, code: str) -> int:
+        """Return the id for `code`, assigning the next free one if new."""
+        aid = self.ids.get(code)
+        if aid is None:
+            aid = self.ids[code] = len(self.codes)
+            self.codes.append(code)
+        return aid
+
+    def id(self, code: str) -> Optional[int]:
+        return self.ids.get(code)
+
+    def code(self, aid: int) -> str:
+        return self.codes[aid]
+
+
+class FlightGraph(Dict[str, List[Flight]]):
+    """
+    Compiled adjacency list: graph[origin] is sorted by departure time.
+
+    `departures[origin]` is a parallel list of departure minutes, so a
+    search can bisect straight to the first flight it is allowed to take
+    instead of filtering every outgoing flight linearly.
+
+    `version` identifies this exact schedule; caches keyed on it (see
+    query_cache.py) go stale as soon as it changes. add_flight(),
+    remove_flight() and retime_flight() update the lists (and `table`)
+    in place by bisection and bump it.
+
+    The searches do not walk these dicts: they run on `table`, an
+    id-indexed FlightTable over the same Flight objects, built on first use.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.departures: Dict[str, List[int]] = {}
+        self.version: int = next(_schedule_versions)
+        self._connections: Optional[List[Flight]] = None
+        self._connection_departures: Optional[List[int]] = None
+        self._table: Optional[FlightTable] = None
+        self._by_number: Optional[Dict[str, Flight]] = None
+
+    @property
+    def table(self) -> FlightTable:
+        """Id-indexed FlightTable view of this graph (searches run on it)."""
+        if self._table is None:
+            with span("build_table"):
+                self._table = FlightTable.from_flights(
+                    (fl for outgoing in self.values() for fl in outgoing),
+                    keep_objects=True,
+                ).build_index()
+        return self._table
+
+    @property
+    def airports(self) -> AirportIndex:
+        """Airport code <-> id table used by the searches."""
+        return self.table.airports
+
+    @classmethod
+    def from_sorted(
+        cls,
+        adjacency: Dict[str, List[Flight]],
+        connections: Optional[List[Flight]] = None,
+    ) -> FlightGraph:
+        """
+        Wrap adjacency lists that are already sorted by departure time.
+
+        Used by loaders that stored the sorted form (e.g. snapshots) to skip
+        re-sorting; `connections`, if given, must be in connections() order.
+        """
+        graph = cls()
+        for origin, outgoing in adjacency.items():
+            graph[origin] = outgoing
+            graph.departures[origin] = [fl.depart for fl in outgoing]
+        if connections is not None:
+            graph._connections = connections
+            graph._connection_departures = [fl.depart for fl in connections]
+        return graph
+
+    def connections(self) -> List[Flight]:
+        """
+        Return every flight in the graph sorted by (depart, arrive).
+
+        This is the timetable order used by the Connection Scan engine; it
+        is built on first use and cached on the graph.
+        """
+        if self._connections is None:
+            self._connections = sorted(
+                (fl for outgoing in self.values() for fl in outgoing),
+                key=lambda fl: (fl.depart, fl.arrive),
+            )
+            self._connection_departures = [fl.depart for fl in self._connections]
+        return self._connections
+
+    def first_connection_at(self, not_before: int) -> int:
+        """Index of the first connection departing at or after `not_before`."""
+        self.connections()
+        return bisect.bisect_left(self._connection_departures, not_before)
+
+    # -- incremental updates (see also FlightTable.add_flight etc.) --------
+
+    def get_flight(self, flight_number: str) -> Optional[Flight]:
+        """The scheduled flight with this number, or None."""
+        if self._by_number is None:
+            self._by_number = {fl.flight_number: fl for outgoing in self.values() for fl in outgoing}
+        return self._by_number.get(flight_number)
+
+    def _changed(self) -> None:
+        self.version = next(_schedule_versions)
+        self._connections = None
+        self._connection_departures = None
+
+    def add_flight(self, flight: Flight) -> None:
+        """Add a flight in departure order (and to `table`, if built)."""
+        if self.get_flight(flight.flight_number) is not None:
+            raise ValueError(f"Flight {flight.flight_number} is already scheduled")
+        outgoing = self.setdefault(flight.origin, [])
+        departures = self.departures.setdefault(flight.origin, [])
+        i = bisect.bisect_right(departures, flight.depart)
+        outgoing.insert(i, flight)
+        departures.insert(i, flight.depart)
+        self._by_number[flight.flight_number] = flight
+        if self._table is not None:
+            self._table.add_flight(flight)
+        self._changed()
+
+    def remove_flight(self, flight_number: str) -> Flight:
+        """Cancel a flight; return it. Raises KeyError if it is not scheduled."""
+        flight = self.get_flight(flight_number)
+        if flight is None:
+            raise KeyError(flight_number)
+        outgoing, departures = self[flight.origin], self.departures[flight.origin]
+        lo = bisect.bisect_left(departures, flight.depart)
+        i = next(j for j in range(lo, len(outgoing)) if outgoing[j] is flight)
+        del outgoing[i]
+        del departures[i]
+        if not outgoing:
+            del self[flight.origin]
+            del self.departures[flight.origin]
+        del self._by_number[flight_number]
+        if self._table is not None:
+            self._table.remove_flight(flight_number)
+        self._changed()
+        return flight
+
+    def retime_flight(self, flight_number: str, depart: int, arrive: int) -> Flight:
+        """Move a flight to new times (delay or advance); return the new Flight."""
+        if arrive <= depart:
+            raise ValueError("Arrival time must be after departure")
+        retimed = replace(self.remove_flight(flight_number), depart=depart, arrive=arrive)
+        self.add_flight(retimed)
+        return retimed
+
+    def flights_from(self, airport: str, not_before: int) -> List[Flight]:
+        """
+        Return the flights leaving `airport` at or after `not_before`,
+        in departure order.
+        """
+        flights = self.get(airport)
+        if not flights:
+            return []
+        i = bisect.bisect_left(self.departures[airport], not_before)
+        return flights[i:]
+
+
+@dataclass
+class SearchTree:
+    """
+    One-to-all search result rooted at `start`.
+
+    best[airport] is the optimized value for that airport (arrival time
+    or total price, depending on the search). Routes are not stored per
+    airport; they are rebuilt on demand by itinerary_to() from a shared
+    label list: label k took flight row label_rows[k] of `table` and
+    extended label label_parents[k][slot] (-1 = left from `start`).
+    tips[airport] is the label of the best arrival there.
+    """
+
+    start: str
+    earliest_departure: int
+    best: Dict[str, int]
+    tips: Dict[str, int]
+    label_rows: Sequence[int]
+    label_parents: Sequence[Tuple[int, ...]]
+    table: FlightTable
+    slot: int = 0
+
+    def __contains__(self, airport: str) -> bool:
+        return airport in self.best
+
+    def itinerary_to(self, airport: str) -> Optional[Itinerary]:
+        """Rebuild the best itinerary to `airport`, or None if unreachable."""
+        label = self.tips.get(airport)
+        if label is None:
+            return None
+        return self.table.itinerary(label_path(self.label_rows, self.label_parents, label, self.slot))
+
+
 # ---------------------------------------------------------------------------
 # Time helpers
 # ---------------------------------------------------------------------------
 
 
+# Every canonical 'HH:MM' string -> minutes. Schedules only ever contain
+# these 1440 strings, so parse_time() answers them with one dict lookup and
+# only falls back to splitting/validating for anything else.
+_TIME_TABLE: Dict[str, int] = {
+    f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)
+}
+
+
 def parse_time(hhmm: str) -> int:
     """
     Parse a time string 'HH:MM' (24-hour) into minutes since midnight.
@@ -151,6 +394,9 @@ def parse_time(hhmm: str) -> int:
     - Validate ranges (0 <= hour < 24, 0 <= minute < 60).
     - Return hour*60 + minute.
     """
+    minutes = _TIME_TABLE.get(hhmm)
+    if minutes is not None:
+        return minutes
     parts = hhmm.strip().split(":")
     if len(parts) != 2:
         raise ValueError(f"Invalid time format: {hhmm}")
@@ -214,6 +460,7 @@ def parse_flight_line_txt(line: str) -> Optional[Flight]:
     if len(fields) != 8:
         raise ValueError(f"Malformed flight line: {line}")
     origin, dest, flight_number, depart, arrive, economy, business, first = fields
+    origin, dest = sys.intern(origin), sys.intern(dest)
     depart_min = parse_time(depart)
     arrive_min = parse_time(arrive)
     if arrive_min <= depart_min:
@@ -230,6 +477,24 @@ def parse_flight_line_txt(line: str) -> Optional[Flight]:
     )
 
 
+def iter_flights_txt(path: str) -> Iterator[Flight]:
+    """
+    Stream flights from a plain text schedule file, one at a time.
+
+    Same rules and errors as load_flights_txt(), but nothing is kept in
+    memory beyond the current line; errors are raised as `path:lineno: ...`
+    when the bad line is reached.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            try:
+                flight = parse_flight_line_txt(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+            if flight:
+                yield flight
+
+
 def load_flights_txt(path: str) -> List[Flight]:
     """
     Load flights from a plain text schedule file.
@@ -246,16 +511,64 @@ def load_flights_txt(path: str) -> List[Flight]:
     - If it returns a Flight, append it to a list.
     - If parse_flight_line_txt raises ValueError, re-raise with file/line info.
     """
-    flights = []
-    with open(path, "r", encoding="utf-8") as f:
-        for lineno, line in enumerate(f, 1):
+    return list(iter_flights_txt(path))
+
+
+CSV_COLUMNS = ("origin", "dest", "flight_number", "depart", "arrive", "economy", "business", "first")
+
+
+def csv_row_parser(header: Optional[List[str]]) -> Callable[[List[str]], Flight]:
+    """
+    Return a function parsing one csv.reader row laid out like `header`.
+
+    Column positions are resolved once here; times go through the
+    parse_time() lookup table and repeated price strings hit a small cache
+    shared by every row the parser sees. Raises ValueError if a required
+    column is missing.
+    """
+    if not all(col in (header or []) for col in CSV_COLUMNS):
+        raise ValueError(f"Missing required columns in CSV: {header}")
+    columns = [header.index(col) for col in CSV_COLUMNS]
+    prices: Dict[str, int] = {}
+
+    def parse_row(row: List[str]) -> Flight:
+        origin, dest, number, depart, arrive, economy, business, first = [row[i] for i in columns]
+        origin, dest = sys.intern(origin), sys.intern(dest)
+        depart_min = parse_time(depart)
+        arrive_min = parse_time(arrive)
+        if arrive_min <= depart_min:
+            raise ValueError(f"Arrival time must be after departure: {dict(zip(header, row))}")
+        for price in (economy, business, first):
+            if price not in prices:
+                prices[price] = int(price)
+        return Flight(
+            origin, dest, number, depart_min, arrive_min,
+            prices[economy], prices[business], prices[first],
+        )
+
+    return parse_row
+
+
+def iter_flights_csv(path: str) -> Iterator[Flight]:
+    """
+    Stream flights from a CSV schedule file, one at a time.
+
+    Same header check and `path:lineno: ...` errors as load_flights_csv().
+
+    Rows are read with csv.reader and parsed by csv_row_parser(), so no
+    per-row dict is built.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        parse_row = csv_row_parser(next(reader, None))
+        for row in reader:
+            if not row:
+                continue
             try:
-                flight = parse_flight_line_txt(line)
-                if flight:
-                    flights.append(flight)
-            except ValueError as e:
-                raise ValueError(f"{path}:{lineno}: {e}")
-    return flights
+                flight = parse_row(row)
+            except Exception as e:
+                raise ValueError(f"{path}:{reader.line_num}: {e}")
+            yield flight
 
 
 def load_flights_csv(path: str) -> List[Flight]:
@@ -265,7 +578,8 @@ def load_flights_csv(path: str) -> List[Flight]:
         origin,dest,flight_number,depart,arrive,economy,business,first
 
     TODO:
-    - Use csv.DictReader.
+    - Use csv.DictReader (now csv.reader with header positions, see
+      iter_flights_csv()).
     - Check that the required columns are present.
     - For each row:
         * parse depart/arrive with parse_time()
@@ -274,31 +588,22 @@ def load_flights_csv(path: str) -> List[Flight]:
         * build a Flight
     - Return the list of Flights.
     """
-    required = ["origin", "dest", "flight_number", "depart", "arrive", "economy", "business", "first"]
-    flights = []
-    with open(path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if not all(col in reader.fieldnames for col in required):
-            raise ValueError(f"Missing required columns in CSV: {reader.fieldnames}")
-        for lineno, row in enumerate(reader, 2):
-            try:
-                depart_min = parse_time(row["depart"])
-                arrive_min = parse_time(row["arrive"])
-                if arrive_min <= depart_min:
-                    raise ValueError(f"Arrival time must be after departure: {row}")
-                flights.append(Flight(
-                    origin=row["origin"],
-                    dest=row["dest"],
-                    flight_number=row["flight_number"],
-                    depart=depart_min,
-                    arrive=arrive_min,
-                    economy=int(row["economy"]),
-                    business=int(row["business"]),
-                    first=int(row["first"])
-                ))
-            except Exception as e:
-                raise ValueError(f"{path}:{lineno}: {e}")
-    return flights
+    return list(iter_flights_csv(path))
+
+
+def iter_flights(path: str) -> Iterator[Flight]:
+    """
+    Streaming counterpart of load_flights(): picks the TXT or CSV reader by
+    extension and yields flights as they are parsed.
+
+    Pass this straight to build_graph() to avoid holding a full
+    List[Flight] next to the graph.
+    """
+    ext = Path(path).suffix.lower()
+    if ext == ".csv":
+        return iter_flights_csv(path)
+    else:
+        return iter_flights_txt(path)
 
 
 def load_flights(path: str) -> List[Flight]:
@@ -314,10 +619,11 @@ def load_flights(path: str) -> List[Flight]:
     - Call the appropriate loader and return the result.
     """
     ext = Path(path).suffix.lower()
-    if ext == ".csv":
-        return load_flights_csv(path)
-    else:
-        return load_flights_txt(path)
+    with span("load_flights"):
+        if ext == ".csv":
+            return load_flights_csv(path)
+        else:
+            return load_flights_txt(path)
 
 
 # ---------------------------------------------------------------------------
@@ -325,11 +631,16 @@ def load_flights(path: str) -> List[Flight]:
 # ---------------------------------------------------------------------------
 
 
-def build_graph(flights: Iterable[Flight]) -> Graph:
+def build_graph(flights: Iterable[Flight]) -> FlightGraph:
     """
     Build an adjacency-list graph from a collection of flights.
 
-    graph[origin] = list of outgoing flights from that airport.
+    `flights` is consumed once, so a stream from iter_flights() works and
+    no intermediate list is built.
+
+    graph[origin] = list of outgoing flights from that airport, sorted by
+    departure time, with graph.departures[origin] holding the matching
+    departure minutes (see FlightGraph).
 
     TODO:
     - Create an empty dict mapping str -> list[Flight].
@@ -337,18 +648,480 @@ def build_graph(flights: Iterable[Flight]) -> Graph:
     - You can use dict.setdefault() or check membership manually.
 
     Complexity (for README later):
-    - Time:  O(N) where N = number of flights.
-    - Space: O(N) for the adjacency lists.
+    - Time:  O(N log N) where N = number of flights (sorting each list).
+    - Space: O(N) for the adjacency lists and departure arrays.
+    """
+    with span("build_graph"):
+        graph = FlightGraph()
+        for flight in flights:
+            graph.setdefault(flight.origin, []).append(flight)
+        for origin, outgoing in graph.items():
+            outgoing.sort(key=lambda fl: fl.depart)
+            graph.departures[origin] = [fl.depart for fl in outgoing]
+        return graph
+
+
+# The last plain adjacency dict compile_graph() compiled: (dict, its shape
+# as (airports, flights), the FlightGraph built from it).
+_last_compiled: Optional[Tuple[Graph, Tuple[int, int], FlightGraph]] = None
+
+
+def compile_graph(graph: Graph) -> FlightGraph:
+    """
+    Return `graph` as a FlightGraph, compiling a plain adjacency dict if needed.
+
+    Graphs from build_graph() are returned unchanged, so searches can call
+    this on every query for free. A plain dict costs a full build (and a
+    new table and reachability index) the first time; the result is kept
+    and reused while the same dict is passed with the same number of
+    airports and flights. Edits that keep those counts (swapping one
+    flight for another) are not noticed: use a FlightGraph and its
+    add_flight() / remove_flight() / retime_flight() for schedules that
+    change.
+    """
+    global _last_compiled
+    if isinstance(graph, FlightGraph):
+        return graph
+    if isinstance(graph, FlightTable):
+        return build_graph(iter(graph))
+    shape = (len(graph), sum(len(outgoing) for outgoing in graph.values()))
+    last = _last_compiled
+    if last is not None and last[0] is graph and last[1] == shape:
+        return last[2]
+    compiled = build_graph(fl for outgoing in graph.values() for fl in outgoing)
+    _last_compiled = (graph, shape, compiled)
+    return compiled
+
+
+# ---------------------------------------------------------------------------
+# Columnar flight table
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SearchStats:
+    """
+    Work counters for one search, filled in when passed as `stats=`.
+
+    - heap_pushes / heap_pops: priority-queue traffic; stale_pops are pops
+      skipped because a better entry for that airport (or label) had
+      already been settled.
+    - edges_scanned: flights out of every settled airport; edges_feasible:
+      those leaving late enough for the layover (the rest are skipped by
+      bisecting the departure-sorted lists).
+    - peak_heap: largest heap size seen.
+    - labels_created: search states created (airports improved, labels
+      pushed, or airports reached for the scans).
+    - seconds: wall time of the whole call.
+
+    The connection scan (engine "csa") has no global heap: it reports each
+    connection scanned as an edge. The all-cabin sweep (engine "sweep" for
+    find_cheapest_itineraries) counts flights walked as edges, and its
+    heap holds departure events as well as labels.
+
+    Counts are gathered once per heap pop or derived after the search, so
+    a search called without `stats` does no extra work per edge.
+    """
+
+    engine: str = ""
+    heap_pushes: int = 0
+    heap_pops: int = 0
+    stale_pops: int = 0
+    edges_scanned: int = 0
+    edges_feasible: int = 0
+    peak_heap: int = 0
+    labels_created: int = 0
+    seconds: float = 0.0
+
+    def finish_heap(self, queued: int) -> None:
+        """
+        Derive pushes and labels when a heap search ends with `queued`
+        entries left: every push was either popped or is still queued, and
+        every push but the root one created a label.
+        """
+        self.heap_pushes = self.heap_pops + queued
+        self.labels_created = self.heap_pushes - 1
+
+    def summary(self) -> str:
+        """One line: engine, then every counter."""
+        return (
+            f"{self.engine}: pushes={self.heap_pushes} pops={self.heap_pops} stale={self.stale_pops} "
+            f"edges={self.edges_feasible}/{self.edges_scanned} feasible peak_heap={self.peak_heap} "
+            f"labels={self.labels_created} time={self.seconds * 1e3:.3f} ms"
+        )
+
+
+def timed_search(stats: SearchStats, engine: str, search: Callable, *args):
+    """Run search(*args, stats) and record `engine` and its wall time in `stats`."""
+    stats.engine = engine
+    started = time.perf_counter()
+    try:
+        return search(*args, stats)
+    finally:
+        stats.seconds += time.perf_counter() - started
+
+
+class FlightTable:
+    """
+    Column-oriented flight storage for very large schedules.
+
+    A Flight dataclass costs a few hundred bytes; here one flight is a row
+    across typed arrays (about 30 bytes plus its flight-number text):
+    - origin / dest: airport ids (array 'I'); `airports` maps codes <-> ids
+      (`codes` and `ids` are its two halves).
+    - depart / arrive: minutes since midnight (array 'H').
+    - economy / business / first: prices (array 'i').
+    - flight numbers: one UTF-8 string pool plus end offsets.
+
+    Flight objects are only built by flight(row), which the searches call
+    for the flights of the itinerary they return. All find_* functions
+    accept a FlightTable (indexed with build_index()) in place of a
+    FlightGraph (a FlightGraph's searches run on its own table, see
+    FlightGraph.table).
+    """
+
+    def __init__(self, keep_objects: bool = False) -> None:
+        self.airports = AirportIndex()
+        self.codes = self.airports.codes
+        self.ids = self.airports.ids
+        self.origin = array("I")
+        self.dest = array("I")
+        self.depart = array("H")
+        self.arrive = array("H")
+        self.economy = array("i")
+        self.business = array("i")
+        self.first = array("i")
+        self._numbers = bytearray()
+        self._number_ends = array("I")
+        self.version: int = next(_schedule_versions)
+        self._index: Optional[tuple] = None
+        self._objects: Optional[List[Flight]] = [] if keep_objects else None
+        self._dead: set = set()  # rows removed by remove_flight()
+        self._number_rows: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_flights(cls, flights: Iterable[Flight], keep_objects: bool = False) -> FlightTable:
+        """
+        Build a table from any iterable of flights (e.g. iter_flights()).
+
+        With keep_objects=True the original Flight objects are kept and
+        returned by flight(row) (FlightGraph uses this so searches hand back
+        the same objects the graph holds).
+        """
+        table = cls(keep_objects=keep_objects)
+        for flight in flights:
+            table.append(flight)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.depart) - len(self._dead)
+
+    def __iter__(self) -> Iterator[Flight]:
+        for row in self.live_rows():
+            yield self.flight(row)
+
+    def live_rows(self) -> Iterator[int]:
+        """Row numbers still in the schedule (removed rows are skipped)."""
+        dead = self._dead
+        return (row for row in range(len(self.depart)) if row not in dead)
+
+    def append(self, flight: Flight) -> int:
+        """Add one flight as a new row; return the row number (drops the indexes; add_flight() keeps them)."""
+        self.origin.append(self.airports.intern(flight.origin))
+        self.dest.append(self.airports.intern(flight.dest))
+        self.depart.append(flight.depart)
+        self.arrive.append(flight.arrive)
+        self.economy.append(flight.economy)
+        self.business.append(flight.business)
+        self.first.append(flight.first)
+        self._numbers += flight.flight_number.encode("utf-8")
+        self._number_ends.append(len(self._numbers))
+        if self._objects is not None:
+            self._objects.append(flight)
+        self._index = None
+        self._number_rows = None
+        return len(self.depart) - 1
+
+    def flight_number(self, row: int) -> str:
+        start = self._number_ends[row - 1] if row else 0
+        return self._numbers[start:self._number_ends[row]].decode("utf-8")
+
+    def flight(self, row: int) -> Flight:
+        """Materialize one row as a Flight."""
+        if self._objects is not None:
+            return self._objects[row]
+        return Flight(
+            origin=self.codes[self.origin[row]],
+            dest=self.codes[self.dest[row]],
+            flight_number=self.flight_number(row),
+            depart=self.depart[row],
+            arrive=self.arrive[row],
+            economy=self.economy[row],
+            business=self.business[row],
+            first=self.first[row],
+        )
+
+    def prices(self, cabin: Cabin) -> array:
+        """The price column for `cabin`."""
+        if cabin == "economy":
+            return self.economy
+        elif cabin == "business":
+            return self.business
+        elif cabin == "first":
+            return self.first
+        else:
+            raise ValueError(f"Unknown cabin: {cabin}")
+
+    def build_index(self) -> FlightTable:
+        """
+        Build (or reuse) the departure indexes the searches need:
+        - out_rows[id]: rows leaving that airport, sorted by departure,
+          with out_departs[id] the matching departure minutes.
+        - connection_rows: all rows sorted by (depart, arrive), with
+          connection_departs alongside (Connection Scan order).
+        Returns the table, so `load_table(path).build_index()` reads naturally.
+        """
+        if self._index is None:
+            with span("build_index"):
+                depart, arrive, origin = self.depart, self.arrive, self.origin
+                out_rows = [array("I") for _ in self.codes]
+                for row in sorted(self.live_rows(), key=lambda r: depart[r]):
+                    out_rows[origin[row]].append(row)
+                out_departs = [array("H", (depart[r] for r in rows)) for rows in out_rows]
+                connection_rows = array("I", sorted(self.live_rows(), key=lambda r: (depart[r], arrive[r])))
+                connection_departs = array("H", (depart[r] for r in connection_rows))
+                self._index = (out_rows, out_departs, connection_rows, connection_departs)
+        return self
+
+    @property
+    def out_rows(self) -> List[array]:
+        return self.build_index()._index[0]
+
+    @property
+    def out_departs(self) -> List[array]:
+        return self.build_index()._index[1]
+
+    @property
+    def connection_rows(self) -> array:
+        return self.build_index()._index[2]
+
+    @property
+    def connection_departs(self) -> array:
+        return self.build_index()._index[3]
+
+    def itinerary(self, rows: Iterable[int]) -> Itinerary:
+        """Materialize an Itinerary from row numbers in travel order."""
+        return Itinerary([self.flight(row) for row in rows])
+
+    # -- incremental updates ---------------------------------------------
+    #
+    # Each update bisects into the per-airport and connection indexes
+    # (O(log n) comparisons, plus one array insert/delete memmove) instead
+    # of rebuilding them, and bumps `version`. Removed rows stay in the
+    # columns as tombstones; searches never see them.
+
+    def row_of(self, flight_number: str) -> Optional[int]:
+        """Live row carrying `flight_number`, or None."""
+        if self._number_rows is None:
+            self._number_rows = {self.flight_number(row): row for row in self.live_rows()}
+        return self._number_rows.get(flight_number)
+
+    def add_flight(self, flight: Flight) -> int:
+        """Add a flight, keeping any built indexes sorted; return its row."""
+        if self.row_of(flight.flight_number) is not None:
+            raise ValueError(f"Flight {flight.flight_number} is already scheduled")
+        index, number_rows = self._index, self._number_rows
+        row = self.append(flight)
+        self._index, self._number_rows = index, number_rows
+        number_rows[flight.flight_number] = row
+        if index is not None:
+            out_rows, out_departs, connection_rows, connection_departs = index
+            while len(out_rows) < len(self.codes):  # new airports
+                out_rows.append(array("I"))
+                out_departs.append(array("H"))
+            o = self.origin[row]
+            i = bisect.bisect_right(out_departs[o], flight.depart)
+            out_rows[o].insert(i, row)
+            out_departs[o].insert(i, flight.depart)
+            lo = bisect.bisect_left(connection_departs, flight.depart)
+            hi = bisect.bisect_right(connection_departs, flight.depart, lo)
+            i = bisect.bisect_right(connection_rows, flight.arrive, lo, hi, key=self.arrive.__getitem__)
+            connection_rows.insert(i, row)
+            connection_departs.insert(i, flight.depart)
+        self.version = next(_schedule_versions)
+        return row
+
+    def remove_flight(self, flight_number: str) -> Flight:
+        """Cancel a flight; return it. Raises KeyError if it is not scheduled."""
+        row = self.row_of(flight_number)
+        if row is None:
+            raise KeyError(flight_number)
+        flight = self.flight(row)
+        self._dead.add(row)
+        del self._number_rows[flight_number]
+        if self._index is not None:
+            out_rows, out_departs, connection_rows, connection_departs = self._index
+            o, depart = self.origin[row], self.depart[row]
+            lo = bisect.bisect_left(out_departs[o], depart)
+            i = out_rows[o].index(row, lo, bisect.bisect_right(out_departs[o], depart, lo))
+            del out_rows[o][i]
+            del out_departs[o][i]
+            lo = bisect.bisect_left(connection_departs, depart)
+            i = connection_rows.index(row, lo, bisect.bisect_right(connection_departs, depart, lo))
+            del connection_rows[i]
+            del connection_departs[i]
+        self.version = next(_schedule_versions)
+        return flight
+
+    def retime_flight(self, flight_number: str, depart: int, arrive: int) -> Flight:
+        """Move a flight to new times (delay or advance); return the new Flight."""
+        if arrive <= depart:
+            raise ValueError("Arrival time must be after departure")
+        if self.row_of(flight_number) is None:
+            raise KeyError(flight_number)
+        retimed = replace(self.remove_flight(flight_number), depart=depart, arrive=arrive)
+        self.add_flight(retimed)
+        return retimed
+
+    def __getstate__(self) -> dict:
+        # Pickled tables (e.g. shipped to batch worker processes) leave the
+        # kept Flight objects behind; flight(row) rebuilds equal ones.
+        state = self.__dict__.copy()
+        state["_objects"] = None
+        return state
+
+    _COLUMNS = ("origin", "dest", "depart", "arrive", "economy", "business", "first", "_number_ends")
+
+    def to_columns(self) -> dict:
+        """
+        The table as plain values (lists, str, bytes): every column and the
+        indexes as raw array bytes, for serializers like marshal (see
+        snapshot.py). from_columns() reverses it.
+        """
+        out_rows, out_departs, connection_rows, connection_departs = self.build_index()._index
+        return {
+            "codes": list(self.codes),
+            "columns": {name: getattr(self, name).tobytes() for name in self._COLUMNS},
+            "numbers": bytes(self._numbers),
+            "dead": sorted(self._dead),
+            "out_rows": [rows.tobytes() for rows in out_rows],
+            "out_departs": [departs.tobytes() for departs in out_departs],
+            "connection_rows": connection_rows.tobytes(),
+            "connection_departs": connection_departs.tobytes(),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: dict, byteswap: bool = False) -> FlightTable:
+        """
+        Rebuild an indexed table from to_columns() output, without parsing
+        or sorting anything. Pass byteswap=True for data written on a
+        machine of the other byte order.
+        """
+
+        def load(typecode: str, raw: bytes) -> array:
+            values = array(typecode)
+            values.frombytes(raw)
+            if byteswap:
+                values.byteswap()
+            return values
+
+        table = cls()
+        for code in columns["codes"]:
+            table.airports.intern(code)
+        for name in cls._COLUMNS:
+            setattr(table, name, load(getattr(table, name).typecode, columns["columns"][name]))
+        table._numbers = bytearray(columns["numbers"])
+        table._dead = set(columns["dead"])
+        table._index = (
+            [load("I", raw) for raw in columns["out_rows"]],
+            [load("H", raw) for raw in columns["out_departs"]],
+            load("I", columns["connection_rows"]),
+            load("H", columns["connection_departs"]),
+        )
+        return table
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, string pool and indexes."""
+        columns = (self.origin, self.dest, self.depart, self.arrive,
+                   self.economy, self.business, self.first, self._number_ends)
+        total = sum(col.itemsize * len(col) for col in columns) + len(self._numbers)
+        if self._index is not None:
+            out_rows, out_departs, connection_rows, connection_departs = self._index
+            for arrays in (out_rows, out_departs, [connection_rows, connection_departs]):
+                total += sum(a.itemsize * len(a) for a in arrays)
+        return total
+
+
+def load_table(path: str) -> FlightTable:
     """
-    graph: Graph = {}
-    for flight in flights:
-        graph.setdefault(flight.origin, []).append(flight)
-    return graph
+    Stream a schedule file straight into a FlightTable.
+
+    Each parsed Flight is discarded once its row is appended, so peak
+    memory is the table itself.
+    """
+    return FlightTable.from_flights(iter_flights(path))
 
 
 # ---------------------------------------------------------------------------
 # Search functions (earliest arrival / cheapest)
 # ---------------------------------------------------------------------------
+#
+# Every search runs on a FlightTable: airports are dense integer ids and
+# flights are row numbers, so search state (dist, taken, ready_by, ...) is a
+# plain list indexed by airport id instead of a dict keyed by code. Codes
+# only come back when a Flight is materialized for the returned Itinerary.
+
+# Engines accepted by find_earliest_itinerary(engine=...).
+EARLIEST_ENGINES = ("dijkstra", "csa", "astar")
+CHEAPEST_ENGINES = ("dijkstra", "astar")
+
+# "Not reached yet" value for id-indexed time/price state.
+UNREACHED = 1 << 30
+
+
+def as_table(graph: Graph) -> FlightTable:
+    """
+    Return the indexed FlightTable a search should run on.
+
+    - FlightTable: itself.
+    - FlightGraph: its id-indexed table (built once, see FlightGraph.table).
+    - A plain adjacency dict: compiled with compile_graph() first.
+    """
+    if isinstance(graph, FlightTable):
+        return graph.build_index()
+    return compile_graph(graph).table
+
+
+def label_path(
+    label_rows: Sequence[int],
+    label_parents: Sequence,
+    label: int,
+    slot: Optional[int] = None,
+) -> List[int]:
+    """
+    Flight rows from the start to `label`, in travel order, for searches
+    that keep labels as parallel lists: label k took row label_rows[k] and
+    extended label label_parents[k] (label_parents[k][slot] when parents are
+    per-cabin tuples); -1 = left from the start.
+    """
+    rows = []
+    while label != -1:
+        rows.append(label_rows[label])
+        label = label_parents[label] if slot is None else label_parents[label][slot]
+    rows.reverse()
+    return rows
+
+
+def path_rows(table: FlightTable, taken: List[int], start: int, dest: int) -> List[int]:
+    """Follow taken[airport] (row used to reach it) back from `dest` to `start`."""
+    rows = []
+    airport = dest
+    while airport != start:
+        row = taken[airport]
+        rows.append(row)
+        airport = table.origin[row]
+    rows.reverse()
+    return rows
 
 
 def find_earliest_itinerary(
@@ -356,6 +1129,8 @@ def find_earliest_itinerary(
     start: str,
     dest: str,
     earliest_departure: int,
+    engine: str = "dijkstra",
+    stats: Optional[SearchStats] = None,
 ) -> Optional[Itinerary]:
     """
     Find an itinerary from `start` to `dest` that arrives as early as possible.
@@ -380,34 +1155,158 @@ def find_earliest_itinerary(
     - Keep a `previous` dict to reconstruct the path (store the last Flight
       used to reach each airport).
 
-    TODO:
-    - Implement this search and return an Itinerary or None.
+    Engines:
+    - "dijkstra" (default): heap-based search over the adjacency lists.
+    - "csa": Connection Scan, one pass over all flights in departure order
+      (see connection_scan.py). Same result type, usually faster for a
+      single-day timetable.
+    - "astar": the heap search guided by a cached lower bound on the time
+      still needed to reach `dest` (see astar.py).
+
+    `graph` may be a FlightGraph, a FlightTable or a plain adjacency dict
+    (compiled on first use, see compile_graph() for when it is reused).
+    Pass a fresh SearchStats as `stats` to have the search's work counted.
+    """
+    if engine not in EARLIEST_ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if stats is not None:
+        return timed_search(stats, engine, _find_earliest, graph, start, dest, earliest_departure, engine)
+    return _find_earliest(graph, start, dest, earliest_departure, engine, None)
+
+
+def _find_earliest(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    engine: str,
+    stats: Optional[SearchStats],
+) -> Optional[Itinerary]:
+    if engine == "csa":
+        from connection_scan import csa_earliest_itinerary
+        return csa_earliest_itinerary(graph, start, dest, earliest_departure, stats)
+
+    from reachability import reachability_index
+
+    table = as_table(graph)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return None
+    latest = reachability_index(table).latest(d)
+    if latest[s] < earliest_departure:
+        return None
+    h = None
+    if engine == "astar":
+        from astar import lower_bounds
+        h = lower_bounds(table, dest).time
+    _, taken = _earliest_search(table, s, earliest_departure, d, latest, stats, h)
+    if taken[d] == -1:
+        return None
+    return table.itinerary(path_rows(table, taken, s, d))
+
+
+def _earliest_search(
+    table: FlightTable,
+    start: int,
+    earliest_departure: int,
+    dest: int = -1,
+    latest: Optional[Sequence[int]] = None,
+    stats: Optional[SearchStats] = None,
+    h: Optional[Sequence[int]] = None,
+) -> Tuple[List[int], List[int]]:
+    """
+    Dijkstra on arrival time from airport id `start`; stops once `dest` pops.
+
+    Returns (dist, taken): dist[id] = earliest arrival (UNREACHED if none),
+    taken[id] = row of the flight that achieved it (-1 if none). `taken`
+    doubles as the predecessor map: row -> table.origin[row] -> taken[...].
+
+    `latest` (ReachabilityIndex.latest(dest)) prunes departures after
+    latest[airport] and flights into airports that can no longer reach
+    `dest`; with it, dist/taken are only exact for `dest`.
+
+    `h` (engine "astar"): a consistent lower bound per airport on the time
+    still needed to reach `dest` (astar.LowerBounds.time). The heap is
+    ordered by arrival + h, and arrivals whose bound passes the end of
+    the day are dropped. Zeros (the default) give plain Dijkstra.
     """
     import heapq
-    dist = {start: earliest_departure}
-    prev = {}
-    flight_taken = {}
-    heap = [(earliest_departure, start)]
+    out_rows, out_departs = table.out_rows, table.out_departs
+    arrive, dest_col = table.arrive, table.dest
+    if h is None:
+        h = [0] * len(table.codes)
+    dist = [UNREACHED] * len(table.codes)
+    taken = [-1] * len(table.codes)
+    dist[start] = earliest_departure
+    heap = [(earliest_departure + h[start], earliest_departure, start)]  # (arrival + bound, arrival, airport)
     while heap:
-        curr_time, airport = heapq.heappop(heap)
+        if stats is not None:
+            stats.heap_pops += 1
+            stats.peak_heap = max(stats.peak_heap, len(heap))
+        _, curr_time, airport = heapq.heappop(heap)
+        if curr_time > dist[airport]:
+            if stats is not None:
+                stats.stale_pops += 1
+            continue  # stale entry
         if airport == dest:
-            # reconstruct path
-            path = []
-            a = dest
-            while a != start:
-                f = flight_taken[a]
-                path.append(f)
-                a = f.origin
-            path.reverse()
-            return Itinerary(path)
-        for flight in graph.get(airport, []):
-            min_depart = curr_time if airport == start else curr_time + MIN_LAYOVER_MINUTES
-            if flight.depart >= min_depart:
-                if (flight.dest not in dist) or (flight.arrive < dist[flight.dest]):
-                    dist[flight.dest] = flight.arrive
-                    flight_taken[flight.dest] = flight
-                    heapq.heappush(heap, (flight.arrive, flight.dest))
-    return None
+            break
+        rows = out_rows[airport]
+        departs = out_departs[airport]
+        min_depart = curr_time if airport == start else curr_time + MIN_LAYOVER_MINUTES
+        end = len(rows) if latest is None else bisect.bisect_right(departs, latest[airport])
+        begin = bisect.bisect_left(departs, min_depart)
+        if stats is not None:
+            stats.edges_scanned += len(rows)
+            stats.edges_feasible += len(rows) - begin
+        for i in range(begin, end):
+            row = rows[i]
+            nxt = dest_col[row]
+            if latest is not None and nxt != dest and arrive[row] + MIN_LAYOVER_MINUTES > latest[nxt]:
+                continue  # dead flight: nothing from nxt reaches dest after it lands
+            if arrive[row] < dist[nxt]:
+                bound = arrive[row] + h[nxt]
+                if bound > DAY_END:
+                    continue  # cannot reach dest today (never true with h = 0)
+                dist[nxt] = arrive[row]
+                taken[nxt] = row
+                heapq.heappush(heap, (bound, arrive[row], nxt))
+    if stats is not None:
+        stats.finish_heap(len(heap))
+    return dist, taken
+
+
+def find_earliest_tree(
+    graph: Graph,
+    start: str,
+    earliest_departure: int,
+) -> SearchTree:
+    """
+    One-to-all earliest arrival: best arrival time at every airport
+    reachable from `start` in one Dijkstra run.
+
+    tree.best[airport] is the arrival time; tree.itinerary_to(airport)
+    rebuilds the route on demand.
+    """
+    table = as_table(graph)
+    s = table.ids.get(start)
+    if s is None:
+        return SearchTree(start, earliest_departure, {}, {}, [], [], table)
+    dist, taken = _earliest_search(table, s, earliest_departure)
+    origin = table.origin
+    # Label i = "reached airport i"; its parent is the label of the origin.
+    parents = [
+        (-1 if row == -1 or origin[row] == s else origin[row],) for row in taken
+    ]
+    reached = [a for a in range(len(taken)) if taken[a] != -1]
+    return SearchTree(
+        start,
+        earliest_departure,
+        {table.codes[a]: dist[a] for a in reached},
+        {table.codes[a]: a for a in reached},
+        taken,
+        parents,
+        table,
+    )
 
 
 def find_cheapest_itinerary(
@@ -416,6 +1315,8 @@ def find_cheapest_itinerary(
     dest: str,
     earliest_departure: int,
     cabin: Cabin,
+    engine: str = "dijkstra",
+    stats: Optional[SearchStats] = None,
 ) -> Optional[Itinerary]:
     """
     Find a valid itinerary from `start` to `dest` with the lowest total price
@@ -430,47 +1331,424 @@ def find_cheapest_itinerary(
     - Itinerary if a route exists using that cabin for ALL legs.
     - None if no valid route exists.
 
-    Hints:
-    - You can still use a Dijkstra-style search, but:
-        * dist[airport] = minimal total price to reach that airport.
-    - When exploring edges:
-        * Still enforce the time & layover rules.
-        * Edge weight = flight.price_for(cabin).
-    - Keep a `previous` dict to reconstruct the best path.
+    Search state is a label (airport, ready_time) rather than one price
+    per airport, so a cheap-but-late arrival cannot hide a pricier one
+    that still makes a connection:
+    - ready_time = arrival + MIN_LAYOVER_MINUTES (earliest_departure at
+      `start`): the earliest the next flight may leave.
+    - Labels are popped cheapest first, ties to the earlier ready time.
+    - A label is dropped only when another label at the same airport is
+      both no more expensive and ready no later. Because labels settle in
+      price order, that is a single check against `ready_by[airport]`,
+      the earliest ready time of any label already settled there.
+
+    Each airport settles at most one label per strictly earlier ready
+    time, which bounds label growth by the number of distinct arrival
+    times into it (at most 1440 on a single-day schedule).
+
+    Complexity:
+    - Time:  O(L log L + L * d) where L = labels settled, d = out-degree.
+    - Space: O(L).
+
+    engine="astar" orders labels by price plus a cached lower bound on the
+    fare still needed to reach `dest` (see astar.py); same result.
+    `stats` as for find_earliest_itinerary().
+    """
+    if engine not in CHEAPEST_ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if stats is not None:
+        return timed_search(stats, engine, _find_cheapest, graph, start, dest, earliest_departure, cabin, engine)
+    return _find_cheapest(graph, start, dest, earliest_departure, cabin, engine, None)
 
-    TODO:
-    - Implement this search and return an Itinerary or None.
+
+def _find_cheapest(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabin: Cabin,
+    engine: str,
+    stats: Optional[SearchStats],
+) -> Optional[Itinerary]:
+    from reachability import reachability_index
+
+    table = as_table(graph)
+    prices = table.prices(cabin)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return None
+    # Latest useful departure per airport (-1 = cannot reach `dest`): prunes
+    # dead airports and flights, see reachability.py.
+    latest = reachability_index(table).latest(d)
+    if latest[s] < earliest_departure:
+        return None
+    h = None
+    if engine == "astar":
+        from astar import lower_bounds
+        h = lower_bounds(table, dest).price[cabin]
+    rows = _cheapest_search(table, s, d, earliest_departure, prices, latest, stats, h)
+    return None if rows is None else table.itinerary(rows)
+
+
+def _cheapest_search(
+    table: FlightTable,
+    s: int,
+    d: int,
+    earliest_departure: int,
+    prices: Sequence[int],
+    latest: Sequence[int],
+    stats: Optional[SearchStats] = None,
+    h: Optional[Sequence[int]] = None,
+) -> Optional[List[int]]:
+    """
+    Label search behind find_cheapest_itinerary(): rows of the cheapest
+    s -> d itinerary under `prices`, or None.
+
+    `h` (engine "astar"): a consistent lower bound per airport on the fare
+    still needed to reach `d` (astar.LowerBounds.price[cabin]); labels pop
+    by price + h. Zeros (the default) give plain Dijkstra.
     """
     import heapq
-    dist = {start: 0}
-    arr_time = {start: earliest_departure}
-    prev = {}
-    flight_taken = {}
-    heap = [(0, earliest_departure, start)]  # (total_price, curr_time, airport)
+    out_rows, out_departs = table.out_rows, table.out_departs
+    arrive, dest_col = table.arrive, table.dest
+    if h is None:
+        h = [0] * len(table.codes)
+    ready_by = [UNREACHED] * len(table.codes)
+    # Label k = (label_rows[k], label_parents[k]): flight row taken and the
+    # label it extended (-1 = left from `s`).
+    label_rows: List[int] = []
+    label_parents: List[int] = []
+    heap = [(h[s], earliest_departure, -1, s, 0)]  # (price + bound, ready, label, airport, price)
     while heap:
-        total_price, curr_time, airport = heapq.heappop(heap)
-        if airport == dest:
-            # reconstruct path
-            path = []
-            a = dest
-            while a != start:
-                f = flight_taken[a]
-                path.append(f)
-                a = f.origin
-            path.reverse()
-            return Itinerary(path)
-        for flight in graph.get(airport, []):
-            min_depart = curr_time if airport == start else curr_time + MIN_LAYOVER_MINUTES
-            if flight.depart >= min_depart:
-                price = total_price + flight.price_for(cabin)
-                if (flight.dest not in dist) or (price < dist[flight.dest]):
-                    dist[flight.dest] = price
-                    arr_time[flight.dest] = flight.arrive
-                    flight_taken[flight.dest] = flight
-                    heapq.heappush(heap, (price, flight.arrive, flight.dest))
+        if stats is not None:
+            stats.heap_pops += 1
+            stats.peak_heap = max(stats.peak_heap, len(heap))
+        _, ready, label, airport, total_price = heapq.heappop(heap)
+        if ready_by[airport] <= ready:
+            if stats is not None:
+                stats.stale_pops += 1
+            continue  # dominated: a cheaper label is already ready earlier
+        ready_by[airport] = ready
+        if airport == d:
+            if stats is not None:
+                stats.finish_heap(len(heap))
+            return label_path(label_rows, label_parents, label)
+        rows = out_rows[airport]
+        departs = out_departs[airport]
+        begin = bisect.bisect_left(departs, ready)
+        if stats is not None:
+            stats.edges_scanned += len(rows)
+            stats.edges_feasible += len(rows) - begin
+        for i in range(begin, bisect.bisect_right(departs, latest[airport])):
+            row = rows[i]
+            nxt = dest_col[row]
+            if nxt == s:
+                continue
+            next_ready = arrive[row] if nxt == d else arrive[row] + MIN_LAYOVER_MINUTES
+            if ready_by[nxt] <= next_ready or (nxt != d and next_ready > latest[nxt]):
+                continue
+            label_rows.append(row)
+            label_parents.append(label)
+            price = total_price + prices[row]
+            heapq.heappush(heap, (price + h[nxt], next_ready, len(label_rows) - 1, nxt, price))
+    if stats is not None:
+        stats.finish_heap(len(heap))
     return None
 
 
+def find_cheapest_itineraries(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    stats: Optional[SearchStats] = None,
+) -> Dict[Cabin, Optional[Itinerary]]:
+    """
+    Find the cheapest itinerary for every cabin in one search.
+
+    Returns a dict mapping each cabin in CABINS to its cheapest Itinerary
+    (or None), under the same timing & layover rules as
+    find_cheapest_itinerary().
+
+    How it works:
+    - Which flights can follow which does not depend on the cabin, only
+      the edge weight does. So labels carry a price vector (one entry per
+      cabin) and one search serves all three.
+    - The search sweeps forward in time from `start`: labels become
+      usable in ready-time order, and each reached airport's departures
+      (table.out_rows) are walked once, boarding with the cheapest
+      per-cabin prices ready there by then.
+    - Each label also remembers, per cabin, which label it extended, so
+      every cabin's path can be rebuilt independently at the end.
+    - `dest`'s reachability index and its best prices so far prune dead
+      airports, late flights and labels that cannot get cheaper in any
+      cabin (see _cheapest_sweep()).
+
+    Ties on price go to the earlier arrival at `dest`.
+
+    Complexity:
+    - Time:  O(E' log E') where E' = flights walked, instead of three
+      Dijkstra runs; on large schedules it reads a few percent of the
+      connections and runs in about half the time of three
+      find_cheapest_itinerary() calls (benchmarks/bench_cheapest_scan.py).
+    - Space: O(E') labels.
+
+    `stats` (SearchStats) records the search as engine "sweep".
+    """
+    if stats is not None:
+        return timed_search(stats, "sweep", _find_cheapest_all, graph, start, dest, earliest_departure)
+    return _find_cheapest_all(graph, start, dest, earliest_departure, None)
+
+
+def _find_cheapest_all(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    stats: Optional[SearchStats],
+) -> Dict[Cabin, Optional[Itinerary]]:
+    from reachability import reachability_index
+
+    table = as_table(graph)
+    result: Dict[Cabin, Optional[Itinerary]] = {cabin: None for cabin in CABINS}
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return result
+    latest = reachability_index(table).latest(d)
+    for cabin, rows in zip(CABINS, _cheapest_sweep(table, s, d, earliest_departure, latest, stats)):
+        result[cabin] = None if rows is None else table.itinerary(rows)
+    return result
+
+
+def _cheapest_sweep(
+    table: FlightTable,
+    s: int,
+    d: int,
+    earliest_departure: int,
+    latest: Sequence[int],
+    stats: Optional[SearchStats] = None,
+) -> List[Optional[List[int]]]:
+    """
+    The search behind find_cheapest_itineraries(): per cabin (CABINS
+    order), the rows of the cheapest s -> d itinerary, or None.
+
+    Events pop from one heap in time order, (minute, 0, label) when a
+    label becomes ready at its airport and (minute, 1, airport) for that
+    airport's next departure, so a label ready at minute t is folded into
+    best[airport] before a flight leaving at t is boarded:
+    - best[a][c] is the cheapest cabin-c price of any label ready at `a`
+      so far, best_from[a][c] the label holding it. A label that improves
+      no cabin there is dropped.
+    - An airport's departures are walked once, from its first ready label
+      on; each boarded flight makes one label priced best[a] + fare per
+      cabin, with parents best_from[a].
+    - Reachability (`latest`, see reachability.py) ends the walk at
+      latest[a] and drops arrivals too late to leave again.
+    - A label no cheaper in any cabin than `d`'s best arrival so far, or
+      than best[next airport] (ready earlier), is dropped; an airport
+      whose best prices are all matched at `d` stops walking until a
+      cheaper label wakes it.
+    """
+    import heapq
+    n = len(CABINS)
+    columns = [table.prices(cabin) for cabin in CABINS]
+    out_rows, out_departs = table.out_rows, table.out_departs
+    arrive, dest_col = table.arrive, table.dest
+    best: List[Optional[List[int]]] = [None] * len(table.codes)
+    best_from: List[Optional[List[int]]] = [None] * len(table.codes)
+    best[s], best_from[s] = [0] * n, [-1] * n
+    walking = [-1] * len(table.codes)  # next out_rows index per airport; -1 = asleep
+    found = [UNREACHED] * n  # cheapest price at `d` per cabin
+    found_at: List[Tuple[int, int]] = [(UNREACHED, -1)] * n  # (arrival, label)
+    label_rows: List[int] = []
+    label_parents: List[Tuple[int, ...]] = []
+    label_prices: List[List[int]] = []
+    heap: List[Tuple[int, int, int]] = []
+
+    def wake(airport: int, ready: int) -> None:
+        departs = out_departs[airport]
+        i = bisect.bisect_left(departs, ready)
+        if i < len(departs) and departs[i] <= latest[airport]:
+            walking[airport] = i
+            heapq.heappush(heap, (departs[i], 1, airport))
+
+    if latest[s] >= earliest_departure:
+        wake(s, earliest_departure)
+    while heap:
+        if stats is not None:
+            stats.heap_pops += 1
+            stats.peak_heap = max(stats.peak_heap, len(heap))
+        now, kind, item = heapq.heappop(heap)
+        if kind == 0:
+            airport = dest_col[label_rows[item]]
+            prices = label_prices[item]
+            mine, mine_from = best[airport], best_from[airport]
+            if mine is None:
+                best[airport], best_from[airport] = list(prices), [item] * n
+            else:
+                improved = False
+                for c in range(n):
+                    if prices[c] < mine[c]:
+                        mine[c] = prices[c]
+                        mine_from[c] = item
+                        improved = True
+                if not improved:
+                    if stats is not None:
+                        stats.stale_pops += 1
+                    continue  # dominated: cheaper in every cabin and ready earlier
+            if walking[airport] == -1:
+                wake(airport, now)
+            continue
+        airport = item
+        base, parents = best[airport], tuple(best_from[airport])
+        if all(base[c] >= found[c] for c in range(n)):
+            walking[airport] = -1  # nothing cheaper to carry from here yet
+            continue
+        rows, departs = out_rows[airport], out_departs[airport]
+        i = first = walking[airport]
+        end = bisect.bisect_right(departs, latest[airport])
+        # Board every flight leaving before the next event: anything ready
+        # by then is already folded into `base`.
+        while i < end and (not heap or (departs[i], 1, airport) < heap[0]):
+            row = rows[i]
+            i += 1
+            nxt = dest_col[row]
+            if nxt == s:
+                continue
+            ready = arrive[row] + MIN_LAYOVER_MINUTES
+            if nxt != d and ready > latest[nxt]:
+                continue  # dead flight: nothing from nxt reaches `d` after it lands
+            prices = [base[c] + columns[c][row] for c in range(n)]
+            if nxt == d:
+                better = [c for c in range(n) if (prices[c], arrive[row]) < (found[c], found_at[c][0])]
+                if not better:
+                    continue
+                for c in better:
+                    found[c] = prices[c]
+                    found_at[c] = (arrive[row], len(label_rows))
+            else:
+                there = best[nxt]
+                if all(prices[c] >= found[c] or (there is not None and prices[c] >= there[c]) for c in range(n)):
+                    continue
+                heapq.heappush(heap, (ready, 0, len(label_rows)))
+            label_rows.append(row)
+            label_parents.append(parents)
+            label_prices.append(prices)
+        if stats is not None:
+            stats.edges_scanned += i - first
+            stats.edges_feasible += i - first
+        if i < end:
+            walking[airport] = i
+            heapq.heappush(heap, (departs[i], 1, airport))
+        else:
+            walking[airport] = len(rows)  # walked up to latest[airport]: done
+    if stats is not None:
+        stats.finish_heap(0)
+        stats.labels_created = len(label_rows)
+    return [
+        None if label == -1 else label_path(label_rows, label_parents, label, slot=c)
+        for c, (_, label) in enumerate(found_at)
+    ]
+
+
+def _cheapest_scan(
+    table: FlightTable,
+    start_code: str,
+    start: int,
+    earliest_departure: int,
+) -> Dict[Cabin, SearchTree]:
+    """
+    The departure-order walk behind find_cheapest_trees(): every
+    connection from earliest_departure on, in departure order
+    (table.connection_rows), gives a label holding a price vector.
+
+    A label becomes usable at its destination once its arrival plus
+    MIN_LAYOVER_MINUTES has passed; `pending[airport]` is a heap of
+    (ready_time, label) waiting to be folded into `best[airport]`, the
+    per-cabin cheapest price of any usable arrival there.
+    """
+    import heapq
+    n = len(CABINS)
+    columns = [table.prices(cabin) for cabin in CABINS]
+    connection_rows = table.connection_rows
+    depart, arrive, origin, dest_col = table.depart, table.arrive, table.origin, table.dest
+    label_rows: List[int] = []
+    label_parents: List[Tuple[int, ...]] = []
+    label_prices: List[List[int]] = []
+    best: List[Optional[List[int]]] = [None] * len(table.codes)
+    best_from: List[Optional[List[int]]] = [None] * len(table.codes)
+    best[start], best_from[start] = [0] * n, [-1] * n
+    pending: List[List[Tuple[int, int]]] = [[] for _ in table.codes]
+    # result[airport][c] = (price, arrive, label) of its best arrival.
+    result: Dict[int, List[Optional[Tuple[int, int, int]]]] = {}
+
+    first = bisect.bisect_left(table.connection_departs, earliest_departure)
+    for i in range(first, len(connection_rows)):
+        row = connection_rows[i]
+        o = origin[row]
+        ready = pending[o]
+        while ready and ready[0][0] <= depart[row]:
+            _, label = heapq.heappop(ready)
+            prices = label_prices[label]
+            if best[o] is None:
+                best[o], best_from[o] = list(prices), [label] * n
+                continue
+            for c in range(n):
+                if prices[c] < best[o][c]:
+                    best[o][c] = prices[c]
+                    best_from[o][c] = label
+        base = best[o]
+        nxt = dest_col[row]
+        if base is None or nxt == start:
+            continue
+        label = len(label_rows)
+        prices = [base[c] + columns[c][row] for c in range(n)]
+        label_rows.append(row)
+        label_parents.append(tuple(best_from[o]))
+        label_prices.append(prices)
+        slots = result.setdefault(nxt, [None] * n)
+        for c in range(n):
+            cand = (prices[c], arrive[row], label)
+            if slots[c] is None or cand < slots[c]:
+                slots[c] = cand
+        heapq.heappush(pending[nxt], (arrive[row] + MIN_LAYOVER_MINUTES, label))
+
+    codes = table.codes
+    return {
+        cabin: SearchTree(
+            start_code,
+            earliest_departure,
+            {codes[a]: slots[c][0] for a, slots in result.items()},
+            {codes[a]: slots[c][2] for a, slots in result.items()},
+            label_rows,
+            label_parents,
+            table,
+            slot=c,
+        )
+        for c, cabin in enumerate(CABINS)
+    }
+
+
+def find_cheapest_trees(
+    graph: Graph,
+    start: str,
+    earliest_departure: int,
+) -> Dict[Cabin, SearchTree]:
+    """
+    One-to-all cheapest search: for each cabin, the lowest price to every
+    airport reachable from `start`, from a single departure-order walk.
+
+    All three trees share one label list. The walk reads every connection
+    from earliest_departure on, so for a single destination
+    find_cheapest_itineraries() is much cheaper.
+    """
+    table = as_table(graph)
+    s = table.ids.get(start)
+    if s is None:
+        return {cabin: SearchTree(start, earliest_departure, {}, {}, [], [], table) for cabin in CABINS}
+    return _cheapest_scan(table, start, s, earliest_departure)
+
+
 # ---------------------------------------------------------------------------
 # Formatting the comparison table
 # ---------------------------------------------------------------------------
@@ -484,6 +1762,60 @@ class ComparisonRow:
     note: str = ""  # e.g. "(no valid itinerary)"
 
 
+def comparison_rows(
+    earliest: Optional[Itinerary],
+    cheapest: Dict[Cabin, Optional[Itinerary]],
+) -> List[ComparisonRow]:
+    """The `compare` rows: earliest arrival, then cheapest per cabin."""
+    rows = [ComparisonRow(mode="Earliest Arrival", cabin=None, itinerary=earliest, note="" if earliest else "(no valid itinerary)")]
+    for cabin in CABINS:
+        itin = cheapest.get(cabin)
+        rows.append(ComparisonRow(mode="Cheapest", cabin=cabin, itinerary=itin, note="" if itin else "(no valid itinerary)"))
+    return rows
+
+
+def ranked_comparison_rows(
+    earliest: List[Itinerary],
+    cheapest: Dict[Cabin, List[Itinerary]],
+) -> List[ComparisonRow]:
+    """`compare --top K` rows: each mode's alternatives, ranked #1, #2, ..."""
+    groups: List[Tuple[str, Optional[Cabin], List[Itinerary]]] = [("Earliest Arrival", None, earliest)]
+    groups += [("Cheapest", cabin, cheapest.get(cabin, [])) for cabin in CABINS]
+    rows = []
+    for mode, cabin, itineraries in groups:
+        if not itineraries:
+            rows.append(ComparisonRow(mode=mode, cabin=cabin, itinerary=None, note="(no valid itinerary)"))
+        for rank, itin in enumerate(itineraries, 1):
+            rows.append(ComparisonRow(mode=f"{mode} #{rank}", cabin=cabin, itinerary=itin))
+    return rows
+
+
+def stops_comparison_rows(
+    earliest: List[Optional[Itinerary]],
+    cheapest: Dict[Cabin, List[Optional[Itinerary]]],
+) -> List[ComparisonRow]:
+    """
+    `compare --max-stops N` rows: entry k of each list is the best itinerary
+    with at most k stops. A stop limit gets a row only when it beats the
+    previous limit, so each row is a stops-vs-arrival (or price) tradeoff.
+    """
+    groups: List[Tuple[str, Optional[Cabin], List[Optional[Itinerary]]]] = [("Earliest Arrival", None, earliest)]
+    groups += [("Cheapest", cabin, cheapest.get(cabin, [])) for cabin in CABINS]
+    rows = []
+    for mode, cabin, by_stops in groups:
+        best = None
+        for stops, itin in enumerate(by_stops):
+            if itin is None:
+                continue
+            score = itin.arrive_time if cabin is None else itin.total_price(cabin)
+            if best is None or score < best:
+                best = score
+                rows.append(ComparisonRow(mode=f"{mode} (<= {stops} stops)", cabin=cabin, itinerary=itin))
+        if best is None:
+            rows.append(ComparisonRow(mode=mode, cabin=cabin, itinerary=None, note="(no valid itinerary)"))
+    return rows
+
+
 def format_comparison_table(
     origin: str,
     dest: str,
@@ -540,6 +1872,13 @@ def format_comparison_table(
 # ---------------------------------------------------------------------------
 
 
+def _load_schedule(path: str) -> FlightTable:
+    """Load the indexed schedule table for a subcommand, via a snapshot if fresh."""
+    from snapshot import load_schedule_table
+    with span("load_schedule"):
+        return load_schedule_table(path)
+
+
 def run_compare(args: argparse.Namespace) -> None:
     """
     Handle the 'compare' subcommand.
@@ -557,32 +1896,229 @@ def run_compare(args: argparse.Namespace) -> None:
 
     TODO:
     - Parse earliest_departure using parse_time().
-    - Call load_flights(args.flight_file).
-    - Call build_graph(...) on the loaded flights.
-    - Call find_earliest_itinerary(...) and find_cheapest_itinerary(...) 3 times.
-    - Build a list[ComparisonRow] for these 4 results.
+    - Call load_flights(args.flight_file) and build_graph(...) on the
+      loaded flights (or load a compiled snapshot, see snapshot.py).
+    - Call find_earliest_itinerary(...) and find_cheapest_itineraries(...)
+      (one search for all cabins).
+    - Build the 4 ComparisonRows (comparison_rows()).
     - Call format_comparison_table(...) and print the string.
     """
+    with span("parse_time"):
+        earliest_departure = parse_time(args.departure_time)
+    graph = _load_schedule(args.flight_file)
+    if args.stats and (args.max_stops is not None or args.top > 1 or args.patterns is not None):
+        print("--stats only covers the live searches; ignored with --top/--max-stops/--patterns", file=sys.stderr)
+    earliest_stats = cheapest_stats = None
+    if args.max_stops is not None:
+        from raptor import raptor_cheapest, raptor_earliest
+
+        with span("raptor_earliest"):
+            earliest_rounds = raptor_earliest(graph, args.origin, args.dest, earliest_departure, args.max_stops)
+        with span("raptor_cheapest"):
+            cheapest_rounds = {
+                cabin: raptor_cheapest(graph, args.origin, args.dest, earliest_departure, cabin, args.max_stops)
+                for cabin in CABINS
+            }
+        rows = stops_comparison_rows(earliest_rounds, cheapest_rounds)
+    elif args.top > 1:
+        from k_best import find_k_cheapest_itineraries, find_k_earliest_itineraries
+
+        with span("find_k_earliest_itineraries"):
+            earliest_ranked = find_k_earliest_itineraries(graph, args.origin, args.dest, earliest_departure, args.top)
+        with span("find_k_cheapest_itineraries"):
+            cheapest_ranked = {
+                cabin: find_k_cheapest_itineraries(graph, args.origin, args.dest, earliest_departure, cabin, args.top)
+                for cabin in CABINS
+            }
+        rows = ranked_comparison_rows(earliest_ranked, cheapest_ranked)
+    elif args.patterns is not None:
+        from transfer_patterns import load_transfer_patterns
+
+        with span("load_transfer_patterns"):
+            index = load_transfer_patterns(args.patterns)
+        with span("patterns.bind"):
+            index.bind(graph, args.flight_file)
+        with span("patterns.earliest"):
+            earliest = index.earliest(graph, args.origin, args.dest, earliest_departure)
+        with span("patterns.cheapest"):
+            cheapest = index.cheapest_all(graph, args.origin, args.dest, earliest_departure)
+        rows = comparison_rows(earliest, cheapest)
+    else:
+        if args.stats:
+            earliest_stats, cheapest_stats = SearchStats(), SearchStats()
+        with span("find_earliest_itinerary"):
+            earliest = find_earliest_itinerary(
+                graph, args.origin, args.dest, earliest_departure, engine=args.engine, stats=earliest_stats
+            )
+        with span("find_cheapest_itineraries"):
+            cheapest = find_cheapest_itineraries(
+                graph, args.origin, args.dest, earliest_departure, stats=cheapest_stats
+            )
+        rows = comparison_rows(earliest, cheapest)
+    with span("format_comparison_table"):
+        table = format_comparison_table(args.origin, args.dest, earliest_departure, rows)
+    print(table)
+    if earliest_stats is not None:
+        print(f"stats {'earliest':<9} {earliest_stats.summary()}")
+        print(f"stats {'cheapest':<9} {cheapest_stats.summary()}")
+
+
+def run_frontier(args: argparse.Namespace) -> None:
+    """
+    Handle the 'frontier' subcommand.
+
+    Prints every Pareto-optimal (arrival time, price) itinerary for one
+    cabin, earliest first, followed by the search's label counts.
+    """
+    from pareto import find_pareto_itineraries
+
     earliest_departure = parse_time(args.departure_time)
-    flights = load_flights(args.flight_file)
-    graph = build_graph(flights)
-    earliest = find_earliest_itinerary(graph, args.origin, args.dest, earliest_departure)
-    cheapest_economy = find_cheapest_itinerary(graph, args.origin, args.dest, earliest_departure, "economy")
-    cheapest_business = find_cheapest_itinerary(graph, args.origin, args.dest, earliest_departure, "business")
-    cheapest_first = find_cheapest_itinerary(graph, args.origin, args.dest, earliest_departure, "first")
+    graph = _load_schedule(args.flight_file)
+    result = find_pareto_itineraries(graph, args.origin, args.dest, earliest_departure, args.cabin)
     rows = [
-        ComparisonRow(mode="Earliest Arrival", cabin=None, itinerary=earliest, note="" if earliest else "(no valid itinerary)"),
-        ComparisonRow(mode="Cheapest", cabin="economy", itinerary=cheapest_economy, note="" if cheapest_economy else "(no valid itinerary)"),
-        ComparisonRow(mode="Cheapest", cabin="business", itinerary=cheapest_business, note="" if cheapest_business else "(no valid itinerary)"),
-        ComparisonRow(mode="Cheapest", cabin="first", itinerary=cheapest_first, note="" if cheapest_first else "(no valid itinerary)")
+        ComparisonRow(mode=f"Frontier #{i}", cabin=args.cabin, itinerary=itin)
+        for i, itin in enumerate(result.itineraries, 1)
     ]
-    table = format_comparison_table(args.origin, args.dest, earliest_departure, rows)
-    print(table)
+    if not rows:
+        rows.append(ComparisonRow(mode="Frontier", cabin=args.cabin, itinerary=None, note="(no valid itinerary)"))
+    print(format_comparison_table(args.origin, args.dest, earliest_departure, rows))
+    print(f"labels: {result.labels_created} created, {result.labels_pruned} pruned")
+
+
+def run_profile(args: argparse.Namespace) -> None:
+    """
+    Handle the 'profile' subcommand.
+
+    Prints the departure-time -> earliest-arrival step function for a
+    route: each row is the best itinerary for anyone ready to leave after
+    the previous row's departure.
+    """
+    from connection_scan import csa_profile
+
+    earliest_departure = parse_time(args.departure_time)
+    graph = _load_schedule(args.flight_file)
+    profile = csa_profile(graph, args.origin, args.dest, earliest_departure)
+    rows = [
+        ComparisonRow(mode=f"Leave by {format_time(entry.depart)}", cabin=None, itinerary=entry.itinerary)
+        for entry in profile
+    ]
+    if not rows:
+        rows.append(ComparisonRow(mode="Profile", cabin=None, itinerary=None, note="(no valid itinerary)"))
+    print(format_comparison_table(args.origin, args.dest, earliest_departure, rows))
+
+
+def run_compile(args: argparse.Namespace) -> None:
+    """
+    Handle the 'compile' subcommand: write a binary snapshot of a schedule.
+    """
+    from snapshot import write_snapshot
+
+    path = write_snapshot(args.flight_file, args.output)
+    print(f"Wrote {path}")
+
+
+def run_patterns(args: argparse.Namespace) -> None:
+    """
+    Handle the 'patterns' subcommand: build and write the transfer-pattern
+    index for a schedule (used by compare --patterns).
+    """
+    from transfer_patterns import build_transfer_patterns, patterns_path_for, write_transfer_patterns
+
+    index = build_transfer_patterns(_load_schedule(args.flight_file), args.flight_file)
+    path = write_transfer_patterns(index, args.output or patterns_path_for(args.flight_file))
+    print(f"Wrote {path}: {len(index)} patterns for {len(index.patterns)} routes in {index.build_seconds:.2f} s")
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    """
+    Handle the 'batch' subcommand: answer many compare queries against one
+    loaded schedule, streaming results in input order.
+    """
+    import batch
+
+    graph = _load_schedule(args.flight_file)
+    source = sys.stdin if args.queries == "-" else open(args.queries, encoding="utf-8")
+    try:
+        results = batch.run_batch(
+            graph,
+            batch.read_queries(source),
+            workers=args.workers,
+            chunksize=args.chunksize,
+            engine=args.engine,
+        )
+        batch.write_results(results, sys.stdout, args.format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def run_serve(args: argparse.Namespace) -> None:
+    """
+    Handle the 'serve' subcommand: keep the schedule loaded and answer
+    JSON-lines requests (see server.py) until interrupted or stdin ends.
+    """
+    import asyncio
+
+    from server import serve
+
+    if args.watch is not None:
+        from hot_reload import ScheduleWatcher
+        graph, watcher = None, ScheduleWatcher(args.flight_file, interval=args.watch)
+    else:
+        graph, watcher = _load_schedule(args.flight_file), None
+    try:
+        asyncio.run(serve(
+            graph,
+            watcher=watcher,
+            socket_path=args.socket,
+            port=args.port,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            engine=args.engine,
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {text}")
+    return value
+
+
+def _non_negative_int(text: str) -> int:
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0: {text}")
+    return value
+
+
+def _add_tracing_arguments(parser: argparse.ArgumentParser) -> None:
+    """Phase timing / profiling flags (see tracing.py; FLYWISE_* env vars work for every command)."""
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print a per-phase time breakdown to stderr (or set FLYWISE_TIMINGS=1).",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="FILE",
+        help="Write a Chrome trace (JSON) of the phases to FILE (or set FLYWISE_TRACE).",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        metavar="FILE",
+        help="Write cProfile stats for the whole command to FILE (or set FLYWISE_PROFILE).",
+    )
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
     """
-    Build the top-level argument parser with a 'compare' subcommand.
+    Build the top-level argument parser ('compare', 'frontier', 'profile',
+    'compile', 'patterns', 'batch', 'serve').
 
     You generally do NOT need to change this unless you add features.
     """
@@ -597,7 +2133,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
     )
     compare_parser.add_argument(
         "flight_file",
-        help="Path to the flight schedule file (.txt or .csv).",
+        help="Path to the flight schedule file (.txt, .csv or compiled .fwsnap).",
     )
     compare_parser.add_argument(
         "origin",
@@ -611,8 +2147,173 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "departure_time",
         help="Earliest allowed departure time (HH:MM, 24-hour).",
     )
+    compare_parser.add_argument(
+        "--engine",
+        choices=EARLIEST_ENGINES,
+        default="dijkstra",
+        help="Search engine for the earliest-arrival row (default: dijkstra).",
+    )
+    alternatives = compare_parser.add_mutually_exclusive_group()
+    alternatives.add_argument(
+        "--top",
+        type=_positive_int,
+        default=1,
+        metavar="K",
+        help="Show the K best alternatives per mode, ranked (default: 1).",
+    )
+    alternatives.add_argument(
+        "--max-stops",
+        type=_non_negative_int,
+        default=None,
+        metavar="N",
+        help="Best itinerary per mode for each stop limit 0..N (RAPTOR rounds); "
+             "a limit is shown only if it improves on fewer stops.",
+    )
+    alternatives.add_argument(
+        "--patterns",
+        default=None,
+        metavar="INDEX",
+        help="Answer from a transfer-pattern index written by 'patterns' instead of searching live.",
+    )
+    compare_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print work counters (heap traffic, edges, labels, time) for the earliest and cheapest searches.",
+    )
+    _add_tracing_arguments(compare_parser)
     compare_parser.set_defaults(func=run_compare)
 
+    frontier_parser = subparsers.add_parser(
+        "frontier",
+        help="List every arrival-time vs price tradeoff itinerary for a route.",
+    )
+    frontier_parser.add_argument("flight_file", help="Path to the flight schedule file (.txt, .csv or .fwsnap).")
+    frontier_parser.add_argument("origin", help="Origin airport code (e.g., ICN).")
+    frontier_parser.add_argument("dest", help="Destination airport code (e.g., SFO).")
+    frontier_parser.add_argument("departure_time", help="Earliest allowed departure time (HH:MM, 24-hour).")
+    frontier_parser.add_argument(
+        "--cabin",
+        choices=CABINS,
+        default="economy",
+        help="Cabin whose prices are traded off against arrival time (default: economy).",
+    )
+    frontier_parser.set_defaults(func=run_frontier)
+
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="Earliest arrival for every departure time on a route, in one sweep.",
+    )
+    profile_parser.add_argument("flight_file", help="Path to the flight schedule file (.txt, .csv or .fwsnap).")
+    profile_parser.add_argument("origin", help="Origin airport code (e.g., ICN).")
+    profile_parser.add_argument("dest", help="Destination airport code (e.g., SFO).")
+    profile_parser.add_argument(
+        "departure_time",
+        nargs="?",
+        default="00:00",
+        help="Only consider departures at or after this time (HH:MM, default 00:00).",
+    )
+    profile_parser.set_defaults(func=run_profile)
+
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="Write a binary snapshot of a schedule so later commands skip parsing.",
+    )
+    compile_parser.add_argument("flight_file", help="Path to the flight schedule file (.txt or .csv).")
+    compile_parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Snapshot path (default: FLIGHT_FILE.fwsnap, picked up automatically).",
+    )
+    compile_parser.set_defaults(func=run_compile)
+
+    patterns_parser = subparsers.add_parser(
+        "patterns",
+        help="Precompute the transfer-pattern index for a schedule (for compare --patterns).",
+    )
+    patterns_parser.add_argument("flight_file", help="Path to the flight schedule file (.txt, .csv or .fwsnap).")
+    patterns_parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Index path (default: FLIGHT_FILE.fwtp).",
+    )
+    patterns_parser.set_defaults(func=run_patterns)
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Answer many compare queries (ORIGIN DEST HH:MM per line) against one loaded schedule.",
+    )
+    batch_parser.add_argument("flight_file", help="Path to the flight schedule file (.txt, .csv or .fwsnap).")
+    batch_parser.add_argument(
+        "queries",
+        nargs="?",
+        default="-",
+        help="File with one 'ORIGIN DEST HH:MM' query per line (default: stdin).",
+    )
+    batch_parser.add_argument(
+        "--format",
+        choices=("table", "csv", "ndjson"),
+        default="table",
+        help="Output format (default: table, as printed by compare).",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Worker processes (default: CPU count; 1 runs in-process).",
+    )
+    batch_parser.add_argument(
+        "--chunksize",
+        type=_positive_int,
+        default=256,
+        help="Queries per worker task (default: 256).",
+    )
+    batch_parser.add_argument(
+        "--engine",
+        choices=EARLIEST_ENGINES,
+        default="dijkstra",
+        help="Search engine for the earliest-arrival row (default: dijkstra).",
+    )
+    _add_tracing_arguments(batch_parser)
+    batch_parser.set_defaults(func=run_batch)
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Keep the schedule loaded and answer JSON-lines requests (stdin, Unix socket or local port).",
+    )
+    serve_parser.add_argument("flight_file", help="Path to the flight schedule file (.txt, .csv or .fwsnap).")
+    listen = serve_parser.add_mutually_exclusive_group()
+    listen.add_argument("--socket", default=None, help="Listen on this Unix socket path.")
+    listen.add_argument("--port", type=int, default=None, help="Listen on 127.0.0.1:PORT.")
+    serve_parser.add_argument(
+        "--workers",
+        type=_non_negative_int,
+        default=None,
+        help="Search processes (default: CPU count; 0 searches on one in-process thread).",
+    )
+    serve_parser.add_argument(
+        "--queue-size",
+        type=_positive_int,
+        default=1024,
+        help="Requests allowed to wait for a worker before clients are throttled (default: 1024).",
+    )
+    serve_parser.add_argument(
+        "--engine",
+        choices=EARLIEST_ENGINES,
+        default="dijkstra",
+        help="Default earliest-arrival engine; requests may override it (default: dijkstra).",
+    )
+    serve_parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Poll the schedule file this often and hot-swap in a rebuilt graph when it changes (.txt/.csv only).",
+    )
+    _add_tracing_arguments(serve_parser)
+    serve_parser.set_defaults(func=run_serve)
+
     return parser
 
 
@@ -625,10 +2326,18 @@ def main(argv: Optional[List[str]] = None) -> None:
     """
     parser = build_arg_parser()
     args = parser.parse_args(argv)
-    args.func(args)
+    with tracing(
+        timings=getattr(args, "timings", False),
+        trace_path=getattr(args, "trace", None),
+        profile_path=getattr(args, "profile_out", None),
+    ):
+        args.func(args)
 
 
 if __name__ == "__main__":
+    # Helper modules (connection_scan, ...) import `flight_planner`; make
+    # them share this module instead of loading a second copy.
+    sys.modules.setdefault("flight_planner", sys.modules[__name__])
     main()
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,181 @@
+"""
+Hot reload: watch a schedule file and swap in a rebuilt graph when it changes.
+
+ScheduleWatcher polls the file's (mtime, size) (no inotify or other
+services). When they change it rebuilds the FlightGraph, on the polling
+thread when started with start(), and then replaces `watcher.graph` in a
+single attribute assignment. A search that already read `watcher.graph`
+keeps using that object, so it finishes on the old schedule. The next read
+gets the new one. Readers never wait for a reload.
+
+Reloads are incremental at the text level. Each non-blank line of the
+previous load is remembered with its parsed Flight. Unchanged lines reuse
+that Flight object, and only new or edited lines are parsed again (for CSV,
+a changed header forces a full reparse). The new graph's search table is
+built before the swap, so the first query after a reload does not pay for
+it either.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flight_planner import Flight, FlightGraph, build_graph, csv_row_parser, parse_flight_line_txt
+
+Signature = Tuple[int, int]  # (mtime_ns, size)
+
+
+@dataclass
+class ReloadStats:
+    checks: int = 0
+    swaps: int = 0
+    failures: int = 0
+    last_duration_s: float = 0.0
+    total_duration_s: float = 0.0
+    lines_parsed: int = 0  # last successful reload
+    lines_reused: int = 0  # last successful reload
+    last_error: str = ""
+
+
+class ScheduleWatcher:
+    """
+    Current FlightGraph for `path`, reloaded when the file changes.
+
+    interval: seconds between polls once start() is called; check() can
+        also be called directly (e.g. from an existing event loop).
+    on_swap: called with the new graph after each swap, on the reloading
+        thread.
+
+    The initial load happens in the constructor and raises on a bad file;
+    later failed reloads keep the current graph and are counted in `stats`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 1.0,
+        on_swap: Optional[Callable[[FlightGraph], None]] = None,
+    ) -> None:
+        self.path = path
+        self.interval = interval
+        self.on_swap = on_swap
+        self.stats = ReloadStats()
+        self._csv = Path(path).suffix.lower() == ".csv"
+        self._lines: Dict[str, Optional[Flight]] = {}
+        self._header: Optional[str] = None
+        self._reload_lock = threading.Lock()  # one reload at a time; readers never take it
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._stat()
+        self.graph: FlightGraph = self._build()
+
+    def _stat(self) -> Signature:
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _build(self) -> FlightGraph:
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            lines = f.read().splitlines()
+        previous, cache = self._lines, {}
+        parse_row = None
+        start = 0
+        if self._csv:
+            header = lines[0] if lines else ""
+            parse_row = csv_row_parser(next(csv.reader([header]), None))
+            if header != self._header:
+                previous = {}
+            start = 1
+        parsed = reused = 0
+        flights: List[Flight] = []
+        for lineno in range(start, len(lines)):
+            line = lines[lineno]
+            if line in cache:
+                flight = cache[line]
+            elif line in previous:
+                flight = cache[line] = previous[line]
+                reused += 1
+            else:
+                if not line.strip():
+                    continue
+                try:
+                    if parse_row is not None:
+                        flight = parse_row(next(csv.reader([line])))
+                    else:
+                        flight = parse_flight_line_txt(line)
+                except Exception as e:
+                    raise ValueError(f"{self.path}:{lineno + 1}: {e}")
+                cache[line] = flight
+                parsed += 1
+            if flight is not None:
+                flights.append(flight)
+        graph = build_graph(flights)
+        graph.table  # build the search table before anyone can see the graph
+        self._lines = cache
+        self._header = lines[0] if self._csv and lines else None
+        self.stats.lines_parsed, self.stats.lines_reused = parsed, reused
+        return graph
+
+    def check(self) -> bool:
+        """Poll the file once; reload and swap if it changed. True if swapped."""
+        self.stats.checks += 1
+        try:
+            signature = self._stat()
+        except OSError as e:  # e.g. mid-replace; keep serving the old graph
+            self.stats.last_error = str(e)
+            return False
+        if signature == self._signature:
+            return False
+        return self.reload(signature)
+
+    def reload(self, signature: Optional[Signature] = None) -> bool:
+        """Rebuild from the file now and swap it in; True on success."""
+        with self._reload_lock:
+            started = time.perf_counter()
+            try:
+                self._signature = signature or self._stat()
+                graph = self._build()
+            except (OSError, ValueError) as e:
+                # Remember the signature anyway: a broken file is retried
+                # once it changes again, not on every poll.
+                self.stats.failures += 1
+                self.stats.last_error = str(e)
+                return False
+            self.graph = graph
+            elapsed = time.perf_counter() - started
+            self.stats.swaps += 1
+            self.stats.last_duration_s = elapsed
+            self.stats.total_duration_s += elapsed
+            self.stats.last_error = ""
+        if self.on_swap is not None:
+            self.on_swap(graph)
+        return True
+
+    def start(self) -> ScheduleWatcher:
+        """Poll every `interval` seconds on a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="schedule-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def __enter__(self) -> ScheduleWatcher:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
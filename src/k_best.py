@@ -0,0 +1,131 @@
+"""
+K-best itineraries: the K earliest-arriving or K cheapest loopless routes.
+
+One best-first search enumerates partial itineraries (paths from `start`)
+in order of "cost so far + lower bound on the rest". Costs are arrival time
+or fare, and the bounds are the A* ones from astar.py. The bounds are
+consistent, so complete itineraries come off the heap in cost order: the
+first one popped at `dest` is the best, the next one the second best, and
+so on. Nothing is deleted and re-searched, which is what makes the
+usual delete-and-rerun approach quadratic.
+
+Each partial itinerary is a label (flight row, parent label); two labels
+are never merged, so every route is produced exactly once. A route never
+visits an airport twice (loopless), never continues past `dest`, and uses
+the reachability index (reachability.py) to skip flights that cannot lead
+to `dest` in time.
+
+The generators are lazy: stop iterating once you have enough.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from astar import lower_bounds
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    UNREACHED,
+    Cabin,
+    Graph,
+    Itinerary,
+    as_table,
+    label_path,
+)
+from reachability import reachability_index
+
+
+def _iter_routes(graph: Graph, start: str, dest: str, earliest_departure: int, cabin: Optional[Cabin]) -> Iterator[Itinerary]:
+    """Shared search: cost is the fare in `cabin`, or arrival time if None."""
+    table = as_table(graph)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return
+    latest = reachability_index(table).latest(d)
+    if latest[s] < earliest_departure:
+        return
+    bounds = lower_bounds(table, dest)
+    h = bounds.time if cabin is None else bounds.price[cabin]
+    prices = None if cabin is None else table.prices(cabin)
+    out_rows, out_departs = table.out_rows, table.out_departs
+    origin, arrive, dest_col = table.origin, table.arrive, table.dest
+
+    label_rows: List[int] = []
+    label_parents: List[int] = []
+    start_cost = earliest_departure if cabin is None else 0
+    # (cost + bound, push order, label, airport, ready, cost); label -1 = at `start`
+    heap = [(start_cost, 0, -1, s, earliest_departure, start_cost)]
+    pushed = 1
+    while heap:
+        _, _, label, airport, ready, cost = heapq.heappop(heap)
+        chain = label_path(label_rows, label_parents, label)
+        if airport == d:
+            yield table.itinerary(chain)
+            continue
+        visited = {origin[row] for row in chain}
+        visited.add(airport)
+        rows = out_rows[airport]
+        departs = out_departs[airport]
+        for i in range(bisect.bisect_left(departs, ready), bisect.bisect_right(departs, latest[airport])):
+            row = rows[i]
+            nxt = dest_col[row]
+            if nxt in visited or h[nxt] >= UNREACHED:
+                continue
+            if nxt == d:
+                next_ready = arrive[row]
+            else:
+                next_ready = arrive[row] + MIN_LAYOVER_MINUTES
+                if next_ready > latest[nxt]:
+                    continue  # cannot reach `dest` after landing there
+            next_cost = arrive[row] if prices is None else cost + prices[row]
+            label_rows.append(row)
+            label_parents.append(label)
+            heapq.heappush(heap, (next_cost + h[nxt], pushed, len(label_rows) - 1, nxt, next_ready, next_cost))
+            pushed += 1
+
+
+def iter_earliest_itineraries(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+) -> Iterator[Itinerary]:
+    """Loopless itineraries in order of arrival time (ties in discovery order)."""
+    return _iter_routes(graph, start, dest, earliest_departure, None)
+
+
+def iter_cheapest_itineraries(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabin: Cabin,
+) -> Iterator[Itinerary]:
+    """Loopless itineraries in order of total fare in `cabin`."""
+    return _iter_routes(graph, start, dest, earliest_departure, cabin)
+
+
+def find_k_earliest_itineraries(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    k: int,
+) -> List[Itinerary]:
+    """Up to `k` earliest-arriving itineraries, best first."""
+    return list(islice(iter_earliest_itineraries(graph, start, dest, earliest_departure), k))
+
+
+def find_k_cheapest_itineraries(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabin: Cabin,
+    k: int,
+) -> List[Itinerary]:
+    """Up to `k` cheapest itineraries in `cabin`, best first."""
+    return list(islice(iter_cheapest_itineraries(graph, start, dest, earliest_departure, cabin), k))
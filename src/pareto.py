@@ -0,0 +1,170 @@
+"""
+Multi-criteria (arrival time x price) search.
+
+find_earliest_itinerary() and find_cheapest_itinerary() each optimize one
+criterion. The search here keeps every itinerary that is not beaten on
+*both* criteria, so one query returns the whole tradeoff frontier between
+"arrive earliest" and "pay least".
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    Cabin,
+    Graph,
+    Itinerary,
+    as_table,
+)
+
+# A label: (ready_time, price, flight row taken to get here, parent label);
+# the root label at `start` has row None.
+Label = Tuple[int, int, Optional[int], Optional[tuple]]
+
+
+class ParetoBag:
+    """
+    Non-dominated (time, price) pairs for one airport.
+
+    Stored as two parallel lists sorted by time with strictly decreasing
+    price (a staircase), so a dominance check is one bisect and the bag
+    never holds a dominated entry.
+    """
+
+    __slots__ = ("times", "prices", "labels")
+
+    def __init__(self) -> None:
+        self.times: List[int] = []
+        self.prices: List[int] = []
+        self.labels: List[Label] = []
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def dominates(self, time: int, price: int) -> bool:
+        """True if some entry is no later and no more expensive."""
+        i = bisect.bisect_right(self.times, time)
+        return i > 0 and self.prices[i - 1] <= price
+
+    def insert(self, label: Label) -> int:
+        """
+        Insert a non-dominated label; return how many entries it evicts.
+
+        Callers must check dominates() first.
+        """
+        time, price = label[0], label[1]
+        i = bisect.bisect_left(self.times, time)
+        j = i
+        while j < len(self.times) and self.prices[j] >= price:
+            j += 1
+        evicted = j - i
+        self.times[i:j] = [time]
+        self.prices[i:j] = [price]
+        self.labels[i:j] = [label]
+        return evicted
+
+
+@dataclass
+class ParetoResult:
+    """
+    Outcome of find_pareto_itineraries().
+
+    itineraries: non-dominated itineraries, sorted by arrival time
+                 (so prices are strictly decreasing).
+    labels_created: labels that survived the dominance check on creation.
+    labels_pruned: labels rejected or later evicted as dominated.
+    """
+
+    cabin: Cabin
+    itineraries: List[Itinerary] = field(default_factory=list)
+    labels_created: int = 0
+    labels_pruned: int = 0
+
+
+def label_path_rows(label: Label) -> List[int]:
+    """Flight rows from the root label to `label`, in travel order."""
+    rows = []
+    while label is not None and label[2] is not None:
+        rows.append(label[2])
+        label = label[3]
+    rows.reverse()
+    return rows
+
+
+def find_pareto_itineraries(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabin: Cabin = "economy",
+) -> ParetoResult:
+    """
+    Return every Pareto-optimal itinerary on (arrival time, price in cabin).
+
+    Same timing rules as the single-criterion searches: the first leg
+    departs at or after `earliest_departure`, connections respect
+    MIN_LAYOVER_MINUTES.
+
+    Label-setting search:
+    - A label is (ready_time, price) at an airport, where ready_time is
+      arrival + MIN_LAYOVER_MINUTES (or earliest_departure at `start`).
+    - Labels are popped in (ready_time, price) order from a heap.
+    - bags[airport id] is a ParetoBag; a new label is dropped if the bag at
+      its airport, or the bag at `dest` (target pruning), dominates it.
+
+    Complexity:
+    - Time:  O(L * (log L + d)) where L = labels created, d = out-degree.
+    - Space: O(L).
+    """
+    table = as_table(graph)
+    prices = table.prices(cabin)
+    result = ParetoResult(cabin=cabin)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return result
+    out_rows, out_departs = table.out_rows, table.out_departs
+    arrive, dest_col = table.arrive, table.dest
+
+    bags: List[Optional[ParetoBag]] = [None] * len(table.codes)
+    bags[s] = ParetoBag()
+    bags[d] = ParetoBag()
+    dest_bag = bags[d]
+    root: Label = (earliest_departure, 0, None, None)
+    bags[s].insert(root)
+    heap: List[Tuple[int, int, int, int, Label]] = [(earliest_departure, 0, 0, s, root)]
+    counter = 1  # tie-breaker so labels themselves are never compared
+
+    while heap:
+        ready, price, _, airport, label = heapq.heappop(heap)
+        bag = bags[airport]
+        i = bisect.bisect_left(bag.times, ready)
+        if i >= len(bag) or bag.labels[i] is not label:
+            continue  # evicted after it was pushed
+        rows = out_rows[airport]
+        for j in range(bisect.bisect_left(out_departs[airport], ready), len(rows)):
+            row = rows[j]
+            nxt = dest_col[row]
+            if nxt == s:
+                continue
+            new_price = price + prices[row]
+            new_ready = arrive[row] if nxt == d else arrive[row] + MIN_LAYOVER_MINUTES
+            target = bags[nxt]
+            if target is None:
+                target = bags[nxt] = ParetoBag()
+            if dest_bag.dominates(arrive[row], new_price) or target.dominates(new_ready, new_price):
+                result.labels_pruned += 1
+                continue
+            new_label: Label = (new_ready, new_price, row, label)
+            result.labels_pruned += target.insert(new_label)
+            result.labels_created += 1
+            if nxt != d:
+                heapq.heappush(heap, (new_ready, new_price, counter, nxt, new_label))
+                counter += 1
+
+    result.itineraries = [table.itinerary(label_path_rows(lbl)) for lbl in dest_bag.labels]
+    return result
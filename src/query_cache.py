@@ -0,0 +1,150 @@
+"""
+Bounded LRU cache for route queries.
+
+Repeated lookups on an unchanged schedule return the stored Itinerary
+instead of re-running the search. Entries are only valid for the schedule
+version they were computed on (FlightGraph.version or FlightTable.version);
+the first query against a different version empties the cache.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+
+from flight_planner import (
+    Cabin,
+    FlightGraph,
+    FlightTable,
+    Graph,
+    Itinerary,
+    as_table,
+    compile_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+)
+
+Schedule = Union[FlightGraph, FlightTable]
+
+# (origin, dest, departure, mode, cabin) — cabin is None for earliest,
+# mode carries the engine for earliest queries ("earliest:csa").
+CacheKey = Tuple[str, str, int, str, Optional[str]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class QueryCache:
+    """
+    LRU cache in front of find_earliest_itinerary / find_cheapest_itinerary.
+
+    capacity: maximum number of stored results (> 0).
+    bucket_departures: if True, a requested departure time is first moved
+        forward to the next flight leaving the origin. Two times with no
+        departure from the origin between them give identical results
+        (the first leg is the only one that depends on it), so they
+        share one entry.
+
+    Results (including None for "no route") are returned as stored; treat
+    the Itinerary objects as read-only.
+
+    A plain adjacency dict has no version of its own: entries follow the
+    FlightGraph compile_graph() builds from it, which is reused while the
+    same dict is passed unchanged. Pass a FlightGraph for schedules that
+    change.
+    """
+
+    def __init__(self, capacity: int = 1024, bucket_departures: bool = False) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Cache capacity must be positive: {capacity}")
+        self.capacity = capacity
+        self.bucket_departures = bucket_departures
+        self.stats = CacheStats()
+        self.version: Optional[int] = None
+        self._entries: "OrderedDict[CacheKey, Optional[Itinerary]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def earliest(
+        self,
+        graph: Graph,
+        start: str,
+        dest: str,
+        earliest_departure: int,
+        engine: str = "dijkstra",
+    ) -> Optional[Itinerary]:
+        """Cached find_earliest_itinerary()."""
+        graph = self._schedule(graph)
+        departure = self._departure_key(graph, start, earliest_departure)
+        return self._lookup(
+            graph,
+            (start, dest, departure, f"earliest:{engine}", None),
+            lambda: find_earliest_itinerary(graph, start, dest, departure, engine=engine),
+        )
+
+    def cheapest(
+        self,
+        graph: Graph,
+        start: str,
+        dest: str,
+        earliest_departure: int,
+        cabin: Cabin,
+    ) -> Optional[Itinerary]:
+        """Cached find_cheapest_itinerary()."""
+        graph = self._schedule(graph)
+        departure = self._departure_key(graph, start, earliest_departure)
+        return self._lookup(
+            graph,
+            (start, dest, departure, "cheapest", cabin),
+            lambda: find_cheapest_itinerary(graph, start, dest, departure, cabin),
+        )
+
+    @staticmethod
+    def _schedule(graph: Graph) -> Schedule:
+        return graph if isinstance(graph, FlightTable) else compile_graph(graph)
+
+    def _departure_key(self, graph: Schedule, start: str, earliest_departure: int) -> int:
+        if not self.bucket_departures:
+            return earliest_departure
+        table = as_table(graph)
+        aid = table.ids.get(start)
+        departures = table.out_departs[aid] if aid is not None else None
+        if not departures:
+            return earliest_departure
+        i = bisect.bisect_left(departures, earliest_departure)
+        # Past the last departure every time answers "no route"; share one key.
+        return departures[i] if i < len(departures) else departures[-1] + 1
+
+    def _lookup(
+        self,
+        graph: Schedule,
+        key: CacheKey,
+        compute: Callable[[], Optional[Itinerary]],
+    ) -> Optional[Itinerary]:
+        if graph.version != self.version:
+            if self._entries:
+                self.stats.invalidations += 1
+                self._entries.clear()
+            self.version = graph.version
+        if key in self._entries:
+            self.stats.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.stats.misses += 1
+        result = compute()
+        self._entries[key] = result
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return result
@@ -0,0 +1,172 @@
+"""
+RAPTOR-style round-based search with a bound on the number of stops.
+
+Round k knows the best way to reach every airport using at most k flights:
+it only scans departures from airports that improved in round k - 1, and
+it reads round k - 1's arrivals, so nothing found in round k can use more
+than k flights. One run with max_stops = s does s + 1 rounds and yields
+the best itinerary for every stop limit 0..s at once. Filtering an
+unbounded search's answer cannot give these: when the overall best route
+has too many stops, the best route within the limit is a different one.
+
+- raptor_earliest(): arrival time per airport and round (classic RAPTOR;
+  an airport's flights play the role of one route each).
+- raptor_cheapest(): per airport, a ParetoBag of (ready time, price) labels
+  shared by all rounds. A label is kept only if no label with at most as
+  many flights is both ready no later and no more expensive (the
+  McRAPTOR idea, on two criteria).
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import List, Optional
+
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    UNREACHED,
+    Cabin,
+    Graph,
+    Itinerary,
+    as_table,
+)
+from pareto import Label, ParetoBag, label_path_rows
+from reachability import reachability_index
+
+
+def _check_stops(max_stops: int) -> None:
+    if max_stops < 0:
+        raise ValueError(f"max_stops must be >= 0: {max_stops}")
+
+
+def raptor_earliest(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    max_stops: int = 1,
+) -> List[Optional[Itinerary]]:
+    """
+    Earliest-arrival itineraries by stop limit.
+
+    Returns a list of max_stops + 1 entries: entry k is the earliest
+    arriving itinerary with at most k stops (k + 1 flights), or None.
+    Same timing and layover rules as find_earliest_itinerary().
+    """
+    _check_stops(max_stops)
+    table = as_table(graph)
+    results: List[Optional[Itinerary]] = [None] * (max_stops + 1)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return results
+    latest = reachability_index(table).latest(d)
+    out_rows, out_departs = table.out_rows, table.out_departs
+    origin, arrive, dest_col = table.origin, table.arrive, table.dest
+
+    arrivals = [UNREACHED] * len(table.codes)
+    arrivals[s] = earliest_departure
+    taken_by_round: List[List[int]] = []  # taken_by_round[k][a]: row that improved a in round k
+    marked = [s] if latest[s] >= earliest_departure else []
+    for k in range(max_stops + 1):
+        previous = arrivals[:]  # round k reads round k - 1 only
+        taken = [-1] * len(table.codes)
+        improved = []
+        for airport in marked:
+            ready = previous[airport] if airport == s else previous[airport] + MIN_LAYOVER_MINUTES
+            rows, departs = out_rows[airport], out_departs[airport]
+            for i in range(bisect.bisect_left(departs, ready), bisect.bisect_right(departs, latest[airport])):
+                row = rows[i]
+                b, t = dest_col[row], arrive[row]
+                if t >= arrivals[b] or t >= arrivals[d]:
+                    continue  # no improvement, or cannot beat the best at dest
+                if b != d and t + MIN_LAYOVER_MINUTES > latest[b]:
+                    continue  # dead flight
+                if taken[b] == -1 and b != d:
+                    improved.append(b)
+                arrivals[b] = t
+                taken[b] = row
+        taken_by_round.append(taken)
+        marked = improved
+        if arrivals[d] < UNREACHED:
+            results[k] = table.itinerary(_rows_for(taken_by_round, origin, s, d, k))
+    return results
+
+
+def _rows_for(taken_by_round: List[List[int]], origin, s: int, d: int, k: int) -> List[int]:
+    rows = []
+    airport = d
+    while airport != s:
+        while taken_by_round[k][airport] == -1:
+            k -= 1  # reached in an earlier round and not improved since
+        row = taken_by_round[k][airport]
+        rows.append(row)
+        airport = origin[row]
+        k -= 1
+    rows.reverse()
+    return rows
+
+
+def raptor_cheapest(
+    graph: Graph,
+    start: str,
+    dest: str,
+    earliest_departure: int,
+    cabin: Cabin,
+    max_stops: int = 1,
+) -> List[Optional[Itinerary]]:
+    """
+    Cheapest itineraries in `cabin` by stop limit.
+
+    Returns max_stops + 1 entries: entry k is the cheapest itinerary with at
+    most k stops (ties go to the earlier arrival), or None.
+    """
+    _check_stops(max_stops)
+    table = as_table(graph)
+    results: List[Optional[Itinerary]] = [None] * (max_stops + 1)
+    s, d = table.ids.get(start), table.ids.get(dest)
+    if s is None or d is None or s == d:
+        return results
+    latest = reachability_index(table).latest(d)
+    if latest[s] < earliest_departure:
+        return results
+    prices = table.prices(cabin)
+    out_rows, out_departs = table.out_rows, table.out_departs
+    arrive, dest_col = table.arrive, table.dest
+
+    bags: List[Optional[ParetoBag]] = [None] * len(table.codes)
+    best: Optional[Label] = None  # cheapest label at dest so far
+    frontier: List[Label] = [(earliest_departure, 0, None, None)]  # labels added in the last round
+    at = [s]  # airport of each frontier label
+    for k in range(max_stops + 1):
+        new_labels: List[Label] = []
+        new_at: List[int] = []
+        for label, airport in zip(frontier, at):
+            ready, price = label[0], label[1]
+            rows, departs = out_rows[airport], out_departs[airport]
+            for i in range(bisect.bisect_left(departs, ready), bisect.bisect_right(departs, latest[airport])):
+                row = rows[i]
+                b = dest_col[row]
+                new_price = price + prices[row]
+                if b == d:
+                    if best is None or new_price < best[1] or (new_price == best[1] and arrive[row] < best[0]):
+                        best = (arrive[row], new_price, row, label)
+                    continue
+                if b == s or (best is not None and new_price >= best[1]):
+                    continue
+                new_ready = arrive[row] + MIN_LAYOVER_MINUTES
+                if new_ready > latest[b]:
+                    continue  # dead flight
+                bag = bags[b]
+                if bag is None:
+                    bag = bags[b] = ParetoBag()
+                elif bag.dominates(new_ready, new_price):
+                    continue
+                new_label: Label = (new_ready, new_price, row, label)
+                bag.insert(new_label)
+                new_labels.append(new_label)
+                new_at.append(b)
+        if best is not None:
+            results[k] = table.itinerary(label_path_rows(best))
+        frontier, at = new_labels, new_at
+    return results
+
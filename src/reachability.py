@@ -0,0 +1,117 @@
+"""
+Reverse-reachability index: which airports and flights can still reach a
+destination, and until when.
+
+For a destination d, latest(d)[a] is the latest departure time of any
+flight out of airport a that still gets to d under the layover rules, or
+-1 if no flight from a leads to d at all. So a search sitting at `a`,
+ready at time r, can:
+- skip `a` outright when r > latest[a] (a dead airport);
+- stop walking a's departures after latest[a]; and
+- skip a flight into airport b (b != d) whose arrival + MIN_LAYOVER_MINUTES
+  is later than latest[b] (a dead flight).
+
+Each array comes from one backwards pass over the connection order
+(FlightTable.connection_rows). Going from the latest departure to the
+earliest, every flight that could follow the current one has already been
+seen, so latest[b] is final by the time any flight into b is scanned.
+"""
+
+from __future__ import annotations
+
+import weakref
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from flight_planner import DAY_END, MIN_LAYOVER_MINUTES, FlightTable, Graph, as_table
+
+
+@dataclass
+class ReachabilityStats:
+    builds: int = 0
+    hits: int = 0
+    evictions: int = 0
+
+
+class ReachabilityIndex:
+    """
+    Lazily built latest-departure arrays for one FlightTable, one per
+    destination id, kept in LRU order.
+
+    max_bytes: evict least recently used destinations once the arrays
+        take more than this (None = keep all; each costs 2 bytes/airport).
+
+    The cache empties itself when the table's version changes.
+    """
+
+    def __init__(self, table: FlightTable, max_bytes: Optional[int] = None) -> None:
+        self.table = table
+        self.max_bytes = max_bytes
+        self.stats = ReachabilityStats()
+        self.version = table.version
+        self._latest: "OrderedDict[int, array]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def nbytes(self) -> int:
+        """Bytes held by the cached arrays."""
+        return sum(a.itemsize * len(a) for a in self._latest.values())
+
+    def clear(self) -> None:
+        self._latest.clear()
+
+    def latest(self, dest: int) -> array:
+        """latest-departure array for destination id `dest` (built on first use)."""
+        if self.version != self.table.version:
+            self.clear()
+            self.version = self.table.version
+        found = self._latest.get(dest)
+        if found is not None:
+            self.stats.hits += 1
+            self._latest.move_to_end(dest)
+            return found
+        found = self._latest[dest] = self._build(dest)
+        self.stats.builds += 1
+        if self.max_bytes is not None:
+            while len(self._latest) > 1 and self.nbytes() > self.max_bytes:
+                self._latest.popitem(last=False)
+                self.stats.evictions += 1
+        return found
+
+    def can_reach(self, airport: str, dest: str, ready: int) -> bool:
+        """True if someone ready to leave `airport` at `ready` can still reach `dest`."""
+        a, d = self.table.ids.get(airport), self.table.ids.get(dest)
+        if a is None or d is None:
+            return False
+        return a == d or ready <= self.latest(d)[a]
+
+    def _build(self, d: int) -> array:
+        table = self.table
+        latest = array("h", [-1]) * len(table.codes)
+        connection_rows = table.connection_rows
+        origin, dest, depart, arrive = table.origin, table.dest, table.depart, table.arrive
+        for i in range(len(connection_rows) - 1, -1, -1):
+            row = connection_rows[i]
+            a = origin[row]
+            if a == d or depart[row] <= latest[a]:
+                continue  # never leave d; a later departure from a already works
+            b = dest[row]
+            if b == d or arrive[row] + MIN_LAYOVER_MINUTES <= latest[b]:
+                latest[a] = depart[row]
+        latest[d] = DAY_END  # anything may "depart" from the destination itself
+        return latest
+
+
+_indexes: "weakref.WeakKeyDictionary[FlightTable, ReachabilityIndex]" = weakref.WeakKeyDictionary()
+
+
+def reachability_index(graph: Graph) -> ReachabilityIndex:
+    """The shared, cached ReachabilityIndex for a schedule's table."""
+    table = as_table(graph)
+    index = _indexes.get(table)
+    if index is None:
+        index = _indexes[table] = ReachabilityIndex(table)
+    return index
@@ -0,0 +1,106 @@
+"""
+Delta files: bulk add / cancel / retime changes to a loaded schedule.
+
+One change per line; blank lines and '#' comments are skipped:
+
+    add ICN NRT FW999 08:00 10:00 300 800 1500   # same fields as a .txt schedule line
+    cancel FW101
+    retime FW102 09:15 11:45                     # new departure and arrival
+
+Changes go through FlightGraph / FlightTable add_flight(), remove_flight()
+and retime_flight(), so each one costs a few bisections rather than a
+rebuild, and bumps the schedule version (dependent caches drop their
+entries on their next lookup).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+from flight_planner import Flight, FlightGraph, FlightTable, parse_flight_line_txt, parse_time
+
+DELTA_OPS = ("add", "cancel", "retime")
+
+
+@dataclass(frozen=True)
+class ScheduleChange:
+    op: str  # one of DELTA_OPS
+    flight_number: str
+    flight: Optional[Flight] = None  # add
+    depart: int = 0  # retime
+    arrive: int = 0  # retime
+    line: int = 0
+
+
+def parse_change_line(line: str, lineno: int = 0) -> Optional[ScheduleChange]:
+    """Parse one delta line; None for blank/comment lines, ValueError if malformed."""
+    text = line.split("#", 1)[0].strip()
+    if not text:
+        return None
+    op, _, rest = text.partition(" ")
+    fields = rest.split()
+    if op == "add":
+        flight = parse_flight_line_txt(rest)
+        if flight is None:
+            raise ValueError(f"Malformed change line: {text}")
+        return ScheduleChange("add", flight.flight_number, flight=flight, line=lineno)
+    if op == "cancel" and len(fields) == 1:
+        return ScheduleChange("cancel", fields[0], line=lineno)
+    if op == "retime" and len(fields) == 3:
+        depart, arrive = parse_time(fields[1]), parse_time(fields[2])
+        if arrive <= depart:
+            raise ValueError(f"Arrival time must be after departure: {text}")
+        return ScheduleChange("retime", fields[0], depart=depart, arrive=arrive, line=lineno)
+    raise ValueError(f"Malformed change line: {text}")
+
+
+def iter_changes(path: str) -> Iterator[ScheduleChange]:
+    """Stream changes from a delta file; errors are raised as `path:lineno: ...`."""
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            try:
+                change = parse_change_line(line, lineno)
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+            if change:
+                yield change
+
+
+def apply_change(schedule: Union[FlightGraph, FlightTable], change: ScheduleChange) -> None:
+    """Apply one change in place; KeyError for unknown flights."""
+    if change.op == "add":
+        schedule.add_flight(change.flight)
+    elif change.op == "cancel":
+        schedule.remove_flight(change.flight_number)
+    else:
+        schedule.retime_flight(change.flight_number, change.depart, change.arrive)
+
+
+def apply_changes(
+    schedule: Union[FlightGraph, FlightTable],
+    changes: Iterable[ScheduleChange],
+    source: str = "<changes>",
+) -> int:
+    """
+    Apply changes in order; return how many were applied.
+
+    Stops at the first change that cannot be applied (unknown or duplicate
+    flight number) with a ValueError naming its line; earlier changes stay
+    applied.
+    """
+    count = 0
+    for change in changes:
+        try:
+            apply_change(schedule, change)
+        except KeyError:
+            raise ValueError(f"{source}:{change.line}: Unknown flight {change.flight_number}") from None
+        except ValueError as e:
+            raise ValueError(f"{source}:{change.line}: {e}") from None
+        count += 1
+    return count
+
+
+def apply_delta_file(schedule: Union[FlightGraph, FlightTable], path: str) -> int:
+    """Apply every change in the delta file at `path`; return the count."""
+    return apply_changes(schedule, iter_changes(path), source=path)
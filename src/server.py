@@ -0,0 +1,379 @@
+"""
+Long-running query server: load the schedule once, answer many requests.
+
+Requests and responses are JSON lines, over stdin/stdout, a Unix socket or
+a localhost TCP port:
+
+    {"id": 1, "op": "compare", "origin": "ICN", "dest": "SFO", "departure": "07:00"}
+    {"id": 2, "op": "cheapest", "origin": "ICN", "dest": "SFO", "departure": "07:00", "cabin": "first"}
+    {"id": 3, "op": "stats"}
+
+ops: compare (earliest + cheapest per cabin), earliest, cheapest (all
+cabins unless "cabin" is given) and stats. Optional "engine" picks the
+earliest-arrival engine. Replies echo "id" and carry either "result" or
+"error":
+
+    {"id": 1, "ok": true, "result": {"earliest": {...}, "cheapest": {...}}}
+
+A connection may pipeline requests; replies come back as they finish, so
+use "id" to match them.
+
+An asyncio event loop does the I/O. Searches are CPU-bound, so they run on
+a process pool whose workers receive the FlightTable once (batch.table_pool(),
+shared with the batch command; workers=0 uses a single in-process thread).
+Accepted requests wait in one bounded asyncio.Queue; when it is full,
+connections stop being read until it drains, so a burst of clients cannot
+grow memory without limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Awaitable, Callable, Deque, List, Optional, Sequence, Tuple
+
+from batch import itinerary_json, table_pool, worker_table
+from hot_reload import ScheduleWatcher
+from flight_planner import (
+    CABINS,
+    EARLIEST_ENGINES,
+    FlightTable,
+    Graph,
+    as_table,
+    find_cheapest_itineraries,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    parse_time,
+)
+from tracing import span
+
+SERVER_OPS = ("compare", "earliest", "cheapest", "stats")
+
+# Latencies kept for the percentile window in `stats`.
+LATENCY_WINDOW = 10_000
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil without floats
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+@dataclass
+class ServerStats:
+    started: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    errors: int = 0
+    by_op: Counter = field(default_factory=Counter)
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, op: str, latency_ms: float, ok: bool) -> None:
+        self.requests += 1
+        self.by_op[op] += 1
+        if not ok:
+            self.errors += 1
+        self.latencies_ms.append(latency_ms)
+
+    def snapshot(self) -> dict:
+        window = sorted(self.latencies_ms)
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "by_op": dict(self.by_op),
+            "latency_ms": {
+                "samples": len(window),
+                "p50": round(percentile(window, 50), 3),
+                "p95": round(percentile(window, 95), 3),
+                "p99": round(percentile(window, 99), 3),
+                "max": round(window[-1], 3) if window else 0.0,
+            },
+        }
+
+
+def answer(table: FlightTable, op: str, origin: str, dest: str, t0: int, cabin: Optional[str], engine: str) -> dict:
+    """Run one search request and return its JSON-ready result."""
+    result: dict = {}
+    if op in ("compare", "earliest"):
+        with span("find_earliest_itinerary"):
+            itin = find_earliest_itinerary(table, origin, dest, t0, engine=engine)
+        result["earliest"] = itinerary_json(itin, None)
+    if op in ("compare", "cheapest"):
+        if cabin:
+            cabins = (cabin,)
+            with span("find_cheapest_itinerary"):
+                cheapest = {cabin: find_cheapest_itinerary(table, origin, dest, t0, cabin)}
+        else:
+            cabins = CABINS
+            with span("find_cheapest_itineraries"):
+                cheapest = find_cheapest_itineraries(table, origin, dest, t0)
+        result["cheapest"] = {c: itinerary_json(cheapest[c], c) for c in cabins}
+    return result
+
+
+def _answer_in_worker(op: str, origin: str, dest: str, t0: int, cabin: Optional[str], engine: str) -> dict:
+    return answer(worker_table(), op, origin, dest, t0, cabin, engine)
+
+
+def parse_request(line: str, default_engine: str = "dijkstra") -> dict:
+    """Decode and validate one request line; raises ValueError if malformed."""
+    return validate_request(decode_request(line), default_engine)
+
+
+def decode_request(line: str) -> dict:
+    """Decode one request line into a JSON object; raises ValueError otherwise."""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid JSON: {exc.msg}") from None
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    return request
+
+
+def validate_request(request: dict, default_engine: str = "dijkstra") -> dict:
+    """
+    Check a decoded request and fill in t0 and engine; raises ValueError if
+    invalid. Split from decode_request() so errors can still echo the id.
+    """
+    op = request.get("op")
+    if op not in SERVER_OPS:
+        raise ValueError(f"unknown op {op!r} (expected one of {', '.join(SERVER_OPS)})")
+    if op == "stats":
+        return request
+    for key in ("origin", "dest", "departure"):
+        if not isinstance(request.get(key), str):
+            raise ValueError(f"missing or non-string field {key!r}")
+    request["t0"] = parse_time(request["departure"])
+    cabin = request.get("cabin")
+    if cabin is not None and (op != "cheapest" or cabin not in CABINS):
+        raise ValueError(f"invalid cabin {cabin!r} for op {op!r}")
+    request.setdefault("engine", default_engine)
+    if request["engine"] not in EARLIEST_ENGINES:
+        raise ValueError(f"unknown engine {request['engine']!r}")
+    return request
+
+
+class QueryServer:
+    """
+    Resident schedule plus a bounded request queue feeding a worker pool.
+
+    workers: search processes (default os.cpu_count()); 0 runs searches on
+        one background thread of this process.
+    queue_size: accepted requests allowed to wait for a worker.
+    """
+
+    def __init__(
+        self,
+        graph: Graph,
+        workers: Optional[int] = None,
+        queue_size: int = 1024,
+        engine: str = "dijkstra",
+    ) -> None:
+        if queue_size <= 0:
+            raise ValueError(f"Queue size must be positive: {queue_size}")
+        self.table = as_table(graph)
+        self.engine = engine
+        self.stats = ServerStats()
+        self._workers = workers
+        self._queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[Executor] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._search: Optional[Callable[..., dict]] = None
+        self.watcher: Optional[ScheduleWatcher] = None  # set when serving with hot reload
+
+    async def start(self) -> None:
+        """Start the worker pool and dispatcher tasks (idempotent)."""
+        if self._queue is not None:
+            return
+        self._executor, self._search = self._make_executor()
+        # With processes, keep every worker busy while results travel back.
+        concurrency = 1 if self._workers == 0 else 2 * (self._workers or os.cpu_count() or 1)
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(concurrency)]
+
+    def _make_executor(self) -> Tuple[Executor, Callable[..., dict]]:
+        if self._workers == 0:
+            return ThreadPoolExecutor(max_workers=1), partial(answer, self.table)
+        workers = self._workers or os.cpu_count() or 1
+        pool = table_pool(self.table, workers)
+        return pool, _answer_in_worker
+
+    def swap(self, graph: Graph) -> None:
+        """
+        Answer new requests from `graph`. Must run on the event loop thread.
+
+        Searches already handed to the old pool finish there, on the old
+        schedule; the old pool shuts down once they are done.
+        """
+        self.table = as_table(graph)
+        if self._executor is not None:
+            old = self._executor
+            self._executor, self._search = self._make_executor()
+            old.shutdown(wait=False)
+
+    async def close(self) -> None:
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        assert self._queue is not None
+        while True:
+            request, future = await self._queue.get()
+            try:
+                result = await loop.run_in_executor(
+                    self._executor,
+                    self._search,
+                    request["op"], request["origin"], request["dest"],
+                    request["t0"], request.get("cabin"), request["engine"],
+                )
+            except Exception as exc:  # a failing search must not kill the dispatcher
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def handle(self, readline: Callable[[], Awaitable[str]], write: Callable[[dict], Awaitable[None]]) -> None:
+        """Serve one connection until its input ends."""
+        await self.start()
+        assert self._queue is not None
+        replies: set = set()
+        while True:
+            line = await readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            started = time.perf_counter()
+            request = None
+            try:
+                request = decode_request(line)
+                validate_request(request, self.engine)
+            except ValueError as exc:
+                self.stats.record("invalid", _elapsed_ms(started), ok=False)
+                await write({"id": request.get("id") if request else None, "ok": False, "error": str(exc)})
+                continue
+            if request["op"] == "stats":
+                reply = self.stats.snapshot()
+                reply["queued"] = self._queue.qsize()
+                if self.watcher is not None:
+                    reply["reload"] = asdict(self.watcher.stats)
+                self.stats.record("stats", _elapsed_ms(started), ok=True)
+                await write({"id": request.get("id"), "ok": True, "result": reply})
+                continue
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((request, future))  # blocks reading while the queue is full
+            task = asyncio.create_task(self._reply(request, future, started, write))
+            replies.add(task)
+            task.add_done_callback(replies.discard)
+        if replies:
+            await asyncio.gather(*replies)
+
+    async def _reply(self, request: dict, future: asyncio.Future, started: float, write) -> None:
+        try:
+            result = await future
+        except Exception as exc:
+            self.stats.record(request["op"], _elapsed_ms(started), ok=False)
+            await write({"id": request.get("id"), "ok": False, "error": str(exc)})
+        else:
+            self.stats.record(request["op"], _elapsed_ms(started), ok=True)
+            await write({"id": request.get("id"), "ok": True, "result": result})
+
+    async def _handle_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def readline() -> str:
+            return (await reader.readline()).decode("utf-8")
+
+        async def write(message: dict) -> None:
+            writer.write((json.dumps(message) + "\n").encode("utf-8"))
+            await writer.drain()
+
+        try:
+            await self.handle(readline, write)
+        finally:
+            writer.close()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        await self.start()
+        return await asyncio.start_server(self._handle_stream, host, port)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        await self.start()
+        return await asyncio.start_unix_server(self._handle_stream, path)
+
+    async def serve_stdio(self) -> None:
+        """Answer requests from stdin until EOF, replies on stdout."""
+        loop = asyncio.get_running_loop()
+
+        async def readline() -> str:
+            return await loop.run_in_executor(None, sys.stdin.readline)
+
+        async def write(message: dict) -> None:
+            sys.stdout.write(json.dumps(message) + "\n")
+            sys.stdout.flush()
+
+        await self.handle(readline, write)
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000.0
+
+
+async def serve(
+    graph: Optional[Graph],
+    socket_path: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    queue_size: int = 1024,
+    engine: str = "dijkstra",
+    watcher: Optional[ScheduleWatcher] = None,
+) -> None:
+    """
+    Run a server on a Unix socket, a localhost port, or stdio (default).
+
+    With a `watcher`, its graph is served and every reload it makes is
+    swapped in (see QueryServer.swap); `graph` is then ignored.
+    """
+    if watcher is not None:
+        graph = watcher.graph
+    server = QueryServer(graph, workers=workers, queue_size=queue_size, engine=engine)
+    if watcher is not None:
+        loop = asyncio.get_running_loop()
+        server.watcher = watcher
+        watcher.on_swap = lambda new: loop.call_soon_threadsafe(server.swap, new)
+        watcher.start()
+    try:
+        if socket_path is None and port is None:
+            await server.serve_stdio()
+            return
+        if socket_path is not None:
+            listener = await server.start_unix(socket_path)
+        else:
+            listener = await server.start_tcp(port=port)
+        address = listener.sockets[0].getsockname()
+        print(f"serving on {address}", file=sys.stderr, flush=True)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        await server.close()
@@ -0,0 +1,221 @@
+"""
+Compiled binary schedule snapshots.
+
+`compile` parses a schedule file once and writes its indexed FlightTable
+(columns, per-airport departure indexes and connection order) next to it
+as `<schedule>.fwsnap`. load_schedule_table() uses the snapshot whenever
+it still matches the source file, and reparses otherwise; load_schedule()
+does the same but returns a FlightGraph.
+
+File layout (the container shared with transfer_patterns.py, see
+write_container() / read_container()):
+    MAGIC (6 bytes) | format version (u16) | header length (u32)
+    | JSON header | marshal payload
+
+The JSON header records the source file's size, mtime and SHA-256, and the
+byte order the payload was written in. The payload is
+FlightTable.to_columns(): every column and index as raw array bytes, so
+loading a table is one marshal.loads() and one frombytes() per array: no
+text parsing, no Flight objects and no sorting.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from flight_planner import FlightGraph, FlightTable, build_graph, iter_flights
+from tracing import span, traced_iter
+
+SNAPSHOT_MAGIC = b"FWSNAP"
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_SUFFIX = ".fwsnap"
+
+_PREFIX = struct.Struct("<6sHI")
+
+
+def snapshot_path_for(source: str) -> str:
+    """Default snapshot location for a schedule file."""
+    return source + SNAPSHOT_SUFFIX
+
+
+def write_container(path: str, magic: bytes, fmt: int, header: dict, payload: Any) -> str:
+    """
+    Write MAGIC | format | header length | JSON `header` | marshal `payload`
+    to `path` atomically (through a .tmp file); return the path.
+    """
+    header_bytes = json.dumps(header).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(magic, fmt, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(marshal.dumps(payload))
+    os.replace(tmp, path)
+    return path
+
+
+def read_container_header(path: str, magic: bytes, fmt: int) -> Optional[dict]:
+    """The JSON header of a `magic` container in format `fmt`, or None if `path` is not one."""
+    try:
+        with open(path, "rb") as f:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size:
+                return None
+            found, version, length = _PREFIX.unpack(prefix)
+            if found != magic or version != fmt:
+                return None
+            return json.loads(f.read(length))
+    except OSError:
+        return None
+
+
+def read_container(path: str, magic: bytes, fmt: int, what: str) -> Tuple[dict, Any]:
+    """(header, payload) of a `magic` container; raises ValueError naming `what` otherwise."""
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path}: not a {what}")
+        found, version, length = _PREFIX.unpack(prefix)
+        if found != magic or version != fmt:
+            raise ValueError(f"{path}: not a {what} (format {fmt})")
+        header = json.loads(f.read(length))
+        return header, marshal.loads(f.read())
+
+
+def _source_info(source: str, with_hash: bool = True) -> dict:
+    st = os.stat(source)
+    info = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        info["sha256"] = hashlib.sha256(Path(source).read_bytes()).hexdigest()
+    return info
+
+
+def write_snapshot(source: str, snapshot: Optional[str] = None) -> str:
+    """
+    Parse `source`, build its indexed table and write a snapshot; return its path.
+    """
+    snapshot = snapshot or snapshot_path_for(source)
+    payload = FlightTable.from_flights(iter_flights(source)).to_columns()
+    header = {"source": os.path.abspath(source), "byteorder": sys.byteorder, **_source_info(source)}
+    return write_container(snapshot, SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, header, payload)
+
+
+def read_snapshot_header(snapshot: str) -> Optional[dict]:
+    """Return the JSON header, or None if this is not a snapshot we can read."""
+    return read_container_header(snapshot, SNAPSHOT_MAGIC, SNAPSHOT_FORMAT)
+
+
+def snapshot_is_fresh(header: dict, source: str) -> bool:
+    """
+    True if `source` still matches what the snapshot was compiled from.
+
+    Size and mtime are checked first; if the mtime moved but the size did
+    not, the SHA-256 decides (so a plain `touch` does not force a reparse).
+    """
+    try:
+        info = _source_info(source, with_hash=False)
+    except OSError:
+        return False
+    if info["size"] != header.get("size"):
+        return False
+    if info["mtime_ns"] == header.get("mtime_ns"):
+        return True
+    return _source_info(source)["sha256"] == header.get("sha256")
+
+
+def load_snapshot_table(snapshot: str) -> FlightTable:
+    """Load the indexed table stored in a snapshot (no freshness check)."""
+    with span("load_snapshot"):
+        header, payload = read_container(snapshot, SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, "schedule snapshot")
+        return FlightTable.from_columns(payload, byteswap=header.get("byteorder") != sys.byteorder)
+
+
+def load_snapshot(snapshot: str) -> FlightGraph:
+    """Load a snapshot as a FlightGraph (no freshness check)."""
+    table = load_snapshot_table(snapshot)
+    flights = {row: table.flight(row) for row in table.live_rows()}
+    adjacency = {
+        table.codes[aid]: [flights[row] for row in rows]
+        for aid, rows in enumerate(table.out_rows)
+        if rows
+    }
+    return FlightGraph.from_sorted(adjacency, [flights[row] for row in table.connection_rows])
+
+
+def _resolve(path: str) -> Tuple[Optional[str], str]:
+    """
+    (snapshot to load or None, source to parse otherwise) for `path`:
+
+    - `path` may be a snapshot itself; it is used as long as its recorded
+      source is missing or unchanged, otherwise the source is reparsed.
+    - For a .txt/.csv path, a fresh `<path>.fwsnap` is used if present.
+    - Otherwise `path` itself is parsed.
+    """
+    header = read_snapshot_header(path)
+    if header is not None:
+        source = header.get("source", "")
+        if not os.path.exists(source) or snapshot_is_fresh(header, source):
+            return path, source
+        return None, source
+    sidecar = snapshot_path_for(path)
+    header = read_snapshot_header(sidecar)
+    if header is not None and snapshot_is_fresh(header, path):
+        return sidecar, path
+    return None, path
+
+
+def schedule_identity(path: str) -> dict:
+    """
+    Size, mtime and SHA-256 of the schedule load_schedule_table(path)
+    loads: a usable snapshot's header already records its source's, a
+    schedule file is hashed once. Check it later with matches_schedule().
+    """
+    snapshot, source = _resolve(path)
+    info = read_snapshot_header(snapshot) if snapshot is not None else _source_info(source)
+    return {key: info[key] for key in ("size", "mtime_ns", "sha256")}
+
+
+def matches_schedule(identity: dict, path: str) -> bool:
+    """
+    True if `path` still loads the schedule schedule_identity() described,
+    without reading the schedule: a snapshot compares the recorded
+    SHA-256, a schedule file is checked like snapshot_is_fresh().
+    """
+    snapshot, source = _resolve(path)
+    if snapshot is not None:
+        header = read_snapshot_header(snapshot)
+        return header is not None and header.get("sha256") == identity.get("sha256")
+    return snapshot_is_fresh(identity, source)
+
+
+def load_schedule_table(path: str) -> FlightTable:
+    """
+    Load a schedule as an indexed FlightTable, using a snapshot when
+    possible (see _resolve()); otherwise the file is streamed through
+    iter_flights() straight into the table. This is what the searching
+    subcommands run on.
+    """
+    snapshot, source = _resolve(path)
+    if snapshot is not None:
+        return load_snapshot_table(snapshot)
+    with span("load_table"):
+        table = FlightTable.from_flights(traced_iter("load_flights", iter_flights(source)))
+    return table.build_index()
+
+
+def load_schedule(path: str) -> FlightGraph:
+    """
+    Load a schedule as a FlightGraph, using a snapshot when possible (see
+    _resolve()); otherwise the file is streamed through iter_flights() into
+    build_graph().
+    """
+    snapshot, source = _resolve(path)
+    if snapshot is not None:
+        return load_snapshot(snapshot)
+    return build_graph(traced_iter("load_flights", iter_flights(source)))
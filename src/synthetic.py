@@ -0,0 +1,152 @@
+"""
+Deterministic synthetic schedules for benchmarking at scale.
+
+data/flights_global.txt has about a thousand flights; this generates
+hub-and-spoke schedules of any size from a seed, so the same arguments
+always give the same file:
+
+- Airports get random positions on a 10,000 x 6,000 km plane. The first
+  `hubs` airports are hubs; every spoke belongs to its nearest hub.
+- Routes: spoke <-> own hub (most flights), hub <-> hub, and a few
+  point-to-point spoke <-> spoke routes.
+- Banked waves: each hub runs connection banks every `bank_minutes`
+  from 06:00. Flights into a hub land in the hour before a bank, flights
+  out of it leave in the hour after, so connections line up as at a real
+  hub. Point-to-point flights depart any time of day.
+- Duration = 30 min + distance at 800 km/h. Economy fare grows with
+  distance, with log-normal noise; business is 2.5-4x and first 5-8x the
+  economy fare.
+
+Every flight arrives the same day and after it departs, so the output
+loads with load_flights() like any other schedule.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from flight_planner import CSV_COLUMNS, DAY_END, Flight, format_time
+
+# First departure and bank layout (minutes since midnight).
+DAY_START = 5 * 60
+FIRST_BANK = 6 * 60
+BANK_WINDOW = 60
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """
+    Generator parameters.
+
+    hubs: number of hub airports (default: one per 20 airports, at least 1).
+    spoke_share / hub_share: fraction of flights on spoke <-> hub and
+        hub <-> hub routes; the rest are point-to-point.
+    """
+
+    airports: int = 100
+    flights: int = 10_000
+    seed: int = 0
+    hubs: Optional[int] = None
+    bank_minutes: int = 150
+    spoke_share: float = 0.7
+    hub_share: float = 0.2
+
+    def hub_count(self) -> int:
+        hubs = self.hubs if self.hubs is not None else self.airports // 20
+        return max(1, min(hubs, self.airports - 1))
+
+
+def airport_code(i: int) -> str:
+    """Three letters for i < 26**3 (AAA, AAB, ...), four beyond."""
+    letters = []
+    for _ in range(3 if i < 26 ** 3 else 4):
+        i, r = divmod(i, 26)
+        letters.append(chr(ord("A") + r))
+    return "".join(reversed(letters))
+
+
+def _positions(rng: random.Random, n: int) -> List[Tuple[float, float]]:
+    return [(rng.uniform(0, 10_000), rng.uniform(0, 6_000)) for _ in range(n)]
+
+
+def iter_synthetic_flights(config: SyntheticConfig) -> Iterator[Flight]:
+    """Yield config.flights flights; the same config always yields the same ones."""
+    if config.airports < 2:
+        raise ValueError(f"need at least 2 airports: {config.airports}")
+    rng = random.Random(config.seed)
+    codes = [airport_code(i) for i in range(config.airports)]
+    where = _positions(rng, config.airports)
+    n_hubs = config.hub_count()
+    hubs = list(range(n_hubs))
+    spokes = list(range(n_hubs, config.airports))
+    home = {s: min(hubs, key=lambda h: math.dist(where[s], where[h])) for s in spokes}
+    banks = list(range(FIRST_BANK, DAY_END - 2 * BANK_WINDOW, config.bank_minutes))
+
+    def pick_route() -> Tuple[int, int, Optional[str]]:
+        """(origin, dest, role of the hub end: 'in', 'out' or None)."""
+        roll = rng.random()
+        if roll < config.spoke_share:
+            s = rng.choice(spokes)
+            return (s, home[s], "in") if rng.random() < 0.5 else (home[s], s, "out")
+        if roll < config.spoke_share + config.hub_share and n_hubs > 1:
+            a, b = rng.sample(hubs, 2)
+            return a, b, rng.choice(("in", "out"))
+        a, b = rng.sample(range(config.airports), 2)
+        return a, b, None
+
+    made = 0
+    while made < config.flights:
+        a, b, role = pick_route()
+        duration = 30 + round(math.dist(where[a], where[b]) / 800 * 60)
+        if duration > DAY_END - DAY_START:
+            continue
+        bank = rng.choice(banks)
+        if role == "in":
+            depart = bank - rng.randrange(BANK_WINDOW) - duration
+        elif role == "out":
+            depart = bank + rng.randrange(BANK_WINDOW)
+        else:
+            depart = rng.randrange(DAY_START, DAY_END - duration)
+        if depart < DAY_START or depart + duration > DAY_END:
+            continue
+        economy = max(30, round((60 + 0.08 * math.dist(where[a], where[b])) * rng.lognormvariate(0, 0.25)))
+        made += 1
+        yield Flight(
+            origin=codes[a],
+            dest=codes[b],
+            flight_number=f"SY{made}",
+            depart=depart,
+            arrive=depart + duration,
+            economy=economy,
+            business=round(economy * rng.uniform(2.5, 4.0)),
+            first=round(economy * rng.uniform(5.0, 8.0)),
+        )
+
+
+def generate_schedule(config: SyntheticConfig) -> List[Flight]:
+    """All flights of iter_synthetic_flights(config) as a list."""
+    return list(iter_synthetic_flights(config))
+
+
+def write_synthetic_schedule(path: str, config: SyntheticConfig) -> int:
+    """
+    Stream a generated schedule to `path` (.csv with a header, otherwise
+    the plain text format); return the number of flights written.
+    """
+    csv = Path(path).suffix.lower() == ".csv"
+    sep = "," if csv else " "
+    count = 0
+    with open(path, "w", encoding="utf-8") as out:
+        if csv:
+            out.write(",".join(CSV_COLUMNS) + "\n")
+        for f in iter_synthetic_flights(config):
+            out.write(sep.join((
+                f.origin, f.dest, f.flight_number, format_time(f.depart), format_time(f.arrive),
+                str(f.economy), str(f.business), str(f.first),
+            )) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,229 @@
+"""
+Phase timing and profiling hooks.
+
+Code marks its phases with named spans:
+
+    with span("build_graph"):
+        ...
+
+A span does nothing unless a Tracer is active. tracing() activates one
+for a block (main() wraps every subcommand in it) when asked to by:
+- --timings or FLYWISE_TIMINGS=1: per-phase breakdown on stderr;
+- --trace FILE or FLYWISE_TRACE=FILE: Chrome trace JSON (chrome://tracing,
+  Perfetto) with one complete event per span;
+- --profile-out FILE or FLYWISE_PROFILE=FILE: cProfile stats for the block
+  (read with `python -m pstats FILE`).
+
+traced_iter() times a stream consumed piecemeal (the parser feeding
+build_graph()), as one span holding the time spent inside the iterator.
+
+Spans are recorded per thread, so server threads can share a tracer;
+searches running in worker processes (batch/serve with --workers > 1) are
+not traced.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+TIMINGS_ENV = "FLYWISE_TIMINGS"
+TRACE_ENV = "FLYWISE_TRACE"
+PROFILE_ENV = "FLYWISE_PROFILE"
+
+T = TypeVar("T")
+
+
+@dataclass
+class SpanRecord:
+    """One finished span; `start` is a perf_counter() reading."""
+
+    name: str
+    start: float
+    seconds: float
+    depth: int
+    thread: int
+
+
+class Tracer:
+    """Collects SpanRecords from every thread that runs inside it."""
+
+    def __init__(self) -> None:
+        self.records: List[SpanRecord] = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            self.record(name, start, seconds, len(stack))
+
+    def record(self, name: str, start: float, seconds: float, depth: int) -> None:
+        with self._lock:
+            self.records.append(SpanRecord(name, start, seconds, depth, threading.get_ident()))
+
+    def finish(self) -> None:
+        self.seconds = time.perf_counter() - self.started
+
+    def phases(self) -> Dict[Tuple[int, str], Tuple[int, float]]:
+        """(depth, name) -> (calls, total seconds), in order of first start."""
+        totals: Dict[Tuple[int, str], Tuple[int, float]] = {}
+        for rec in sorted(self.records, key=lambda r: r.start):
+            calls, seconds = totals.get((rec.depth, rec.name), (0, 0.0))
+            totals[(rec.depth, rec.name)] = (calls + 1, seconds + rec.seconds)
+        return totals
+
+    def report(self) -> str:
+        """Per-phase table; nested phases are indented under their parent."""
+        wall = self.seconds or time.perf_counter() - self.started
+        lines = [f"{'phase':<36} {'calls':>7} {'total ms':>10} {'% wall':>7}"]
+        for (depth, name), (calls, seconds) in self.phases().items():
+            label = "  " * depth + name
+            lines.append(f"{label:<36} {calls:>7} {seconds * 1e3:>10.3f} {seconds / wall * 100:>6.1f}%")
+        lines.append(f"{'(wall)':<36} {'':>7} {wall * 1e3:>10.3f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Trace Event Format: one complete ("X") event per span, times in us."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": rec.name,
+                    "ph": "X",
+                    "ts": (rec.start - self.started) * 1e6,
+                    "dur": rec.seconds * 1e6,
+                    "pid": pid,
+                    "tid": rec.thread,
+                }
+                for rec in self.records
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+_active: Optional[Tracer] = None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def active() -> Optional[Tracer]:
+    """The tracer spans currently report to, if any."""
+    return _active
+
+
+def span(name: str):
+    """Context manager timing `name` on the active tracer (a shared no-op otherwise)."""
+    tracer = _active
+    return _NO_SPAN if tracer is None else tracer.span(name)
+
+
+def traced_iter(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    """
+    `iterable`, unchanged when tracing is off; otherwise wrapped so the
+    time spent producing items is recorded as one `name` span, nested
+    under whatever span consumes it.
+    """
+    tracer = _active
+    if tracer is None:
+        return iterable
+    return _timed_iter(tracer, name, iter(iterable))
+
+
+def _timed_iter(tracer: Tracer, name: str, it: Iterator[T]) -> Iterator[T]:
+    depth = len(tracer._stack())
+    first = time.perf_counter()
+    spent = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                spent += time.perf_counter() - start
+                return
+            spent += time.perf_counter() - start
+            yield item
+    finally:
+        tracer.record(name, first, spent, depth)
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() not in ("", "0", "false", "no")
+
+
+@contextmanager
+def tracing(
+    timings: bool = False,
+    trace_path: Optional[str] = None,
+    profile_path: Optional[str] = None,
+    out: Optional[IO[str]] = None,
+) -> Iterator[Optional[Tracer]]:
+    """
+    Trace the block if any output is requested (arguments, else the
+    FLYWISE_* environment variables); yields the Tracer or None.
+
+    On exit: the breakdown is printed to `out` (default stderr), the Chrome
+    trace and cProfile stats are written to their files.
+    """
+    global _active
+    timings = timings or _env_flag(TIMINGS_ENV)
+    trace_path = trace_path or os.environ.get(TRACE_ENV) or None
+    profile_path = profile_path or os.environ.get(PROFILE_ENV) or None
+    if not (timings or trace_path or profile_path):
+        yield None
+        return
+    previous, tracer = _active, Tracer()
+    _active = tracer
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield tracer
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        _active = previous
+        tracer.finish()
+        if timings:
+            print(tracer.report(), file=out or sys.stderr)
+        if trace_path:
+            tracer.write_chrome_trace(trace_path)
@@ -0,0 +1,324 @@
+"""
+Transfer-pattern index: precomputed optimal airport sequences per route.
+
+Schedules change far less often than they are queried, so this trades a
+heavy offline build for fast queries. For every origin s, the build runs
+one earliest-arrival tree and one cheapest scan (all cabins) per distinct
+departure time of s. A query at time t gets the same answer as one at the
+first departure of s at or after t, so together these runs cover every
+query time. Each optimal itinerary found is reduced to its transfer
+pattern, the airports it changes planes at, and stored per (s, dest).
+
+A query then evaluates only those few patterns against the timetable:
+- earliest: along a fixed sequence of airports, taking the earliest
+  arriving flight on each leg that can still be boarded is optimal, so
+  each leg is one bisect into that leg's flights plus a suffix minimum.
+- cheapest: a small DP along the sequence. A flight's best price is its
+  fare plus the cheapest previous-leg flight that lands early enough.
+
+The optimal itinerary's own pattern is always among the candidates, and
+every candidate is a valid itinerary, so both give the live searches'
+arrival time / price (ties may pick a different route).
+
+The index is tied to one schedule through a digest of its flights;
+bind() refuses a table it was not built from. Hashing every row costs
+more than the queries it saves, so an index built from a schedule file
+also records that file's identity (size, mtime, SHA-256, see
+snapshot.schedule_identity()); bind() given the same path checks that
+instead and only falls back to the digest when the file has changed. Files use snapshot.py's
+container (write_container() / read_container()) with their own magic.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from flight_planner import (
+    CABINS,
+    MIN_LAYOVER_MINUTES,
+    Cabin,
+    FlightTable,
+    Graph,
+    Itinerary,
+    SearchTree,
+    as_table,
+    find_cheapest_trees,
+    find_earliest_tree,
+)
+from snapshot import matches_schedule, read_container, schedule_identity, write_container
+
+PATTERNS_MAGIC = b"FWTPAT"
+PATTERNS_FORMAT = 1
+PATTERNS_SUFFIX = ".fwtp"
+
+# Transfer airports (index ids) between origin and destination; () = direct.
+Pattern = Tuple[int, ...]
+
+
+def schedule_digest(graph: Graph) -> str:
+    """SHA-256 over a schedule's flights, independent of row and airport order."""
+    table = as_table(graph)
+    codes = table.codes
+    rows = sorted(
+        (
+            codes[table.origin[row]], codes[table.dest[row]], table.flight_number(row),
+            table.depart[row], table.arrive[row], table.economy[row], table.business[row], table.first[row],
+        )
+        for row in table.live_rows()
+    )
+    return hashlib.sha256(repr(rows).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Leg:
+    """Flights a -> b sorted by departure; best[i] = earliest-arriving row among rows[i:]."""
+
+    rows: List[int]
+    departs: List[int]
+    best: List[int]
+
+
+@dataclass
+class TransferPatternIndex:
+    """
+    Transfer patterns for every (origin, dest) pair of one schedule.
+
+    codes: airport codes; patterns refer to airports by position here.
+    patterns[(s, d)]: distinct patterns of the optimal itineraries s -> d.
+    digest: schedule_digest() of the schedule it was built from.
+    source: schedule_identity() of the file it was built from, if any.
+    """
+
+    codes: List[str]
+    patterns: Dict[Tuple[int, int], List[Pattern]]
+    digest: str
+    build_seconds: float = 0.0
+    source: Optional[dict] = None
+    _table: Optional[FlightTable] = field(default=None, repr=False)
+    _version: int = field(default=-1, repr=False)
+    _ids: List[int] = field(default_factory=list, repr=False)
+    _legs: Dict[Tuple[int, int], Optional[_Leg]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index_ids = {code: i for i, code in enumerate(self.codes)}
+
+    def __len__(self) -> int:
+        """Number of stored patterns."""
+        return sum(len(p) for p in self.patterns.values())
+
+    def transfers(self) -> int:
+        """Total transfer airports over all patterns (the index's payload size)."""
+        return sum(len(pattern) for found in self.patterns.values() for pattern in found)
+
+    def bind(self, graph: Graph, schedule_path: Optional[str] = None) -> FlightTable:
+        """
+        Attach the index to the table queries run on; return that table.
+
+        Raises ValueError if the schedule is not the one the index was built
+        from. A table is checked once per version. Pass the path `graph` was
+        loaded from as `schedule_path` to check the recorded file identity
+        instead of hashing the table (the caller vouches that `graph` is
+        what that path loads).
+        """
+        table = as_table(graph)
+        if table is self._table and table.version == self._version:
+            return table
+        trusted = schedule_path is not None and self.source is not None and matches_schedule(self.source, schedule_path)
+        if not trusted and schedule_digest(table) != self.digest:
+            raise ValueError("transfer-pattern index was built for a different schedule")
+        self._table, self._version = table, table.version
+        self._ids = [table.ids[code] if code in table.ids else -1 for code in self.codes]
+        self._legs = {}
+        return table
+
+    def _candidates(self, start: str, dest: str) -> List[List[int]]:
+        """Table-id airport sequences to try for start -> dest."""
+        s, d = self._index_ids.get(start), self._index_ids.get(dest)
+        if s is None or d is None or s == d:
+            return []
+        ids = self._ids
+        return [[ids[s], *(ids[h] for h in pattern), ids[d]] for pattern in self.patterns.get((s, d), [])]
+
+    def _leg(self, a: int, b: int) -> Optional[_Leg]:
+        key = (a, b)
+        if key in self._legs:
+            return self._legs[key]
+        table = self._table
+        rows = [row for row in table.out_rows[a] if table.dest[row] == b]
+        leg = None
+        if rows:
+            arrive = table.arrive
+            best = rows[:]
+            for i in range(len(rows) - 2, -1, -1):
+                if arrive[best[i + 1]] < arrive[best[i]]:
+                    best[i] = best[i + 1]
+            leg = _Leg(rows, [table.depart[row] for row in rows], best)
+        self._legs[key] = leg
+        return leg
+
+    def _earliest_along(self, airports: List[int], earliest_departure: int) -> Optional[List[int]]:
+        arrive = self._table.arrive
+        ready = earliest_departure
+        rows = []
+        for a, b in zip(airports, airports[1:]):
+            leg = self._leg(a, b)
+            if leg is None:
+                return None
+            i = bisect.bisect_left(leg.departs, ready)
+            if i == len(leg.rows):
+                return None
+            row = leg.best[i]
+            rows.append(row)
+            ready = arrive[row] + MIN_LAYOVER_MINUTES
+        return rows
+
+    def _cheapest_along(
+        self, airports: List[int], earliest_departure: int, cabin: Cabin
+    ) -> Optional[Tuple[int, int, List[int]]]:
+        """(price, arrival, rows) of the cheapest itinerary along `airports`."""
+        table = self._table
+        arrive, prices = table.arrive, table.prices(cabin)
+        # Labels (ready, price, row, parent) of the previous leg, sorted by ready.
+        labels: List[tuple] = [(earliest_departure, 0, None, None)]
+        for a, b in zip(airports, airports[1:]):
+            leg = self._leg(a, b)
+            if leg is None:
+                return None
+            extended = []
+            best = None
+            j = 0
+            for i in range(bisect.bisect_left(leg.departs, labels[0][0]), len(leg.rows)):
+                while j < len(labels) and labels[j][0] <= leg.departs[i]:
+                    if best is None or labels[j][1] < best[1]:
+                        best = labels[j]
+                    j += 1
+                row = leg.rows[i]
+                extended.append((arrive[row] + MIN_LAYOVER_MINUTES, best[1] + prices[row], row, best))
+            if not extended:
+                return None
+            extended.sort()
+            labels = extended
+        price, ready, label = min((lbl[1], lbl[0], lbl) for lbl in labels)
+        rows = []
+        while label[2] is not None:
+            rows.append(label[2])
+            label = label[3]
+        rows.reverse()
+        return price, ready - MIN_LAYOVER_MINUTES, rows
+
+    def earliest(self, graph: Graph, start: str, dest: str, earliest_departure: int) -> Optional[Itinerary]:
+        """Earliest-arrival itinerary, as find_earliest_itinerary() would find."""
+        table = self.bind(graph)
+        best = None
+        for airports in self._candidates(start, dest):
+            rows = self._earliest_along(airports, earliest_departure)
+            if rows is not None and (best is None or table.arrive[rows[-1]] < table.arrive[best[-1]]):
+                best = rows
+        return None if best is None else table.itinerary(best)
+
+    def cheapest(
+        self, graph: Graph, start: str, dest: str, earliest_departure: int, cabin: Cabin
+    ) -> Optional[Itinerary]:
+        """Cheapest itinerary in `cabin` (ties to the earlier arrival)."""
+        table = self.bind(graph)
+        best = None
+        for airports in self._candidates(start, dest):
+            found = self._cheapest_along(airports, earliest_departure, cabin)
+            if found is not None and (best is None or found[:2] < best[:2]):
+                best = found
+        return None if best is None else table.itinerary(best[2])
+
+    def cheapest_all(
+        self, graph: Graph, start: str, dest: str, earliest_departure: int
+    ) -> Dict[Cabin, Optional[Itinerary]]:
+        """cheapest() for every cabin, shaped like find_cheapest_itineraries()."""
+        return {cabin: self.cheapest(graph, start, dest, earliest_departure, cabin) for cabin in CABINS}
+
+
+def _transfers(tree: SearchTree, label: int, origin) -> Pattern:
+    """Transfer airports of the route ending at `label` in `tree`."""
+    hubs = []
+    while label != -1:
+        row = tree.label_rows[label]
+        label = tree.label_parents[label][tree.slot]
+        if label != -1:
+            hubs.append(origin[row])
+    hubs.reverse()
+    return tuple(hubs)
+
+
+def build_transfer_patterns(graph: Graph, schedule_path: Optional[str] = None) -> TransferPatternIndex:
+    """
+    Precompute the transfer patterns of every optimal itinerary.
+
+    `schedule_path`, the file `graph` was loaded from, is recorded so
+    bind() can recognize it cheaply later.
+
+    Per origin, one find_earliest_tree() and one find_cheapest_trees() run
+    per distinct departure time from it.
+
+    Complexity:
+    - Time:  O(E * S) where S is the cost of one one-to-all search.
+    - Space: O(V^2 * p) for p patterns per pair (a handful in practice).
+    """
+    import time
+
+    started = time.perf_counter()
+    table = as_table(graph)
+    codes, origin = table.codes, table.origin
+    found: Dict[Tuple[int, int], Set[Pattern]] = {}
+    for s, start in enumerate(codes):
+        for t in sorted(set(table.out_departs[s])):
+            trees = [find_earliest_tree(table, start, t), *find_cheapest_trees(table, start, t).values()]
+            for tree in trees:
+                for code, label in tree.tips.items():
+                    d = table.ids[code]
+                    if d != s:
+                        found.setdefault((s, d), set()).add(_transfers(tree, label, origin))
+    index = TransferPatternIndex(
+        codes=list(codes),
+        patterns={pair: sorted(patterns, key=lambda p: (len(p), p)) for pair, patterns in found.items()},
+        digest=schedule_digest(table),
+        build_seconds=time.perf_counter() - started,
+        source=schedule_identity(schedule_path) if schedule_path is not None else None,
+    )
+    index.bind(table)
+    return index
+
+
+def patterns_path_for(source: str) -> str:
+    """Default index location for a schedule file."""
+    return source + PATTERNS_SUFFIX
+
+
+def write_transfer_patterns(index: TransferPatternIndex, path: str) -> str:
+    """Write `index` to `path` (atomically); return the path."""
+    header = {
+        "digest": index.digest,
+        "airports": len(index.codes),
+        "pairs": len(index.patterns),
+        "patterns": len(index),
+        "build_seconds": index.build_seconds,
+        "source": index.source,
+    }
+    payload = {
+        "codes": index.codes,
+        "pairs": list(index.patterns),
+        "patterns": [index.patterns[pair] for pair in index.patterns],
+    }
+    return write_container(path, PATTERNS_MAGIC, PATTERNS_FORMAT, header, payload)
+
+
+def load_transfer_patterns(path: str) -> TransferPatternIndex:
+    """Read an index written by write_transfer_patterns() (bind() checks it against a schedule)."""
+    header, payload = read_container(path, PATTERNS_MAGIC, PATTERNS_FORMAT, "transfer-pattern index")
+    return TransferPatternIndex(
+        codes=payload["codes"],
+        patterns={tuple(pair): patterns for pair, patterns in zip(payload["pairs"], payload["patterns"])},
+        digest=header["digest"],
+        build_seconds=header.get("build_seconds", 0.0),
+        source=header.get("source"),
+    )
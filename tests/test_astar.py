@@ -0,0 +1,81 @@
+# tests/test_astar.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+
+from astar import expansion_counts, lower_bounds
+from flight_planner import (
+    CABINS,
+    MIN_LAYOVER_MINUTES,
+    Flight,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    parse_time,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return build_graph(load_flights(DATA))
+
+
+def pairs(graph, n=12):
+    codes = sorted(graph)[:n]
+    return [(a, b) for a in codes for b in codes if a != b]
+
+
+def test_astar_matches_dijkstra(graph):
+    for a, b in pairs(graph):
+        for t0 in (parse_time("05:00"), parse_time("13:00")):
+            plain = find_earliest_itinerary(graph, a, b, t0)
+            fast = find_earliest_itinerary(graph, a, b, t0, engine="astar")
+            assert (plain and plain.arrive_time) == (fast and fast.arrive_time)
+            for cabin in CABINS:
+                plain = find_cheapest_itinerary(graph, a, b, t0, cabin)
+                fast = find_cheapest_itinerary(graph, a, b, t0, cabin, engine="astar")
+                assert (plain and plain.total_price(cabin)) == (fast and fast.total_price(cabin))
+
+
+def test_bounds_are_admissible(graph):
+    bounds = lower_bounds(graph, "SFO")
+    ids = graph.table.ids
+    for a in sorted(graph)[:20]:
+        for cabin in CABINS:
+            itin = find_cheapest_itinerary(graph, a, "SFO", 0, cabin)
+            if itin is not None:
+                assert bounds.price[cabin][ids[a]] <= itin.total_price(cabin)
+        itin = find_earliest_itinerary(graph, a, "SFO", 0)
+        if itin is not None:
+            # Arriving at `a` at depart - layover leaves just in time for the first leg.
+            assert itin.depart_time - MIN_LAYOVER_MINUTES + bounds.time[ids[a]] <= itin.arrive_time
+    assert lower_bounds(graph, "NOPE") is None
+
+
+def test_astar_expands_fewer_nodes(graph):
+    totals = {"earliest": [0, 0], "economy": [0, 0]}
+    for a, b in pairs(graph):
+        for key, cabin in (("earliest", None), ("economy", "economy")):
+            counts = expansion_counts(graph, a, b, parse_time("06:00"), cabin)
+            assert counts.astar <= counts.dijkstra
+            totals[key][0] += counts.dijkstra
+            totals[key][1] += counts.astar
+    for dijkstra, astar in totals.values():
+        assert astar < dijkstra
+
+
+def test_bounds_follow_schedule_updates():
+    flights = [
+        Flight("AAA", "BBB", "F1", 480, 600, 100, 200, 300),
+        Flight("BBB", "CCC", "F2", 700, 800, 100, 200, 300),
+    ]
+    graph = build_graph(flights)
+    assert lower_bounds(graph, "CCC").price["economy"][graph.table.ids["AAA"]] == 200
+    graph.add_flight(Flight("AAA", "CCC", "F3", 500, 560, 50, 60, 70))
+    assert lower_bounds(graph, "CCC").price["economy"][graph.table.ids["AAA"]] == 50
+    assert find_cheapest_itinerary(graph, "AAA", "CCC", 0, "economy", engine="astar").flights[0].flight_number == "F3"
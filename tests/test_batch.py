@@ -0,0 +1,100 @@
+# tests/test_batch.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import io
+import json
+import pickle
+
+import pytest
+
+from batch import read_queries, run_batch, write_results
+from flight_planner import (
+    build_graph,
+    find_cheapest_itineraries,
+    find_earliest_itinerary,
+    load_flights,
+    main,
+    parse_time,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+QUERIES = """\
+# origin dest time
+ICN SFO 06:00
+ICN,NRT,09:30
+SFO ICN 25:00
+NOPE
+ICN JFK 05:00
+"""
+
+
+def test_read_queries_skips_comments_and_flags_bad_lines():
+    queries = list(read_queries(io.StringIO(QUERIES)))
+    assert [q.line for q in queries] == [2, 3, 4, 5, 6]
+    assert (queries[1].origin, queries[1].dest, queries[1].departure) == ("ICN", "NRT", "09:30")
+    assert queries[3].error and not queries[2].error
+
+
+def test_pool_results_match_serial_searches_in_input_order():
+    graph = build_graph(load_flights(DATA))
+    codes = sorted(graph)[:6]
+    lines = [f"{a} {b} {h:02d}:00" for a in codes for b in codes if a != b for h in (6, 12)]
+    results = list(run_batch(graph, read_queries(lines), workers=2, chunksize=7))
+    assert [r.query.line for r in results] == list(range(1, len(lines) + 1))
+    for r in results:
+        q, t0 = r.query, parse_time(r.query.departure)
+        assert r.earliest == find_earliest_itinerary(graph, q.origin, q.dest, t0)
+        assert r.cheapest == find_cheapest_itineraries(graph, q.origin, q.dest, t0)
+
+
+def test_table_pickles_without_flight_objects():
+    graph = build_graph(load_flights(DATA))
+    table = pickle.loads(pickle.dumps(graph.table))
+    assert list(table) == list(graph.table)
+    assert list(table.out_rows[table.ids["ICN"]]) == list(graph.table.out_rows[graph.table.ids["ICN"]])
+
+
+def test_write_results_formats():
+    graph = build_graph(load_flights(DATA))
+    results = list(run_batch(graph, read_queries(io.StringIO(QUERIES)), workers=1))
+
+    out = io.StringIO()
+    assert write_results(results, out, "ndjson") == 5
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["earliest"]["flights"] and records[0]["cheapest"]["economy"]["price"] > 0
+    assert "error" in records[2] and "error" in records[3]
+
+    out = io.StringIO()
+    write_results(results, out, "csv")
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("line,origin,dest,departure,mode")
+    assert len(lines) == 1 + 4 * 3 + 2  # 4 rows per answered query, 1 per error
+
+    out = io.StringIO()
+    write_results(results, out, "table")
+    assert out.getvalue().count("Earliest Arrival") == 3
+    assert "line 5:" in out.getvalue()
+
+
+def test_batch_cli_reads_query_file(tmp_path, capsys):
+    queries = tmp_path / "queries.txt"
+    queries.write_text("ICN SFO 06:00\nICN NRT 09:30\n", encoding="utf-8")
+    main(["batch", DATA, str(queries), "--workers", "1", "--format", "ndjson"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["origin"], r["dest"]) for r in records] == [("ICN", "SFO"), ("ICN", "NRT")]
+
+
+def test_pool_options_reject_non_positive_values(capsys):
+    for argv in (
+        ["batch", DATA, "--workers", "0"],
+        ["batch", DATA, "--chunksize", "0"],
+        ["batch", DATA, "--chunksize", "-5"],
+        ["serve", DATA, "--workers", "-1"],
+        ["serve", DATA, "--queue-size", "0"],
+    ):
+        with pytest.raises(SystemExit):
+            main(argv)
+        assert "must be at least" in capsys.readouterr().err
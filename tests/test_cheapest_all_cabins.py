@@ -0,0 +1,137 @@
+# tests/test_cheapest_all_cabins.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import random
+
+from flight_planner import (
+    CABINS,
+    Flight,
+    Itinerary,
+    build_graph,
+    find_cheapest_itineraries,
+    parse_time,
+    MIN_LAYOVER_MINUTES,
+)
+
+
+def f(origin, dest, num, depart, arrive, econ, biz, first) -> Flight:
+    return Flight(origin, dest, num, parse_time(depart), parse_time(arrive), econ, biz, first)
+
+
+def brute_force_cheapest(flights, start, dest, t0, cabin):
+    """Exhaustive DFS over all valid itineraries (small inputs only)."""
+    best = None
+
+    def dfs(airport, ready, price, seen):
+        nonlocal best
+        for fl in flights:
+            if fl.origin != airport or fl.depart < ready or fl.dest in seen:
+                continue
+            total = price + fl.price_for(cabin)
+            if fl.dest == dest:
+                if best is None or total < best:
+                    best = total
+            else:
+                dfs(fl.dest, fl.arrive + MIN_LAYOVER_MINUTES, total, seen | {fl.dest})
+
+    dfs(start, t0, 0, {start})
+    return best
+
+
+def test_one_traversal_returns_every_cabin():
+    flights = [
+        f("A", "B", "Fdirect", "08:00", "10:00", 400, 500, 900),
+        f("A", "X", "Fax", "08:00", "09:00", 150, 400, 800),
+        f("X", "B", "Fxb", "10:30", "11:30", 150, 400, 800),
+    ]
+    result = find_cheapest_itineraries(build_graph(flights), "A", "B", parse_time("07:00"))
+    assert set(result) == set(CABINS)
+    assert [fl.flight_number for fl in result["economy"].flights] == ["Fax", "Fxb"]
+    assert [fl.flight_number for fl in result["business"].flights] == ["Fdirect"]
+    assert [fl.flight_number for fl in result["first"].flights] == ["Fdirect"]
+
+
+def test_late_cheap_arrival_does_not_block_earlier_connection():
+    # Cheapest way to X arrives too late for the only X->B flight.
+    flights = [
+        f("A", "X", "Fcheap", "09:00", "10:30", 50, 50, 50),
+        f("A", "X", "Fearly", "08:00", "09:00", 200, 200, 200),
+        f("X", "B", "Fxb", "10:00", "11:00", 100, 100, 100),
+    ]
+    result = find_cheapest_itineraries(build_graph(flights), "A", "B", parse_time("07:00"))
+    for cabin in CABINS:
+        assert [fl.flight_number for fl in result[cabin].flights] == ["Fearly", "Fxb"]
+
+
+def test_no_route_gives_none_for_all_cabins():
+    flights = [f("A", "C", "F1", "08:00", "09:00", 100, 200, 300)]
+    result = find_cheapest_itineraries(build_graph(flights), "A", "B", 0)
+    assert result == {cabin: None for cabin in CABINS}
+
+
+def test_matches_brute_force_on_random_schedules():
+    rng = random.Random(7)
+    airports = ["A", "B", "C", "D", "E"]
+    for _ in range(40):
+        flights = []
+        for n in range(18):
+            o, d = rng.sample(airports, 2)
+            dep = rng.randrange(6 * 60, 20 * 60)
+            flights.append(Flight(o, d, f"F{n}", dep, dep + rng.randrange(30, 180),
+                                  rng.randrange(50, 500), rng.randrange(300, 900),
+                                  rng.randrange(800, 1500)))
+        graph = build_graph(flights)
+        result = find_cheapest_itineraries(graph, "A", "B", 6 * 60)
+        for cabin in CABINS:
+            expected = brute_force_cheapest(flights, "A", "B", 6 * 60, cabin)
+            itin = result[cabin]
+            if expected is None:
+                assert itin is None
+                continue
+            assert isinstance(itin, Itinerary)
+            assert itin.total_price(cabin) == expected
+            assert itin.origin == "A" and itin.dest == "B"
+            for prev, nxt in zip(itin.flights, itin.flights[1:]):
+                assert prev.dest == nxt.origin
+                assert nxt.depart >= prev.arrive + MIN_LAYOVER_MINUTES
+
+
+def test_single_cabin_search_agrees_with_all_cabin_search():
+    from flight_planner import find_cheapest_itinerary
+
+    rng = random.Random(3)
+    airports = ["A", "B", "C", "D", "E", "F"]
+    for _ in range(40):
+        flights = []
+        for n in range(22):
+            o, d = rng.sample(airports, 2)
+            dep = rng.randrange(6 * 60, 20 * 60)
+            flights.append(Flight(o, d, f"F{n}", dep, dep + rng.randrange(30, 180),
+                                  rng.randrange(50, 500), rng.randrange(300, 900),
+                                  rng.randrange(800, 1500)))
+        graph = build_graph(flights)
+        together = find_cheapest_itineraries(graph, "A", "B", 6 * 60)
+        for cabin in CABINS:
+            single = find_cheapest_itinerary(graph, "A", "B", 6 * 60, cabin)
+            if together[cabin] is None:
+                assert single is None
+            else:
+                assert single.total_price(cabin) == together[cabin].total_price(cabin)
+                assert single.total_price(cabin) == brute_force_cheapest(flights, "A", "B", 6 * 60, cabin)
+
+
+def test_scan_stops_once_no_airport_can_beat_the_destination():
+    from flight_planner import SearchStats
+
+    flights = [
+        f("A", "B", "F1", "08:00", "09:00", 100, 200, 300),
+        f("A", "C", "F2", "09:00", "10:00", 150, 250, 350),
+        f("C", "B", "F3", "12:00", "13:00", 10, 10, 10),  # C is already too expensive
+        f("E", "F", "F4", "13:00", "14:00", 10, 10, 10),
+    ]
+    stats = SearchStats()
+    result = find_cheapest_itineraries(build_graph(flights), "A", "B", parse_time("07:00"), stats=stats)
+    assert all([fl.flight_number for fl in result[cabin].flights] == ["F1"] for cabin in CABINS)
+    assert stats.edges_scanned == 2
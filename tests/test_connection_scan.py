@@ -0,0 +1,107 @@
+# tests/test_connection_scan.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+
+from flight_planner import (
+    Flight,
+    Itinerary,
+    build_graph,
+    find_earliest_itinerary,
+    load_flights,
+    parse_time,
+    MIN_LAYOVER_MINUTES,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def f(origin: str, dest: str, num: str, depart: str, arrive: str) -> Flight:
+    return Flight(origin, dest, num, parse_time(depart), parse_time(arrive), 100, 200, 300)
+
+
+def test_csa_respects_layover_and_first_leg_has_none():
+    flights = [
+        f("A", "X", "FX1", "08:00", "09:00"),
+        f("X", "B", "FX2", "09:30", "10:30"),  # too-short layover
+        f("A", "B", "FD1", "09:30", "11:30"),
+        f("A", "Y", "FY1", "07:00", "08:00"),  # departs exactly at cutoff
+        f("Y", "B", "FY2", "09:00", "11:00"),
+    ]
+    graph = build_graph(flights)
+    itin = find_earliest_itinerary(graph, "A", "B", parse_time("07:00"), engine="csa")
+    assert isinstance(itin, Itinerary)
+    assert [fl.flight_number for fl in itin.flights] == ["FY1", "FY2"]
+
+
+def test_csa_no_route_returns_none():
+    graph = build_graph([f("A", "C", "F1", "08:00", "09:00")])
+    assert find_earliest_itinerary(graph, "A", "B", 0, engine="csa") is None
+    assert find_earliest_itinerary(graph, "A", "C", parse_time("08:01"), engine="csa") is None
+
+
+def test_unknown_engine_raises():
+    graph = build_graph([f("A", "B", "F1", "08:00", "09:00")])
+    with pytest.raises(ValueError):
+        find_earliest_itinerary(graph, "A", "B", 0, engine="warp")
+
+
+def test_csa_matches_dijkstra_on_global_schedule():
+    graph = build_graph(load_flights(DATA))
+    airports = sorted(graph)[:12]
+    for start in airports:
+        for dest in airports:
+            if start == dest:
+                continue
+            for t0 in (parse_time("05:00"), parse_time("11:00")):
+                expected = find_earliest_itinerary(graph, start, dest, t0)
+                got = find_earliest_itinerary(graph, start, dest, t0, engine="csa")
+                if expected is None:
+                    assert got is None
+                    continue
+                assert got.arrive_time == expected.arrive_time
+                assert got.origin == start and got.dest == dest
+                assert got.depart_time >= t0
+                for prev, nxt in zip(got.flights, got.flights[1:]):
+                    assert nxt.depart >= prev.arrive + MIN_LAYOVER_MINUTES
+
+
+def test_profile_matches_one_search_per_departure_time():
+    from connection_scan import csa_profile, profile_arrival
+
+    graph = build_graph(load_flights(DATA))
+    for start, dest in [("ICN", "SFO"), ("ICN", "LHR"), ("SFO", "ICN")]:
+        profile = csa_profile(graph, start, dest)
+        departs = [entry.depart for entry in profile]
+        arrives = [entry.arrive for entry in profile]
+        assert departs == sorted(set(departs))
+        assert arrives == sorted(set(arrives))
+        for t0 in range(0, 24 * 60, 30):
+            expected = find_earliest_itinerary(graph, start, dest, t0)
+            entry = profile_arrival(profile, t0)
+            if expected is None:
+                assert entry is None
+                continue
+            assert entry.arrive == expected.arrive_time
+            assert entry.itinerary.arrive_time == entry.arrive
+            assert entry.itinerary.depart_time == entry.depart
+            for prev, nxt in zip(entry.itinerary.flights, entry.itinerary.flights[1:]):
+                assert nxt.depart >= prev.arrive + MIN_LAYOVER_MINUTES
+
+
+def test_profile_cli(tmp_path, capsys):
+    from flight_planner import main
+
+    path = tmp_path / "f.txt"
+    path.write_text(
+        "A B F1 08:00 10:00 1 1 1\n"
+        "A B F2 09:00 10:30 1 1 1\n"
+        "A B F3 08:30 11:00 1 1 1\n",
+        encoding="utf-8",
+    )
+    main(["profile", str(path), "A", "B"])
+    out = capsys.readouterr().out
+    assert "08:00" in out and "09:00" in out
+    assert "08:30" not in out  # F3 is dominated by F2
@@ -0,0 +1,102 @@
+# tests/test_flight_table.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from flight_planner import (
+    CABINS,
+    Flight,
+    FlightTable,
+    as_table,
+    build_graph,
+    find_cheapest_itineraries,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    load_table,
+    parse_time,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def test_table_roundtrips_flights():
+    flights = load_flights(DATA)
+    table = FlightTable.from_flights(flights)
+    assert len(table) == len(flights)
+    assert list(table) == flights
+    assert table.codes[table.ids["ICN"]] == "ICN"
+    assert table.flight_number(0) == flights[0].flight_number
+    assert table.nbytes() < 64 * len(flights)
+
+
+def test_build_index_indexes_in_place():
+    table = load_table(DATA)
+    assert table.build_index() is table
+    icn = table.ids["ICN"]
+    departs = list(table.out_departs[icn])
+    assert departs == sorted(departs)
+    assert all(table.origin[row] == icn for row in table.out_rows[icn])
+
+
+def test_table_searches_match_graph_searches():
+    flights = load_flights(DATA)
+    graph = build_graph(flights)
+    table = FlightTable.from_flights(flights).build_index()
+    airports = sorted(graph)[:10]
+    for start in airports:
+        for dest in airports:
+            if start == dest:
+                continue
+            t0 = parse_time("06:00")
+            for engine in ("dijkstra", "csa"):
+                a = find_earliest_itinerary(graph, start, dest, t0, engine=engine)
+                b = find_earliest_itinerary(table, start, dest, t0, engine=engine)
+                assert (a and a.arrive_time) == (b and b.arrive_time)
+            together = find_cheapest_itineraries(table, start, dest, t0)
+            expected = find_cheapest_itineraries(graph, start, dest, t0)
+            for cabin in CABINS:
+                single = find_cheapest_itinerary(table, start, dest, t0, cabin)
+                want = expected[cabin] and expected[cabin].total_price(cabin)
+                assert (single and single.total_price(cabin)) == want
+                assert (together[cabin] and together[cabin].total_price(cabin)) == want
+                if single is not None:
+                    assert all(isinstance(fl, Flight) for fl in single.flights)
+
+
+def test_unknown_airports_on_table():
+    table = load_table(DATA)
+    assert find_earliest_itinerary(table, "ICN", "NOPE", 0) is None
+    assert find_cheapest_itinerary(table, "NOPE", "ICN", 0, "economy") is None
+
+
+def test_airport_index_and_graph_share_flight_objects():
+    from flight_planner import AirportIndex
+
+    index = AirportIndex()
+    assert [index.intern(c) for c in ("ICN", "NRT", "ICN")] == [0, 1, 0]
+    assert index.code(1) == "NRT" and index.id("SFO") is None
+    assert "ICN" in index and len(index) == 2
+
+    flights = load_flights(DATA)
+    graph = build_graph(flights)
+    assert graph.table is graph.table
+    assert set(graph) <= set(graph.airports.codes)
+    itin = find_earliest_itinerary(graph, "ICN", "SFO", parse_time("06:00"))
+    assert itin is not None
+    for flight in itin.flights:
+        assert any(flight is f for f in graph[flight.origin])
+
+
+def test_plain_dict_is_compiled_once_until_it_changes():
+    flights = load_flights(DATA)
+    graph = {}
+    for flight in flights:
+        graph.setdefault(flight.origin, []).append(flight)
+    table = as_table(graph)
+    assert as_table(graph) is table
+    find_earliest_itinerary(graph, "ICN", "SFO", 0)
+    assert as_table(graph) is table
+    graph["ICN"].pop()
+    assert as_table(graph) is not table
+    assert len(as_table(graph)) == len(flights) - 1
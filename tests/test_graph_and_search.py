@@ -253,3 +253,47 @@ def test_extremely_long_trip_multiple_legs():
     assert itin.origin == "A"
     assert itin.dest == "E"
     assert_valid_itinerary_times(itin)
+
+
+def test_build_graph_sorts_departures_and_bisects():
+    flights = [
+        f("A", "B", "F3", "12:00", "13:00", 100, 200, 300),
+        f("A", "C", "F1", "06:00", "07:00", 100, 200, 300),
+        f("A", "B", "F2", "09:00", "10:00", 100, 200, 300),
+    ]
+    graph = build_graph(flights)
+
+    assert [fl.flight_number for fl in graph["A"]] == ["F1", "F2", "F3"]
+    assert graph.departures["A"] == [fl.depart for fl in graph["A"]]
+    later = graph.flights_from("A", parse_time("09:00"))
+    assert [fl.flight_number for fl in later] == ["F2", "F3"]
+    assert graph.flights_from("A", parse_time("12:01")) == []
+    assert graph.flights_from("Z", 0) == []
+
+
+def test_searches_accept_plain_adjacency_dict():
+    flights = [
+        f("A", "X", "F1", "08:00", "09:00", 150, 300, 600),
+        f("X", "B", "F2", "10:00", "11:00", 150, 300, 600),
+    ]
+    graph = {"A": [flights[0]], "X": [flights[1]]}
+    itin = find_earliest_itinerary(graph, "A", "B", parse_time("07:00"))
+    assert isinstance(itin, Itinerary)
+    assert [fl.flight_number for fl in itin.flights] == ["F1", "F2"]
+    cheap = find_cheapest_itinerary(graph, "A", "B", parse_time("07:00"), "economy")
+    assert isinstance(cheap, Itinerary)
+    assert cheap.total_price("economy") == 300
+
+
+def test_cheapest_itinerary_keeps_pricier_label_that_makes_connection():
+    # The cheapest way to X lands too late for the only X->B flight.
+    flights = [
+        f("A", "X", "Fcheap", "09:00", "10:30", 50, 50, 50),
+        f("A", "X", "Fearly", "08:00", "09:00", 200, 200, 200),
+        f("X", "B", "Fxb", "10:00", "11:00", 100, 100, 100),
+    ]
+    graph = build_graph(flights)
+    itin = find_cheapest_itinerary(graph, "A", "B", parse_time("07:00"), "economy")
+    assert isinstance(itin, Itinerary)
+    assert [fl.flight_number for fl in itin.flights] == ["Fearly", "Fxb"]
+    assert_valid_itinerary_times(itin)
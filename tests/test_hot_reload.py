@@ -0,0 +1,95 @@
+# tests/test_hot_reload.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from flight_planner import build_graph, find_earliest_itinerary, load_flights, parse_time
+from hot_reload import ScheduleWatcher
+from server import QueryServer
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def rewrite(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))  # beat coarse mtimes
+
+
+def test_reload_reuses_unchanged_lines_and_swaps(tmp_path: Path):
+    path = tmp_path / "flights.txt"
+    text = Path(DATA).read_text(encoding="utf-8")
+    path.write_text(text, encoding="utf-8")
+    watcher = ScheduleWatcher(str(path))
+    old = watcher.graph
+    n = watcher.stats.lines_parsed
+    assert not watcher.check() and watcher.stats.swaps == 0
+
+    rewrite(path, text.replace("ICN NRT FW101 08:30", "ICN NRT FW101 07:00", 1) + "ICN SFO FW9999 05:00 16:00 1 1 1\n")
+    assert watcher.check()
+    assert watcher.graph is not old and watcher.stats.swaps == 1
+    assert watcher.stats.lines_parsed == 2 and watcher.stats.lines_reused == n - 1
+    assert watcher.stats.last_duration_s > 0
+    assert watcher.graph.get_flight("FW101").depart == parse_time("07:00")
+    assert old.get_flight("FW101").depart == parse_time("08:30")  # in-flight readers keep the old snapshot
+    assert watcher.graph.get_flight("FW102") is old.get_flight("FW102")
+    assert watcher.graph == build_graph(load_flights(str(path)))
+
+
+def test_failed_reload_keeps_serving_old_graph(tmp_path: Path):
+    path = tmp_path / "flights.csv"
+    path.write_text(
+        "origin,dest,flight_number,depart,arrive,economy,business,first\n"
+        "ICN,NRT,FW1,08:00,10:00,300,800,1500\n",
+        encoding="utf-8",
+    )
+    watcher = ScheduleWatcher(str(path))
+    good = watcher.graph
+    rewrite(path, path.read_text() + "NRT,SFO,FW2,12:00,11:00,1,1,1\n")
+    assert not watcher.check()
+    assert watcher.graph is good and watcher.stats.failures == 1
+    assert "flights.csv:3" in watcher.stats.last_error
+    assert not watcher.check() and watcher.stats.failures == 1  # not retried until it changes
+
+    rewrite(path, path.read_text().replace("12:00,11:00", "12:00,20:00"))
+    assert watcher.check() and watcher.stats.lines_reused == 1 and watcher.stats.lines_parsed == 1
+    assert find_earliest_itinerary(watcher.graph, "ICN", "SFO", 0).num_stops() == 1
+
+
+def test_background_polling_swaps_into_server(tmp_path: Path):
+    path = tmp_path / "flights.txt"
+    path.write_text("ICN NRT FW1 08:00 10:00 300 800 1500\n", encoding="utf-8")
+
+    async def scenario() -> list:
+        server = QueryServer(ScheduleWatcher(str(path)).graph, workers=0)
+        watcher = ScheduleWatcher(str(path), interval=0.01)
+        loop = asyncio.get_running_loop()
+        watcher.on_swap = lambda g: loop.call_soon_threadsafe(server.swap, g)
+        listener = await server.start_tcp(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        replies = []
+
+        async def ask() -> None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"op": "earliest", "origin": "ICN", "dest": "NRT", "departure": "00:00"}\n')
+            replies.append(json.loads(await reader.readline())["result"]["earliest"]["flights"])
+            writer.close()
+
+        with watcher:
+            await ask()
+            rewrite(path, "ICN NRT FW2 06:00 07:00 300 800 1500\n")
+            deadline = time.monotonic() + 5
+            while watcher.stats.swaps == 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            await ask()
+        listener.close()
+        await server.close()
+        return replies
+
+    assert asyncio.run(scenario()) == [["FW1"], ["FW2"]]
@@ -0,0 +1,91 @@
+# tests/test_k_best.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import random
+from itertools import islice
+
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    Flight,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    main,
+)
+from k_best import find_k_cheapest_itineraries, find_k_earliest_itineraries, iter_cheapest_itineraries
+
+AIRPORTS = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]
+
+
+def random_schedule(seed: int, n: int = 60):
+    rng = random.Random(seed)
+    flights = []
+    for i in range(n):
+        a, b = rng.sample(AIRPORTS, 2)
+        depart = rng.randrange(0, 1200)
+        flights.append(Flight(a, b, f"R{i}", depart, depart + rng.randrange(30, 240),
+                              rng.randrange(50, 500), rng.randrange(500, 900), rng.randrange(900, 2000)))
+    return flights
+
+
+def all_routes(graph, start, dest, t0):
+    """Every loopless valid itinerary, by depth-first search."""
+    out = []
+
+    def walk(airport, ready, path, seen):
+        for f in graph.get(airport, []):
+            if f.depart < ready or f.dest in seen:
+                continue
+            if f.dest == dest:
+                out.append(path + [f])
+            else:
+                walk(f.dest, f.arrive + MIN_LAYOVER_MINUTES, path + [f], seen | {f.dest})
+
+    walk(start, t0, [], {start})
+    return out
+
+
+def test_k_best_match_brute_force():
+    for seed in range(6):
+        graph = build_graph(random_schedule(seed))
+        for start, dest in [("AAA", "BBB"), ("CCC", "FFF"), ("EEE", "AAA")]:
+            routes = all_routes(graph, start, dest, 300)
+            got = find_k_earliest_itineraries(graph, start, dest, 300, 8)
+            assert [i.arrive_time for i in got] == sorted(r[-1].arrive for r in routes)[:8]
+            for cabin in ("economy", "first"):
+                got = find_k_cheapest_itineraries(graph, start, dest, 300, cabin, 8)
+                assert [i.total_price(cabin) for i in got] == sorted(sum(f.price_for(cabin) for f in r) for r in routes)[:8]
+                # Distinct, loopless, and the first one agrees with the single-result search.
+                assert len({tuple(f.flight_number for f in i.flights) for i in got}) == len(got)
+                for itin in got:
+                    stops = [itin.origin] + [f.dest for f in itin.flights]
+                    assert len(stops) == len(set(stops))
+                best = find_cheapest_itinerary(graph, start, dest, 300, cabin)
+                assert (best and best.total_price(cabin)) == (got[0].total_price(cabin) if got else None)
+            best = find_earliest_itinerary(graph, start, dest, 300)
+            assert (best and best.arrive_time) == (routes and min(r[-1].arrive for r in routes) or None)
+
+
+def test_generator_is_lazy_and_exhausts():
+    graph = build_graph(random_schedule(3))
+    gen = iter_cheapest_itineraries(graph, "AAA", "BBB", 0, "economy")
+    first_two = list(islice(gen, 2))
+    rest = list(gen)
+    assert len(first_two) + len(rest) == len(all_routes(graph, "AAA", "BBB", 0))
+    assert list(iter_cheapest_itineraries(graph, "AAA", "ZZZ", 0, "economy")) == []
+
+
+def test_compare_top_k_cli(tmp_path, capsys):
+    path = tmp_path / "flights.txt"
+    path.write_text(
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "NRT SFO FW102 11:30 19:30 500 1200 2000\n"
+        "ICN SFO FW103 09:00 19:00 700 1500 2500\n",
+        encoding="utf-8",
+    )
+    main(["compare", str(path), "ICN", "SFO", "07:00", "--top", "2"])
+    out = capsys.readouterr().out
+    assert "Earliest Arrival #2" in out and "Cheapest #2" in out
+    assert out.index("Cheapest #1 | economy") < out.index("| 700 |") < out.index("| 800 |")
@@ -0,0 +1,55 @@
+# tests/test_one_to_all.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from flight_planner import (
+    CABINS,
+    build_graph,
+    find_cheapest_itineraries,
+    find_cheapest_trees,
+    find_earliest_itinerary,
+    find_earliest_tree,
+    load_flights,
+    parse_time,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def test_earliest_tree_matches_point_to_point_searches():
+    graph = build_graph(load_flights(DATA))
+    t0 = parse_time("07:00")
+    tree = find_earliest_tree(graph, "ICN", t0)
+    assert "ICN" not in tree
+    assert tree.itinerary_to("NOWHERE") is None
+    for dest in sorted(graph):
+        if dest == "ICN":
+            continue
+        expected = find_earliest_itinerary(graph, "ICN", dest, t0)
+        if expected is None:
+            assert dest not in tree
+            continue
+        itin = tree.itinerary_to(dest)
+        assert tree.best[dest] == expected.arrive_time == itin.arrive_time
+        assert itin.origin == "ICN" and itin.dest == dest
+
+
+def test_cheapest_trees_match_point_to_point_searches():
+    graph = build_graph(load_flights(DATA))
+    t0 = parse_time("06:00")
+    trees = find_cheapest_trees(graph, "SFO", t0)
+    assert set(trees) == set(CABINS)
+    # All cabins share one label list.
+    assert trees["economy"].label_rows is trees["first"].label_rows
+    for dest in sorted(graph)[:15]:
+        if dest == "SFO":
+            continue
+        expected = find_cheapest_itineraries(graph, "SFO", dest, t0)
+        for cabin in CABINS:
+            if expected[cabin] is None:
+                assert dest not in trees[cabin]
+                continue
+            itin = trees[cabin].itinerary_to(dest)
+            assert trees[cabin].best[dest] == itin.total_price(cabin)
+            assert itin.total_price(cabin) == expected[cabin].total_price(cabin)
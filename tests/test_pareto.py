@@ -0,0 +1,88 @@
+# tests/test_pareto.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import random
+
+from flight_planner import Flight, build_graph, main, parse_time, MIN_LAYOVER_MINUTES
+from pareto import ParetoBag, find_pareto_itineraries
+
+
+def f(origin, dest, num, depart, arrive, econ) -> Flight:
+    return Flight(origin, dest, num, parse_time(depart), parse_time(arrive), econ, econ * 2, econ * 3)
+
+
+def brute_force_frontier(flights, start, dest, t0, cabin):
+    """All (arrive, price) pairs of valid itineraries, Pareto-filtered."""
+    points = set()
+
+    def dfs(airport, ready, price, seen):
+        for fl in flights:
+            if fl.origin != airport or fl.depart < ready or fl.dest in seen:
+                continue
+            total = price + fl.price_for(cabin)
+            if fl.dest == dest:
+                points.add((fl.arrive, total))
+            else:
+                dfs(fl.dest, fl.arrive + MIN_LAYOVER_MINUTES, total, seen | {fl.dest})
+
+    dfs(start, t0, 0, {start})
+    return sorted(
+        p for p in points
+        if not any(q != p and q[0] <= p[0] and q[1] <= p[1] for q in points)
+    )
+
+
+def test_bag_keeps_only_staircase():
+    bag = ParetoBag()
+    bag.insert((100, 50, None, None))
+    assert bag.dominates(120, 60)
+    assert not bag.dominates(90, 60)
+    assert bag.insert((90, 40, None, None)) == 1  # evicts (100, 50)
+    bag.insert((200, 10, None, None))
+    assert bag.times == [90, 200]
+    assert bag.prices == [40, 10]
+
+
+def test_frontier_returns_both_extremes_and_middle():
+    flights = [
+        f("A", "B", "Ffast", "08:00", "10:00", 900),
+        f("A", "X", "F1", "08:00", "09:00", 100),
+        f("X", "B", "Fmid", "10:00", "11:00", 300),
+        f("X", "B", "Fslow", "14:00", "15:00", 50),
+        f("A", "B", "Fworse", "09:00", "12:00", 950),  # dominated
+    ]
+    result = find_pareto_itineraries(build_graph(flights), "A", "B", parse_time("07:00"))
+    got = [(it.arrive_time, it.total_price("economy")) for it in result.itineraries]
+    assert got == [(parse_time("10:00"), 900), (parse_time("11:00"), 400), (parse_time("15:00"), 150)]
+    assert result.labels_pruned >= 1
+
+
+def test_frontier_matches_brute_force_on_random_schedules():
+    rng = random.Random(11)
+    airports = ["A", "B", "C", "D", "E"]
+    for _ in range(30):
+        flights = []
+        for n in range(16):
+            o, d = rng.sample(airports, 2)
+            dep = rng.randrange(6 * 60, 20 * 60)
+            flights.append(Flight(o, d, f"F{n}", dep, dep + rng.randrange(30, 180),
+                                  rng.randrange(50, 500), 0, 0))
+        result = find_pareto_itineraries(build_graph(flights), "A", "B", 6 * 60)
+        got = [(it.arrive_time, it.total_price("economy")) for it in result.itineraries]
+        assert got == brute_force_frontier(flights, "A", "B", 6 * 60, "economy")
+
+
+def test_frontier_cli(tmp_path, capsys):
+    path = tmp_path / "f.txt"
+    path.write_text(
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "NRT SFO FW102 11:30 19:30 500 1200 2000\n"
+        "ICN SFO FW103 09:00 19:00 900 1500 2500\n",
+        encoding="utf-8",
+    )
+    main(["frontier", str(path), "ICN", "SFO", "07:00"])
+    out = capsys.readouterr().out
+    assert "Frontier #1" in out and "Frontier #2" in out
+    assert "pruned" in out
@@ -0,0 +1,77 @@
+# tests/test_query_cache.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+
+from flight_planner import Flight, build_graph, parse_time
+from query_cache import QueryCache
+
+
+def f(origin, dest, num, depart, arrive, econ=100) -> Flight:
+    return Flight(origin, dest, num, parse_time(depart), parse_time(arrive), econ, econ * 2, econ * 3)
+
+
+FLIGHTS = [
+    f("A", "B", "F1", "08:00", "10:00", 300),
+    f("A", "X", "F2", "09:00", "10:00", 100),
+    f("X", "B", "F3", "11:00", "12:00", 100),
+]
+
+
+def test_hits_misses_and_lru_eviction():
+    graph = build_graph(FLIGHTS)
+    cache = QueryCache(capacity=2)
+    first = cache.earliest(graph, "A", "B", parse_time("07:00"))
+    assert cache.earliest(graph, "A", "B", parse_time("07:00")) is first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    cache.cheapest(graph, "A", "B", parse_time("07:00"), "economy")
+    cache.cheapest(graph, "A", "B", parse_time("07:00"), "business")  # evicts earliest
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+    cache.earliest(graph, "A", "B", parse_time("07:00"))
+    assert cache.stats.misses == 4
+
+
+def test_new_schedule_version_invalidates():
+    cache = QueryCache()
+    old = build_graph(FLIGHTS)
+    assert cache.earliest(old, "A", "B", 0).flights[0].flight_number == "F1"
+    new = build_graph(FLIGHTS[1:])
+    assert new.version != old.version
+    assert cache.earliest(new, "A", "B", 0).flights[0].flight_number == "F2"
+    assert cache.stats.invalidations == 1
+    assert cache.stats.hits == 0
+
+
+def test_plain_dict_is_compiled_once():
+    graph = {}
+    for flight in FLIGHTS:
+        graph.setdefault(flight.origin, []).append(flight)
+    cache = QueryCache()
+    for _ in range(3):
+        assert cache.earliest(graph, "A", "B", 0).flights[0].flight_number == "F1"
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.invalidations) == (2, 1, 0)
+    cache.earliest({"A": list(graph["A"])}, "A", "B", 0)
+    assert cache.stats.invalidations == 1
+
+
+def test_bucketed_departures_share_entries_when_no_flight_between():
+    graph = build_graph(FLIGHTS)
+    cache = QueryCache(bucket_departures=True)
+    a = cache.cheapest(graph, "A", "B", parse_time("06:00"), "economy")
+    b = cache.cheapest(graph, "A", "B", parse_time("08:00"), "economy")
+    assert a is b and cache.stats.hits == 1
+    c = cache.cheapest(graph, "A", "B", parse_time("08:01"), "economy")
+    assert cache.stats.misses == 2
+    assert c.total_price("economy") == 200
+    assert cache.earliest(graph, "A", "B", parse_time("09:01")) is None
+    assert cache.earliest(graph, "A", "B", parse_time("23:00")) is None
+    assert cache.stats.hits == 2
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        QueryCache(capacity=0)
@@ -0,0 +1,111 @@
+# tests/test_raptor.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import random
+
+import pytest
+
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    Flight,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    main,
+)
+from raptor import raptor_cheapest, raptor_earliest
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+AIRPORTS = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]
+
+
+def random_schedule(seed: int, n: int = 70):
+    rng = random.Random(seed)
+    flights = []
+    for i in range(n):
+        a, b = rng.sample(AIRPORTS, 2)
+        depart = rng.randrange(0, 1200)
+        flights.append(Flight(a, b, f"R{i}", depart, depart + rng.randrange(30, 240),
+                              rng.randrange(50, 500), rng.randrange(500, 900), rng.randrange(900, 2000)))
+    return flights
+
+
+def all_routes(graph, start, dest, t0):
+    out = []
+
+    def walk(airport, ready, path, seen):
+        for f in graph.get(airport, []):
+            if f.depart < ready or f.dest in seen:
+                continue
+            if f.dest == dest:
+                out.append(path + [f])
+            else:
+                walk(f.dest, f.arrive + MIN_LAYOVER_MINUTES, path + [f], seen | {f.dest})
+
+    walk(start, t0, [], {start})
+    return out
+
+
+def test_rounds_match_brute_force_per_stop_limit():
+    for seed in range(8):
+        graph = build_graph(random_schedule(seed))
+        for start, dest in [("AAA", "BBB"), ("CCC", "FFF"), ("EEE", "AAA")]:
+            routes = all_routes(graph, start, dest, 200)
+            earliest = raptor_earliest(graph, start, dest, 200, max_stops=3)
+            cheapest = raptor_cheapest(graph, start, dest, 200, "economy", max_stops=3)
+            for k in range(4):
+                within = [r for r in routes if len(r) <= k + 1]
+                want_t = min((r[-1].arrive for r in within), default=None)
+                want_p = min((sum(f.economy for f in r) for r in within), default=None)
+                assert (earliest[k] and earliest[k].arrive_time) == want_t
+                assert (cheapest[k] and cheapest[k].total_price("economy")) == want_p
+                for itin in (earliest[k], cheapest[k]):
+                    if itin is not None:
+                        assert itin.num_stops() <= k
+
+
+def test_unbounded_rounds_agree_with_plain_searches():
+    graph = build_graph(load_flights(DATA))
+    codes = sorted(graph)[:10]
+    for a in codes:
+        for b in codes:
+            if a == b:
+                continue
+            e = find_earliest_itinerary(graph, a, b, 300)
+            c = find_cheapest_itinerary(graph, a, b, 300, "business")
+            assert (e and e.arrive_time) == (lambda r: r and r.arrive_time)(raptor_earliest(graph, a, b, 300, 6)[-1])
+            assert (c and c.total_price("business")) == (lambda r: r and r.total_price("business"))(
+                raptor_cheapest(graph, a, b, 300, "business", 6)[-1])
+    with pytest.raises(ValueError):
+        raptor_earliest(graph, "ICN", "SFO", 0, max_stops=-1)
+
+
+def test_compare_max_stops_cli(tmp_path, capsys):
+    path = tmp_path / "flights.txt"
+    path.write_text(
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "NRT SFO FW102 11:30 17:30 300 1200 2000\n"
+        "ICN SFO FW103 09:00 19:00 700 1500 2500\n",
+        encoding="utf-8",
+    )
+    main(["compare", str(path), "ICN", "SFO", "07:00", "--max-stops", "1"])
+    out = capsys.readouterr().out
+    assert "Earliest Arrival (<= 0 stops)" in out and "Earliest Arrival (<= 1 stops)" in out
+    assert "Cheapest (<= 0 stops) | economy" in out and "Cheapest (<= 1 stops) | economy" in out
+    # business is cheapest direct; one stop adds nothing, so there is no second row
+    assert "Cheapest (<= 1 stops) | business" not in out
+
+
+def test_price_ties_go_to_the_earlier_arrival():
+    graph = build_graph([
+        Flight("AAA", "BBB", "SLOW", 600, 900, 200, 600, 1000),
+        Flight("AAA", "BBB", "FAST", 660, 800, 200, 600, 1000),
+        Flight("AAA", "CCC", "HOP1", 480, 540, 100, 600, 1000),
+        Flight("CCC", "BBB", "HOP2", 600, 700, 100, 600, 1000),
+    ])
+    direct, one_stop = raptor_cheapest(graph, "AAA", "BBB", 0, "economy", max_stops=1)
+    assert [f.flight_number for f in direct.flights] == ["FAST"]
+    assert [f.flight_number for f in one_stop.flights] == ["HOP1", "HOP2"]
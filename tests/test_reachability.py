@@ -0,0 +1,68 @@
+# tests/test_reachability.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from flight_planner import (
+    MIN_LAYOVER_MINUTES,
+    Flight,
+    build_graph,
+    find_earliest_tree,
+    load_flights,
+)
+from reachability import ReachabilityIndex, reachability_index
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def test_latest_departure_matches_forward_searches():
+    graph = build_graph(load_flights(DATA))
+    table = graph.table
+    for dest in ("SFO", "ICN", sorted(graph)[-1]):
+        d = table.ids[dest]
+        latest = reachability_index(graph).latest(d)
+        for origin, outgoing in graph.items():
+            if origin == dest:
+                continue
+            useful = [
+                f.depart for f in outgoing
+                if f.dest == dest or dest in find_earliest_tree(graph, f.dest, f.arrive + MIN_LAYOVER_MINUTES).best
+            ]
+            assert latest[table.ids[origin]] == max(useful, default=-1), (origin, dest)
+
+
+def test_dead_airports_are_pruned_without_changing_results():
+    flights = [
+        Flight("AAA", "BBB", "F1", 480, 600, 100, 100, 100),
+        Flight("BBB", "CCC", "F2", 700, 800, 100, 100, 100),
+        Flight("AAA", "DDD", "F3", 470, 500, 1, 1, 1),  # dead end
+        Flight("BBB", "CCC", "F4", 620, 700, 50, 50, 50),  # leaves too soon after F1 lands
+    ]
+    graph = build_graph(flights)
+    index = reachability_index(graph)
+    assert index.can_reach("AAA", "CCC", 480) and not index.can_reach("AAA", "CCC", 481)
+    assert not index.can_reach("DDD", "CCC", 0)
+    latest = index.latest(graph.table.ids["CCC"])
+    assert latest[graph.table.ids["BBB"]] == 700 and latest[graph.table.ids["DDD"]] == -1
+
+    from flight_planner import find_cheapest_itinerary, find_earliest_itinerary
+    assert [f.flight_number for f in find_earliest_itinerary(graph, "AAA", "CCC", 0).flights] == ["F1", "F2"]
+    assert [f.flight_number for f in find_cheapest_itinerary(graph, "AAA", "CCC", 0, "economy").flights] == ["F1", "F2"]
+    assert find_earliest_itinerary(graph, "AAA", "CCC", 481) is None
+
+
+def test_memory_accounting_eviction_and_invalidation():
+    graph = build_graph(load_flights(DATA))
+    table = graph.table
+    n = len(table.codes)
+    index = ReachabilityIndex(table, max_bytes=3 * 2 * n)
+    for d in range(5):
+        index.latest(d)
+    assert len(index) == 3 and index.nbytes() == 3 * 2 * n
+    assert index.stats.builds == 5 and index.stats.evictions == 2
+    index.latest(4)
+    assert index.stats.hits == 1
+
+    graph.add_flight(Flight("ICN", "NEW", "FW-NEW", 600, 700, 1, 1, 1))
+    latest = index.latest(table.ids["NEW"])
+    assert len(index) == 1 and latest[table.ids["ICN"]] == 600
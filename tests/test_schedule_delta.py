@@ -0,0 +1,137 @@
+# tests/test_schedule_delta.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import random
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from flight_planner import (
+    Flight,
+    FlightTable,
+    build_graph,
+    find_cheapest_itineraries,
+    find_earliest_itinerary,
+    load_flights,
+    parse_time,
+)
+from query_cache import QueryCache
+from schedule_delta import apply_delta_file, parse_change_line
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def random_changes(flights, rng, n):
+    """Yield (op, args) tuples against a shadow list of live flights."""
+    live = {f.flight_number: f for f in flights}
+    airports = sorted({f.origin for f in flights} | {"ZZZ"})
+    for i in range(n):
+        kind = rng.choice(("add", "cancel", "retime"))
+        if kind == "add":
+            depart = rng.randrange(0, 1300)
+            flight = Flight(rng.choice(airports), rng.choice(airports), f"NEW{i}", depart,
+                            depart + rng.randrange(30, 130), 100, 200, 300)
+            live[flight.flight_number] = flight
+            yield kind, (flight,)
+        elif kind == "cancel":
+            number = rng.choice(sorted(live))
+            del live[number]
+            yield kind, (number,)
+        else:
+            number = rng.choice(sorted(live))
+            depart = rng.randrange(0, 1300)
+            live[number] = replace(live[number], depart=depart, arrive=depart + 90)
+            yield kind, (number, depart, depart + 90)
+    yield "done", (sorted(live.values(), key=lambda f: f.flight_number),)
+
+
+def apply(schedule, kind, args):
+    {"add": schedule.add_flight, "cancel": schedule.remove_flight, "retime": schedule.retime_flight}[kind](*args)
+
+
+@pytest.mark.parametrize("use_table", [False, True])
+def test_incremental_updates_match_a_rebuild(use_table):
+    flights = load_flights(DATA)
+    schedule = FlightTable.from_flights(flights).build_index() if use_table else build_graph(flights)
+    if not use_table:
+        schedule.table  # updates must keep an already built table in sync too
+    rng = random.Random(7)
+    for kind, args in random_changes(flights, rng, 300):
+        if kind == "done":
+            expected = args[0]
+            break
+        before = schedule.version
+        apply(schedule, kind, args)
+        assert schedule.version != before
+
+    assert sorted(schedule if use_table else (f for out in schedule.values() for f in out),
+                  key=lambda f: f.flight_number) == expected
+    rebuilt = build_graph(expected)
+    table = schedule if use_table else schedule.table
+    ref = rebuilt.table
+    for code in ref.codes:
+        # Equal departures may be ordered differently than a fresh sort.
+        got = [table.flight(r) for r in table.out_rows[table.ids[code]]]
+        want = [ref.flight(r) for r in ref.out_rows[ref.ids[code]]]
+        assert [f.depart for f in got] == list(table.out_departs[table.ids[code]]) == [f.depart for f in want]
+        assert sorted(got, key=lambda f: f.flight_number) == sorted(want, key=lambda f: f.flight_number)
+    key = lambda t: [(t.depart[r], t.arrive[r]) for r in t.connection_rows]
+    assert key(table) == key(ref)
+    assert list(table.connection_departs) == list(ref.connection_departs)
+    if not use_table:
+        for origin, outgoing in schedule.items():
+            assert schedule.departures[origin] == [f.depart for f in outgoing] == rebuilt.departures[origin]
+        assert set(schedule) == set(rebuilt)
+    for a, b in [("ICN", "SFO"), ("ICN", "ZZZ"), ("ZZZ", "NRT")]:
+        t0 = parse_time("05:00")
+        assert find_earliest_itinerary(schedule, a, b, t0) == find_earliest_itinerary(rebuilt, a, b, t0)
+        assert find_earliest_itinerary(schedule, a, b, t0, engine="csa") == find_earliest_itinerary(rebuilt, a, b, t0)
+        got, want = find_cheapest_itineraries(schedule, a, b, t0), find_cheapest_itineraries(rebuilt, a, b, t0)
+        for cabin in want:
+            assert (got[cabin] and got[cabin].total_price(cabin)) == (want[cabin] and want[cabin].total_price(cabin))
+
+
+def test_update_errors_and_cache_invalidation():
+    graph = build_graph(load_flights(DATA))
+    with pytest.raises(KeyError):
+        graph.remove_flight("NOPE")
+    with pytest.raises(ValueError):
+        graph.add_flight(graph["ICN"][0])
+    with pytest.raises(ValueError):
+        graph.retime_flight(graph["ICN"][0].flight_number, 600, 500)
+
+    cache = QueryCache()
+    t0 = parse_time("06:00")
+    first = cache.earliest(graph, "ICN", "SFO", t0)
+    for flight in first.flights:
+        graph.remove_flight(flight.flight_number)
+    second = cache.earliest(graph, "ICN", "SFO", t0)
+    assert cache.stats.invalidations == 1
+    assert second != first and second == find_earliest_itinerary(build_graph(list(graph.table)), "ICN", "SFO", t0)
+
+
+def test_apply_delta_file(tmp_path: Path):
+    graph = build_graph(load_flights(DATA))
+    delta = tmp_path / "today.delta"
+    delta.write_text(
+        "# morning ops\n"
+        "add ICN NRT FW9999 08:00 10:00 300 800 1500\n"
+        "cancel FW101\n"
+        "retime FW102 09:15 11:45  # late inbound\n",
+        encoding="utf-8",
+    )
+    assert apply_delta_file(graph, str(delta)) == 3
+    assert graph.get_flight("FW9999").dest == "NRT"
+    assert graph.get_flight("FW102").depart == parse_time("09:15")
+    assert graph.get_flight("FW101") is None
+
+    delta.write_text("cancel FW9999\ncancel FW9999\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"today\.delta:2: Unknown flight FW9999"):
+        apply_delta_file(graph, str(delta))
+
+    for bad in ("cancel", "retime FW1 10:00", "retime FW1 10:00 09:00", "add ICN NRT", "delay FW1"):
+        with pytest.raises(ValueError):
+            parse_change_line(bad)
@@ -0,0 +1,96 @@
+# tests/test_search_stats.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from flight_planner import (
+    CABINS,
+    CHEAPEST_ENGINES,
+    EARLIEST_ENGINES,
+    MIN_LAYOVER_MINUTES,
+    SearchStats,
+    build_graph,
+    find_cheapest_itineraries,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    main,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def check_invariants(stats: SearchStats, engine: str) -> None:
+    assert stats.engine == engine
+    assert stats.stale_pops <= stats.heap_pops <= stats.heap_pushes
+    assert stats.edges_feasible <= stats.edges_scanned
+    assert stats.peak_heap <= stats.heap_pushes
+    assert stats.seconds > 0
+
+
+def test_every_engine_fills_stats_without_changing_results():
+    graph = build_graph(load_flights(DATA))
+    pairs = [("ICN", "SFO"), ("JFK", "LHR"), ("LHR", "SYD")]
+    for a, b in pairs:
+        for engine in EARLIEST_ENGINES:
+            stats = SearchStats()
+            assert find_earliest_itinerary(graph, a, b, 360, engine=engine, stats=stats) == \
+                find_earliest_itinerary(graph, a, b, 360, engine=engine)
+            check_invariants(stats, engine)
+            assert stats.edges_scanned > 0 and stats.labels_created > 0
+            if engine != "csa":
+                assert stats.heap_pops > 0 and stats.peak_heap > 0
+        for engine in CHEAPEST_ENGINES:
+            for cabin in CABINS:
+                stats = SearchStats()
+                assert find_cheapest_itinerary(graph, a, b, 360, cabin, engine=engine, stats=stats) == \
+                    find_cheapest_itinerary(graph, a, b, 360, cabin, engine=engine)
+                check_invariants(stats, engine)
+                assert stats.heap_pushes == stats.labels_created + 1
+        stats = SearchStats()
+        assert find_cheapest_itineraries(graph, a, b, 360, stats=stats) == find_cheapest_itineraries(graph, a, b, 360)
+        check_invariants(stats, "sweep")
+
+
+def test_csa_counts_match_a_step_by_step_scan():
+    graph = build_graph(load_flights(DATA))
+    table = graph.table
+    s, d = table.ids["ICN"], table.ids["SFO"]
+    arrival = {s: 360 - MIN_LAYOVER_MINUTES}
+    scanned = feasible = 0
+    best = None
+    for row in table.connection_rows:
+        if table.depart[row] < 360:
+            continue
+        if best is not None and table.depart[row] >= best:
+            break
+        scanned += 1
+        o = table.origin[row]
+        if o not in arrival or arrival[o] + MIN_LAYOVER_MINUTES > table.depart[row]:
+            continue
+        feasible += 1
+        nxt = table.dest[row]
+        if nxt != s and table.arrive[row] < arrival.get(nxt, 1 << 30):
+            arrival[nxt] = table.arrive[row]
+            if nxt == d:
+                best = table.arrive[row]
+    stats = SearchStats()
+    find_earliest_itinerary(graph, "ICN", "SFO", 360, engine="csa", stats=stats)
+    assert (stats.edges_scanned, stats.edges_feasible) == (scanned, feasible)
+
+
+def test_compare_stats_flag(tmp_path, capsys):
+    path = tmp_path / "flights.txt"
+    path.write_text(
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "NRT SFO FW102 11:30 17:30 300 1200 2000\n"
+        "ICN SFO FW103 09:00 19:00 700 1500 2500\n",
+        encoding="utf-8",
+    )
+    main(["compare", str(path), "ICN", "SFO", "07:00"])
+    plain = capsys.readouterr().out
+    assert "stats" not in plain
+    main(["compare", str(path), "ICN", "SFO", "07:00", "--stats"])
+    out = capsys.readouterr().out
+    assert out.startswith(plain)
+    assert "stats earliest  dijkstra: pushes=" in out and "stats cheapest  sweep: pushes=" in out
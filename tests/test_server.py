@@ -0,0 +1,111 @@
+# tests/test_server.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import asyncio
+import json
+
+import pytest
+
+from flight_planner import build_graph, find_cheapest_itineraries, load_flights, parse_time
+from batch import table_pool
+from server import QueryServer, _answer_in_worker, answer, parse_request, percentile
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_parse_request_validation():
+    req = parse_request('{"op": "cheapest", "origin": "ICN", "dest": "SFO", "departure": "07:00", "cabin": "first"}')
+    assert req["t0"] == parse_time("07:00") and req["engine"] == "dijkstra"
+    for bad in ('not json', '[1]', '{"op": "fly"}', '{"op": "earliest", "origin": "ICN"}',
+                '{"op": "earliest", "origin": "ICN", "dest": "SFO", "departure": "7pm"}',
+                '{"op": "compare", "origin": "ICN", "dest": "SFO", "departure": "07:00", "cabin": "first"}'):
+        with pytest.raises(ValueError):
+            parse_request(bad)
+
+
+def test_concurrent_tcp_clients_and_stats():
+    graph = build_graph(load_flights(DATA))
+    expected = find_cheapest_itineraries(graph, "ICN", "SFO", parse_time("07:00"))
+
+    async def client(port: int, n: int) -> list:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in range(n):
+            writer.write(json.dumps({"id": i, "op": "compare", "origin": "ICN", "dest": "SFO", "departure": "07:00"}).encode() + b"\n")
+        writer.write(b"garbage\n")
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in range(n + 1)]
+        writer.close()
+        return replies
+
+    async def scenario() -> tuple:
+        server = QueryServer(graph, workers=0, queue_size=2)
+        listener = await server.start_tcp(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            results = await asyncio.gather(*(client(port, 5) for _ in range(3)))
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"id": "s", "op": "stats"}\n')
+            stats = json.loads(await reader.readline())
+            writer.close()
+        finally:
+            listener.close()
+            await server.close()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+    for replies in results:
+        ok = [r for r in replies if r["ok"]]
+        assert sorted(r["id"] for r in ok) == list(range(5))
+        for r in ok:
+            economy = r["result"]["cheapest"]["economy"]
+            assert economy["price"] == expected["economy"].total_price("economy")
+        assert sum(not r["ok"] for r in replies) == 1
+    body = stats["result"]
+    assert body["requests"] == 18 and body["errors"] == 3
+    assert body["by_op"]["compare"] == 15
+    assert 0 < body["latency_ms"]["p50"] <= body["latency_ms"]["p99"] <= body["latency_ms"]["max"]
+
+
+def test_invalid_requests_echo_their_id():
+    graph = build_graph(load_flights(DATA))
+    lines = [
+        '{"id": 3, "op": "earliest", "origin": "ICN", "dest": "SFO", "departure": "7pm"}\n',
+        '{"id": 4, "op": "earliest", "origin": 5, "dest": "SFO", "departure": "07:00"}\n',
+        'garbage\n',
+        '',
+    ]
+    replies = []
+
+    async def readline() -> str:
+        return lines.pop(0)
+
+    async def write(message: dict) -> None:
+        replies.append(message)
+
+    async def scenario() -> None:
+        server = QueryServer(graph, workers=0)
+        try:
+            await server.handle(readline, write)
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+    assert [(r["id"], r["ok"]) for r in replies] == [(3, False), (4, False), (None, False)]
+
+
+def test_process_pool_workers_answer_from_the_shared_table():
+    table = build_graph(load_flights(DATA)).table
+    t0 = parse_time("07:00")
+    with table_pool(table, 1) as pool:
+        got = pool.submit(_answer_in_worker, "compare", "ICN", "SFO", t0, None, "dijkstra").result()
+    assert got == answer(table, "compare", "ICN", "SFO", t0, None, "dijkstra")
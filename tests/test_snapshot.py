@@ -0,0 +1,81 @@
+# tests/test_snapshot.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from pathlib import Path
+
+import pytest
+
+import snapshot
+from flight_planner import build_graph, find_cheapest_itineraries, load_flights, load_table, main
+from snapshot import load_schedule, load_schedule_table, snapshot_path_for, write_snapshot
+
+SCHEDULE = (
+    "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+    "NRT SFO FW102 11:30 19:30 500 1200 2000\n"
+    "ICN SFO FW103 09:00 19:00 700 1500 2500\n"
+    "ICN HKG FW104 07:00 10:00 200 600 1000\n"
+)
+
+
+@pytest.fixture
+def schedule(tmp_path: Path) -> str:
+    path = tmp_path / "flights.txt"
+    path.write_text(SCHEDULE, encoding="utf-8")
+    return str(path)
+
+
+def test_snapshot_roundtrip_matches_parsed_graph(schedule, monkeypatch):
+    expected = build_graph(load_flights(schedule))
+    snap = write_snapshot(schedule)
+    assert snap == snapshot_path_for(schedule)
+
+    def fail(path):
+        raise AssertionError("source should not be reparsed")
+
+    monkeypatch.setattr(snapshot, "iter_flights", fail)
+    graph = load_schedule(schedule)
+    assert graph == expected
+    assert graph.departures == expected.departures
+    assert graph.connections() == expected.connections()
+    assert graph.version != expected.version
+    # The snapshot can also be opened directly.
+    assert load_schedule(snap) == expected
+
+
+def test_snapshot_loads_indexed_table_without_flight_objects(schedule, monkeypatch):
+    expected = load_table(schedule).build_index()
+    write_snapshot(schedule)
+    monkeypatch.setattr(snapshot, "iter_flights", lambda path: pytest.fail("reparsed"))
+    table = load_schedule_table(schedule)
+    assert table._objects is None
+    assert list(table) == list(expected)
+    assert [list(rows) for rows in table.out_rows] == [list(rows) for rows in expected.out_rows]
+    assert list(table.connection_rows) == list(expected.connection_rows)
+    assert find_cheapest_itineraries(table, "ICN", "SFO", 0) == find_cheapest_itineraries(expected, "ICN", "SFO", 0)
+
+
+def test_changed_source_falls_back_to_reparse(schedule):
+    write_snapshot(schedule)
+    with open(schedule, "a", encoding="utf-8") as f:
+        f.write("SFO LAX FW105 21:00 22:30 100 200 300\n")
+    graph = load_schedule(schedule)
+    assert "SFO" in graph
+    assert load_schedule(snapshot_path_for(schedule)) == graph
+
+
+def test_touched_source_with_same_content_keeps_snapshot(schedule, monkeypatch):
+    write_snapshot(schedule)
+    st = os.stat(schedule)
+    os.utime(schedule, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.setattr(snapshot, "iter_flights", lambda path: pytest.fail("reparsed"))
+    assert "ICN" in load_schedule(schedule)
+
+
+def test_compile_cli_then_compare_uses_snapshot(schedule, capsys):
+    main(["compile", schedule])
+    assert "Wrote" in capsys.readouterr().out
+    main(["compare", snapshot_path_for(schedule), "ICN", "SFO", "07:00"])
+    out = capsys.readouterr().out
+    assert "ICN" in out and "SFO" in out
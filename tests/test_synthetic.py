@@ -0,0 +1,38 @@
+# tests/test_synthetic.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from collections import Counter
+
+from flight_planner import build_graph, find_earliest_itinerary, load_flights
+from synthetic import SyntheticConfig, airport_code, generate_schedule, write_synthetic_schedule
+
+
+def test_same_seed_same_schedule_and_valid_flights():
+    config = SyntheticConfig(airports=40, flights=3000, seed=7)
+    flights = generate_schedule(config)
+    assert flights == generate_schedule(config)
+    assert flights != generate_schedule(SyntheticConfig(airports=40, flights=3000, seed=8))
+    assert len(flights) == 3000
+    assert len({f.flight_number for f in flights}) == 3000
+    assert all(0 <= f.depart < f.arrive <= 1439 for f in flights)
+    assert all(f.economy < f.business < f.first for f in flights)
+    assert {f.origin for f in flights} | {f.dest for f in flights} <= {airport_code(i) for i in range(40)}
+
+
+def test_hubs_dominate_and_connect(tmp_path):
+    config = SyntheticConfig(airports=60, flights=4000, seed=1, hubs=3)
+    flights = generate_schedule(config)
+    busiest = {code for code, _ in Counter(f.origin for f in flights).most_common(3)}
+    assert busiest == {airport_code(i) for i in range(3)}
+
+    graph = build_graph(flights)
+    spokes = [airport_code(i) for i in range(3, 13)]
+    reached = sum(find_earliest_itinerary(graph, a, b, 300) is not None for a in spokes for b in spokes if a != b)
+    assert reached > 0.8 * 90
+
+    for name in ("s.txt", "s.csv"):
+        path = str(tmp_path / name)
+        assert write_synthetic_schedule(path, config) == 4000
+        assert load_flights(path) == flights
@@ -131,3 +131,69 @@ def test_load_flights_dispatch_uses_extension(tmp_path: Path):
     assert len(flights_csv) == 1
     assert flights_txt[0].origin == "ICN"
     assert flights_csv[0].origin == "NRT"
+
+
+def test_iter_flights_streams_and_reports_bad_line_lazily(tmp_path: Path):
+    from flight_planner import iter_flights
+
+    path = tmp_path / "flights.txt"
+    path.write_text(
+        "# header\n"
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "ICN NRT BROKEN\n",
+        encoding="utf-8",
+    )
+    stream = iter_flights(str(path))
+    first = next(stream)
+    assert first.flight_number == "FW101"
+    with pytest.raises(ValueError, match=r"flights\.txt:3:"):
+        next(stream)
+
+
+def test_iter_flights_csv_matches_loader(tmp_path: Path):
+    from flight_planner import iter_flights
+
+    path = tmp_path / "flights.csv"
+    path.write_text(
+        "origin,dest,flight_number,depart,arrive,economy,business,first\n"
+        "ICN,NRT,FW101,08:00,10:00,300,800,1500\n"
+        "NRT,ICN,FW102,11:00,13:00,320,820,1520\n",
+        encoding="utf-8",
+    )
+    assert list(iter_flights(str(path))) == load_flights(str(path))
+
+
+def test_parse_time_fast_path_agrees_with_full_parse():
+    for m in range(24 * 60):
+        s = format_time(m)
+        assert parse_time(s) == m
+        assert parse_time(f" {s}\n") == m
+    assert parse_time("8:05") == 8 * 60 + 5
+
+
+def test_load_flights_csv_reordered_columns_and_error_lines(tmp_path: Path):
+    path = tmp_path / "flights.csv"
+    path.write_text(
+        "flight_number,origin,dest,first,business,economy,depart,arrive\n"
+        "FW101,ICN,NRT,1500,800,300,08:00,10:00\n"
+        "FW102,NRT,ICN,1520,820,320,13:00,11:00\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match=r"flights\.csv:3: Arrival time must be after departure"):
+        load_flights_csv(str(path))
+
+    path.write_text(
+        "flight_number,origin,dest,first,business,economy,depart,arrive\n"
+        "FW101,ICN,NRT,1500,800,300,08:00,10:00\n",
+        encoding="utf-8",
+    )
+    (flight,) = load_flights_csv(str(path))
+    assert (flight.origin, flight.economy, flight.first) == ("ICN", 300, 1500)
+    assert flight.depart == parse_time("08:00")
+
+
+def test_load_flights_csv_missing_column(tmp_path: Path):
+    path = tmp_path / "flights.csv"
+    path.write_text("origin,dest\nICN,NRT\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Missing required columns"):
+        load_flights_csv(str(path))
@@ -0,0 +1,55 @@
+# tests/test_tracing.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import io
+import json
+import pstats
+
+import tracing
+from flight_planner import main
+from tracing import span, traced_iter
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+
+
+def test_spans_are_free_when_off_and_nest_when_on():
+    items = [1, 2, 3]
+    assert tracing.active() is None
+    assert traced_iter("x", items) is items
+    with span("ignored"):
+        pass
+    with tracing.tracing(timings=True, out=io.StringIO()) as tracer:
+        with span("outer"):
+            with span("inner"):
+                assert list(traced_iter("stream", items)) == items
+            with span("inner"):
+                pass
+    assert tracing.active() is None
+    phases = tracer.phases()
+    assert list(phases) == [(0, "outer"), (1, "inner"), (2, "stream")]
+    assert phases[(1, "inner")][0] == 2
+    assert phases[(0, "outer")][1] >= phases[(1, "inner")][1]
+
+
+def test_compare_timings_trace_and_profile(tmp_path, capsys):
+    trace, prof = tmp_path / "trace.json", tmp_path / "run.prof"
+    main(["compare", DATA, "ICN", "SFO", "06:00", "--timings", "--trace", str(trace), "--profile-out", str(prof)])
+    captured = capsys.readouterr()
+    assert "Earliest Arrival" in captured.out and "phase" not in captured.out
+    for phase in ("parse_time", "load_schedule", "load_table", "load_flights", "build_index",
+                  "find_earliest_itinerary", "find_cheapest_itineraries", "format_comparison_table"):
+        assert phase in captured.err
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert "find_cheapest_itineraries" in {e["name"] for e in events}
+    assert pstats.Stats(str(prof)).total_calls > 0
+
+
+def test_environment_variable_turns_timings_on(monkeypatch, capsys):
+    main(["compare", DATA, "ICN", "SFO", "06:00"])
+    assert capsys.readouterr().err == ""
+    monkeypatch.setenv(tracing.TIMINGS_ENV, "1")
+    main(["compare", DATA, "ICN", "SFO", "06:00"])
+    assert "find_earliest_itinerary" in capsys.readouterr().err
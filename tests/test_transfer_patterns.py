@@ -0,0 +1,114 @@
+# tests/test_transfer_patterns.py
+from __future__ import annotations
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import random
+
+import pytest
+
+from flight_planner import (
+    CABINS,
+    Flight,
+    build_graph,
+    find_cheapest_itinerary,
+    find_earliest_itinerary,
+    load_flights,
+    main,
+)
+from transfer_patterns import build_transfer_patterns, load_transfer_patterns, write_transfer_patterns
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "flights_global.txt")
+AIRPORTS = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]
+
+
+def random_schedule(seed: int, n: int = 80):
+    rng = random.Random(seed)
+    flights = []
+    for i in range(n):
+        a, b = rng.sample(AIRPORTS, 2)
+        depart = rng.randrange(0, 1200)
+        flights.append(Flight(a, b, f"T{i}", depart, depart + rng.randrange(30, 240),
+                              rng.randrange(50, 500), rng.randrange(500, 900), rng.randrange(900, 2000)))
+    return flights
+
+
+def test_index_answers_match_live_searches():
+    for seed in range(6):
+        graph = build_graph(random_schedule(seed))
+        index = build_transfer_patterns(graph)
+        for a in AIRPORTS:
+            for b in AIRPORTS:
+                if a == b:
+                    continue
+                for t0 in (0, 250, 600, 1000):
+                    live = find_earliest_itinerary(graph, a, b, t0)
+                    fast = index.earliest(graph, a, b, t0)
+                    assert (live and live.arrive_time) == (fast and fast.arrive_time), (seed, a, b, t0)
+                    if fast is not None:
+                        assert fast.depart_time >= t0
+                    for cabin in CABINS:
+                        live = find_cheapest_itinerary(graph, a, b, t0, cabin)
+                        fast = index.cheapest(graph, a, b, t0, cabin)
+                        assert (live and live.total_price(cabin)) == (fast and fast.total_price(cabin))
+
+
+def test_round_trip_and_schedule_check(tmp_path):
+    graph = build_graph(load_flights(DATA))
+    index = build_transfer_patterns(graph)
+    loaded = load_transfer_patterns(write_transfer_patterns(index, str(tmp_path / "index.fwtp")))
+    assert loaded.patterns == index.patterns and len(loaded) == len(index)
+    itin = loaded.earliest(graph, "ICN", "SFO", 360)
+    assert itin is not None and itin.arrive_time == find_earliest_itinerary(graph, "ICN", "SFO", 360).arrive_time
+
+    other = build_graph(random_schedule(0))
+    with pytest.raises(ValueError):
+        loaded.earliest(other, "AAA", "BBB", 0)
+    (tmp_path / "bogus.fwtp").write_bytes(b"not an index at all")
+    with pytest.raises(ValueError):
+        load_transfer_patterns(str(tmp_path / "bogus.fwtp"))
+
+
+def test_patterns_cli_and_compare(tmp_path, capsys):
+    path = tmp_path / "flights.txt"
+    path.write_text(
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "NRT SFO FW102 11:30 17:30 300 1200 2000\n"
+        "ICN SFO FW103 09:00 19:00 700 1500 2500\n",
+        encoding="utf-8",
+    )
+    main(["patterns", str(path)])
+    assert "Wrote" in capsys.readouterr().out
+    main(["compare", str(path), "ICN", "SFO", "07:00"])
+    live = capsys.readouterr().out
+    main(["compare", str(path), "ICN", "SFO", "07:00", "--patterns", str(path) + ".fwtp"])
+    assert capsys.readouterr().out == live
+
+
+def test_bind_checks_the_recorded_file_instead_of_hashing(tmp_path, monkeypatch):
+    import transfer_patterns
+    from snapshot import load_schedule_table, write_snapshot
+
+    path = tmp_path / "flights.txt"
+    path.write_text(
+        "ICN NRT FW101 08:00 10:00 300 800 1500\n"
+        "NRT SFO FW102 11:30 17:30 300 1200 2000\n",
+        encoding="utf-8",
+    )
+    index = build_transfer_patterns(load_schedule_table(str(path)), str(path))
+    loaded = load_transfer_patterns(write_transfer_patterns(index, str(tmp_path / "index.fwtp")))
+    assert loaded.source == index.source and loaded.source["size"] == path.stat().st_size
+
+    digests = []
+    real_digest = transfer_patterns.schedule_digest
+    monkeypatch.setattr(transfer_patterns, "schedule_digest", lambda g: digests.append(g) or real_digest(g))
+    loaded.bind(load_schedule_table(str(path)), str(path))
+    write_snapshot(str(path))
+    loaded.bind(load_schedule_table(str(path)), str(path))  # now through the snapshot
+    assert digests == []
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("ICN SFO FW103 09:00 19:00 700 1500 2500\n")
+    with pytest.raises(ValueError):
+        loaded.bind(load_schedule_table(str(path)), str(path))
+    assert len(digests) == 1